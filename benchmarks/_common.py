@@ -0,0 +1,55 @@
+"""
+Helpers shared by the benchmark scripts, which import it from their own
+directory when run as `python benchmarks/<script>.py`.
+"""
+from domain.models.identifier import Identifier
+from domain.models.order import Address, VersionedItem, VersionedOrder
+from typing import Callable
+import random
+import statistics
+import time
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float]:
+    """
+    Returns the p50 and p99 of `latencies`.
+    """
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49], quantiles[98]
+
+
+def percentiles_us(latencies: list[float]) -> str:
+    p50, p99 = percentiles(latencies)
+    return f"p50 {p50 * 1e6:8.1f} us  p99 {p99 * 1e6:8.1f} us"
+
+
+def measure(call: Callable[[Identifier], object], ids: list[Identifier]) -> str:
+    """
+    Calls `call` with each of `ids` and returns the latency percentiles.
+    """
+    latencies = []
+    for id in ids:
+        start = time.perf_counter()
+        call(id)
+        latencies.append(time.perf_counter() - start)
+    return percentiles_us(latencies)
+
+
+def versioned_order(
+    customer_ids: list[Identifier], product_ids: list[Identifier], items: int
+) -> VersionedOrder:
+    """
+    Returns an order of a random customer with `items` random products.
+    """
+    return VersionedOrder(
+        customer_id=random.choice(customer_ids),
+        shipping_address=Address(),
+        items=[
+            VersionedItem(
+                product_id=random.choice(product_ids),
+                quantity=1,
+                product_version_id=random.choice(product_ids),
+            )
+            for _ in range(0, items)
+        ],
+    )
@@ -0,0 +1,69 @@
+"""
+Compares the time `dispatch_event` adds to a request when publishing directly
+to a sink with a simulated round trip, and when going through
+`BufferedEventDispatcher`.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_buffered_event_dispatcher.py --latency-ms 2
+"""
+from _common import percentiles_us
+from adapters.events.buffered_event_dispatcher import BufferedEventDispatcher
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import SnowflakeIdGenerator
+from domain.models.order import Address, PersistedOrder
+from domain.ports.spi.status_update_event_dispatcher_spi import (
+    StatusUpdateEventDispatcherSPI,
+)
+import argparse
+import time
+
+
+def measure(dispatcher: StatusUpdateEventDispatcherSPI, events: int) -> str:
+    generate = SnowflakeIdGenerator(worker_id=1).generate_order_id
+    event = DispatchableEvent(
+        order=PersistedOrder(
+            customer_id=generate(), shipping_address=Address(), id=generate(), items=[]
+        ),
+        event_type=DispatchableEvent.EventType.TO_BE_ACCEPTED_BY_INVENTORY,
+    )
+    latencies = []
+    for _ in range(0, events):
+        start = time.perf_counter()
+        dispatcher.dispatch_event(event=event)
+        latencies.append(time.perf_counter() - start)
+    return percentiles_us(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-delay-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    print(f"{args.events} events, sink round trip {args.latency_ms} ms")
+    direct_sink = InMemoryEventSink(latency_seconds=args.latency_ms / 1e3)
+    print("direct     " + measure(direct_sink, events=args.events // 10))
+
+    buffered = BufferedEventDispatcher(
+        sink=InMemoryEventSink(latency_seconds=args.latency_ms / 1e3),
+        max_batch_size=args.batch_size,
+        max_delay_seconds=args.max_delay_ms / 1e3,
+        max_queue_size=max(args.events, args.batch_size),
+    )
+    print("buffered   " + measure(buffered, events=args.events))
+    start = time.perf_counter()
+    buffered.close()
+    stats = buffered.stats
+    print(f"drain      {(time.perf_counter() - start) * 1e3:9.1f} ms")
+    print(
+        f"batches    {stats.batches:9d}"
+        f"  mean flush {stats.flush_seconds_mean * 1e3:6.2f} ms"
+        f"  max queue delay {stats.queue_delay_seconds_max * 1e3:6.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Measures the domain hot paths: status transitions, transition validation,
+event mapping, order versioning and the service methods on in-memory adapters.
+Reports ops/sec and p50/p99 latency per workload, and compares the run
+against a saved baseline.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_domain.py --save-baseline baseline.json
+    python benchmarks/bench_domain.py --baseline baseline.json --threshold 0.2
+
+With `--baseline`, the script exits with status 1 if the ops/sec of any
+workload in the baseline dropped by more than `--threshold`.
+Baselines only compare runs on the same machine and Python version,
+so they are not checked in.
+"""
+from _common import percentiles
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from adapters.persistence.in_memory_order_store import InMemoryOrderStore
+from dataclasses import asdict, dataclass
+from domain.errors import DomainError
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import Address, Item, PersistedOrder, RequestedOrder
+from domain.models.order_status import (
+    Expectedness,
+    Status,
+    StatusTransition,
+    TransitionToExpectednessMapper,
+)
+from domain.models.event import StatusToEventMapper
+from domain.models.product import ProductVersion
+from domain.models.status_transition_validator import (
+    ExpectednessSetting,
+    TransitionValidator,
+)
+from domain.ports.spi.product_catalogue_spi import GetProductVersionIdsSPI
+from domain.services.order_data_service import OrderDataByOrderIdService
+from domain.services.place_order_service import PlaceOrderService
+from domain.services.update_order_status_service import UpdateOrderStatusService
+from itertools import cycle
+from typing import Callable
+import argparse
+import json
+import random
+import sys
+import time
+
+PAIRS = [(a, b) for a in Status for b in Status]
+EXPECTEDNESS = {
+    pair: TransitionToExpectednessMapper.get_expectedness(
+        from_status=pair[0], to_status=pair[1]
+    )
+    for pair in PAIRS
+}
+# Transition mixes by expectedness, plus every transition evenly.
+MIXES = {
+    expectedness.name.lower(): [
+        pair for pair in PAIRS if EXPECTEDNESS[pair] is expectedness
+    ]
+    for expectedness in Expectedness
+}
+MIXES["all"] = PAIRS
+
+
+@dataclass(frozen=True)
+class Result:
+    ops_per_second: float
+    p50_us: float
+    p99_us: float
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    op: Callable[[], object]
+    # Ops per timed sample. Cheap ops are timed in groups,
+    # since timing a single call would mostly measure the clock.
+    inner: int = 1
+
+
+def measure(workload: Workload, samples: int) -> Result:
+    for _ in range(0, max(samples // 10, 1) * workload.inner):
+        workload.op()
+    timings = []
+    for _ in range(0, samples):
+        start = time.perf_counter()
+        for _ in range(0, workload.inner):
+            workload.op()
+        timings.append((time.perf_counter() - start) / workload.inner)
+    p50, p99 = percentiles(timings)
+    return Result(
+        ops_per_second=len(timings) / sum(timings),
+        p50_us=p50 * 1e6,
+        p99_us=p99 * 1e6,
+    )
+
+
+class Catalogue:
+    """Product catalogue where every product has a current version."""
+
+    def __init__(self, product_ids: list[Identifier]) -> None:
+        self.product_version_ids = {id: id for id in product_ids}
+
+    def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionIdsSPI.Result:
+        return GetProductVersionIdsSPI.Result(
+            product_version_ids={
+                id: self.product_version_ids[id] for id in product_ids
+            },
+            invalid_ids=set(),
+            ids_without_product_version_id=set(),
+        )
+
+
+def model_workloads(item_counts: list[int]) -> list[Workload]:
+    workloads = []
+    for mix, pairs in MIXES.items():
+        next_pair = cycle(pairs).__next__
+        workloads.append(
+            Workload(
+                name=f"StatusTransition/{mix}",
+                op=lambda next_pair=next_pair: StatusTransition(*next_pair()),
+                inner=100,
+            )
+        )
+        for setting in ExpectednessSetting:
+            next_transition = cycle(
+                [StatusTransition(*pair) for pair in pairs]
+            ).__next__
+            workloads.append(
+                Workload(
+                    name=f"TransitionValidator/{setting.name}/{mix}",
+                    op=lambda next=next_transition, setting=setting: (
+                        TransitionValidator.validate_transition(
+                            transition=next(), setting=setting
+                        )
+                    ),
+                    inner=100,
+                )
+            )
+    next_status = cycle(Status).__next__
+    workloads.append(
+        Workload(
+            name="StatusToEventMapper",
+            op=lambda: StatusToEventMapper.map_status_to_event_type(
+                status=next_status()
+            ),
+            inner=100,
+        )
+    )
+    generate = SnowflakeIdGenerator(worker_id=1).generate_order_id
+    for count in item_counts:
+        order = requested_order(generate, items=count)
+        product_version_ids = {item.product_id: generate() for item in order.items}
+        workloads.append(
+            Workload(
+                name=f"RequestedOrder.to_versioned_order/{count}_items",
+                op=lambda order=order, ids=product_version_ids: (
+                    order.to_versioned_order(product_versions=ids)
+                ),
+                inner=max(1_000 // count, 1),
+            )
+        )
+    return workloads
+
+
+def service_workloads(item_counts: list[int], orders: int) -> list[Workload]:
+    generate = SnowflakeIdGenerator(worker_id=1).generate_order_id
+    store = InMemoryOrderStore()
+    sink = InMemoryEventSink()
+    workloads = []
+
+    for count in item_counts:
+        order = requested_order(generate, items=count)
+        store.save_product_versions(
+            product_versions=[
+                ProductVersion(
+                    id=item.product_id,
+                    product_id=item.product_id,
+                    price=ProductVersion.Price(amount=1, unit="pcs", currency="SEK"),
+                )
+                for item in order.items
+            ]
+        )
+        place_order_service = PlaceOrderService(
+            get_product_version_ids_spi=Catalogue(order.get_product_ids()),
+            save_order_spi=store,
+            event_dispatcher=sink,
+        )
+        placed = [
+            place_order_service.place_order(requested_order=order)
+            for _ in range(0, min(orders, 100))
+        ]
+        next_order_id = cycle([placed_order.id for placed_order in placed]).__next__
+        order_data_service = OrderDataByOrderIdService(order_data_spi=store)
+        workloads += [
+            Workload(
+                name=f"PlaceOrderService.place_order/{count}_items",
+                op=lambda service=place_order_service, order=order: (
+                    service.place_order(requested_order=order)
+                ),
+            ),
+            Workload(
+                name=f"OrderDataByOrderIdService.get_order_by_order_id/{count}_items",
+                op=lambda service=order_data_service, next=next_order_id: (
+                    service.get_order_by_order_id(order_id=next())
+                ),
+            ),
+        ]
+
+    update_order_status_service = UpdateOrderStatusService(
+        update_order_spi=store,
+        get_order_by_order_id_spi=store,
+        status_update_event_dispatcher_spi=sink,
+    )
+    persisted_orders = [
+        PersistedOrder(
+            customer_id=generate(),
+            shipping_address=Address(),
+            id=generate(),
+            items=[],
+            status=random.choice(list(Status)),
+        )
+        for _ in range(0, orders)
+    ]
+    store.insert_orders(persisted_orders=persisted_orders)
+    order_ids = [order.id for order in persisted_orders]
+    for setting in ExpectednessSetting:
+        # Random targets, so each setting accepts and rejects its own mix.
+        updates = cycle(
+            [
+                (random.choice(order_ids), random.choice(list(Status)))
+                for _ in range(0, 1_000)
+            ]
+        ).__next__
+
+        def update(setting: ExpectednessSetting = setting, next=updates) -> None:
+            order_id, new_status = next()
+            try:
+                update_order_status_service.update_order_status(
+                    order_id=order_id, new_status=new_status, setting=setting
+                )
+            except DomainError:
+                pass
+
+        workloads.append(
+            Workload(
+                name=f"UpdateOrderStatusService.update_order_status/{setting.name}",
+                op=update,
+            )
+        )
+    return workloads
+
+
+def requested_order(generate: Callable[[], Identifier], items: int) -> RequestedOrder:
+    return RequestedOrder(
+        customer_id=generate(),
+        shipping_address=Address(),
+        items=[Item(product_id=generate(), quantity=1) for _ in range(0, items)],
+    )
+
+
+def regressions(
+    results: dict[str, Result], baseline: dict[str, Result], threshold: float
+) -> list[str]:
+    return [
+        f"{name}: {results[name].ops_per_second:,.0f} ops/s, "
+        f"baseline {baseline[name].ops_per_second:,.0f} ops/s"
+        for name in baseline
+        if name in results
+        and results[name].ops_per_second
+        < baseline[name].ops_per_second * (1 - threshold)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--items", default="1,10,100,1000")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--filter", default="", help="Run workloads containing this.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Largest allowed relative drop in ops/sec.",
+    )
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    item_counts = [int(count) for count in args.items.split(",")]
+    workloads = model_workloads(item_counts) + service_workloads(
+        item_counts, orders=args.orders
+    )
+    results = {}
+    for workload in workloads:
+        if args.filter not in workload.name:
+            continue
+        result = results[workload.name] = measure(workload, samples=args.samples)
+        print(
+            f"{workload.name:<64} {result.ops_per_second:>12,.0f} ops/s"
+            f"  p50 {result.p50_us:9.2f} us  p99 {result.p99_us:9.2f} us"
+        )
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as file:
+            json.dump({name: asdict(r) for name, r in results.items()}, file, indent=2)
+        print(f"Saved baseline of {len(results)} workloads to {args.save_baseline}")
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = {name: Result(**r) for name, r in json.load(file).items()}
+        regressed = regressions(results, baseline, threshold=args.threshold)
+        for line in regressed:
+            print(f"REGRESSION {line}")
+        if regressed != []:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
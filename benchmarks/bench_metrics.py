@@ -0,0 +1,101 @@
+"""
+Measures the overhead of metrics instrumentation on `place_order`,
+with instrumentation disabled and enabled, against plain adapters.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_metrics.py --orders 20000
+"""
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from adapters.metrics.instrumentation import instrument
+from adapters.metrics.registry import MetricsRegistry
+from adapters.persistence.in_memory_order_store import InMemoryOrderStore
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import Address, Item, RequestedOrder
+from domain.ports.spi.product_catalogue_spi import GetProductVersionIdsSPI
+from domain.services.place_order_service import PlaceOrderService
+import argparse
+import time
+
+
+class Catalogue:
+    def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionIdsSPI.Result:
+        return GetProductVersionIdsSPI.Result(
+            product_version_ids={id: id for id in product_ids},
+            invalid_ids=set(),
+            ids_without_product_version_id=set(),
+        )
+
+
+def plain_service() -> PlaceOrderService:
+    return PlaceOrderService(
+        get_product_version_ids_spi=Catalogue(),
+        save_order_spi=InMemoryOrderStore(),
+        event_dispatcher=InMemoryEventSink(),
+    )
+
+
+def instrumented_service(registry: MetricsRegistry | None) -> PlaceOrderService:
+    return instrument(
+        PlaceOrderService(
+            get_product_version_ids_spi=instrument(
+                Catalogue(), component="catalogue", registry=registry
+            ),
+            save_order_spi=instrument(
+                InMemoryOrderStore(), component="store", registry=registry
+            ),
+            event_dispatcher=instrument(
+                InMemoryEventSink(), component="event_dispatcher", registry=registry
+            ),
+        ),
+        component="place_order_service",
+        registry=registry,
+    )
+
+
+def measure(service: PlaceOrderService, order: RequestedOrder, orders: int) -> float:
+    # Best of several rounds, to keep scheduling noise out of the comparison.
+    best = float("inf")
+    for _ in range(0, 5):
+        start = time.perf_counter()
+        for _ in range(0, orders):
+            service.place_order(requested_order=order)
+        best = min(best, (time.perf_counter() - start) / orders)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--items", type=int, default=3)
+    args = parser.parse_args()
+
+    generate = SnowflakeIdGenerator(worker_id=1).generate_order_id
+    order = RequestedOrder(
+        customer_id=generate(),
+        shipping_address=Address(),
+        items=[Item(product_id=generate(), quantity=1) for _ in range(0, args.items)],
+    )
+    plain = measure(plain_service(), order=order, orders=args.orders)
+    print(f"plain adapters        {plain * 1e6:8.2f} us per place_order")
+    disabled = measure(
+        instrumented_service(registry=None), order=order, orders=args.orders
+    )
+    print(
+        f"instrumented, off     {disabled * 1e6:8.2f} us per place_order"
+        f"  ({(disabled / plain - 1) * 100:+.1f} %)"
+    )
+    enabled = measure(
+        instrumented_service(registry=MetricsRegistry()),
+        order=order,
+        orders=args.orders,
+    )
+    print(
+        f"instrumented, on      {enabled * 1e6:8.2f} us per place_order"
+        f"  ({(enabled / plain - 1) * 100:+.1f} %, 4 timed calls)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Measures the memory used per order by the order models.
+
+"before" replicates the original dict-backed frozen dataclasses,
+"after" uses the slotted models and `CompactPersistedOrder`.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_order_memory.py [--orders N] [--items M]
+"""
+from __future__ import annotations
+from domain.models.identifier import SnowflakeIdGenerator
+from domain.models.order import (
+    Address,
+    CompactPersistedOrder,
+    PersistedOrder,
+    VersionedItem,
+)
+from domain.models.order_status import Status
+from dataclasses import dataclass
+from typing import Any, Callable
+import argparse
+import gc
+import tracemalloc
+
+
+# Original models, without slots:
+
+
+class LegacyIdentifier:
+    pass
+
+
+@dataclass(frozen=True)
+class LegacyId(LegacyIdentifier):
+    value: int
+
+
+@dataclass(frozen=True)
+class LegacyVersionedItem:
+    product_id: LegacyId
+    quantity: int
+    product_version_id: LegacyId
+
+
+@dataclass(frozen=True)
+class LegacyPersistedOrder:
+    customer_id: LegacyId
+    shipping_address: Address
+    id: LegacyId
+    items: list[LegacyVersionedItem]
+    status: Status = Status.PENDING
+
+
+def build_legacy_orders(order_count: int, item_count: int) -> list[Any]:
+    generate = SnowflakeIdGenerator(worker_id=0).generate_order_id
+    address = Address()
+    return [
+        LegacyPersistedOrder(
+            customer_id=LegacyId(value=generate().value),
+            shipping_address=address,
+            id=LegacyId(value=generate().value),
+            items=[
+                LegacyVersionedItem(
+                    product_id=LegacyId(value=generate().value),
+                    quantity=1,
+                    product_version_id=LegacyId(value=generate().value),
+                )
+                for _ in range(0, item_count)
+            ],
+        )
+        for _ in range(0, order_count)
+    ]
+
+
+def build_orders(order_count: int, item_count: int) -> list[Any]:
+    generate = SnowflakeIdGenerator(worker_id=0).generate_order_id
+    address = Address()
+    return [
+        PersistedOrder(
+            customer_id=generate(),
+            shipping_address=address,
+            id=generate(),
+            items=[
+                VersionedItem(
+                    product_id=generate(),
+                    quantity=1,
+                    product_version_id=generate(),
+                )
+                for _ in range(0, item_count)
+            ],
+        )
+        for _ in range(0, order_count)
+    ]
+
+
+def build_compact_orders(order_count: int, item_count: int) -> list[Any]:
+    return [
+        CompactPersistedOrder.from_persisted_order(order)
+        for order in build_orders(order_count=order_count, item_count=item_count)
+    ]
+
+
+def measure_bytes_per_order(
+    build: Callable[[int, int], list[Any]], order_count: int, item_count: int
+) -> float:
+    gc.collect()
+    tracemalloc.start()
+    orders = build(order_count, item_count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return size / order_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=5)
+    args = parser.parse_args()
+
+    variants = [
+        ("before: dict-backed dataclasses", build_legacy_orders),
+        ("after: slotted PersistedOrder", build_orders),
+        ("after: CompactPersistedOrder", build_compact_orders),
+    ]
+    baseline = None
+    print(f"{args.orders} orders with {args.items} items each")
+    for name, build in variants:
+        bytes_per_order = measure_bytes_per_order(
+            build=build, order_count=args.orders, item_count=args.items
+        )
+        baseline = baseline or bytes_per_order
+        print(
+            f"{name:<34} {bytes_per_order:>8.0f} bytes/order"
+            f" ({bytes_per_order / baseline:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures insert throughput and lookup latency of `SqliteOrderStore`.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_sqlite_order_store.py --orders 10000000
+
+The database is created in a temporary directory unless `--path` is given.
+"""
+from _common import measure, versioned_order
+from adapters.persistence.sqlite_order_store import SqliteOrderStore
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import VersionedOrder
+import argparse
+import os
+import random
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "orders.sqlite3")
+    store = SqliteOrderStore(path=path)
+    generate = SnowflakeIdGenerator(worker_id=1).generate_order_id
+    customer_ids = [generate() for _ in range(0, args.customers)]
+    product_ids = [generate() for _ in range(0, 1_000)]
+
+    def order() -> VersionedOrder:
+        return versioned_order(customer_ids, product_ids, items=args.items)
+
+    order_ids: list[Identifier] = []
+    start = time.perf_counter()
+    for offset in range(0, args.orders, args.batch_size):
+        batch_size = min(args.batch_size, args.orders - offset)
+        batch = [order() for _ in range(0, batch_size)]
+        persisted_orders = store.save_orders(versioned_orders=batch)
+        order_ids.append(random.choice(persisted_orders).id)
+    elapsed = time.perf_counter() - start
+    print(f"{args.orders} orders with {args.items} items each in {path}")
+    print(f"bulk insert         {args.orders / elapsed:12.0f} orders/s")
+
+    start = time.perf_counter()
+    for _ in range(0, 1_000):
+        store.save_order(versioned_order=order())
+    print(f"single insert       {1_000 / (time.perf_counter() - start):12.0f} orders/s")
+
+    sample = random.choices(order_ids, k=args.lookups)
+    print(
+        "point lookup        "
+        + measure(lambda id: store.get_order_by_order_id(order_id=id), sample)
+    )
+    customer_sample = random.choices(customer_ids, k=min(args.lookups, 1_000))
+    print(
+        "customer lookup     "
+        + measure(
+            lambda id: store.get_orders_by_customer_id(customer_id=id),
+            customer_sample,
+        )
+    )
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
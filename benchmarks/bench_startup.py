@@ -0,0 +1,103 @@
+"""
+Measures import time and cold start of workers wired by the composition root,
+each in a fresh interpreter: the time from the first import until the first
+call to a service returns.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_startup.py --budget-ms 150
+
+With `--budget-ms`, the script exits with status 1 if the median cold start
+of any worker exceeds the budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import textwrap
+
+SCENARIOS = {
+    "import composition root": """
+        from adapters.composition_root import Container
+    """,
+    "read worker": """
+        from adapters.composition_root import Container
+        container = Container()
+        container.order_data_by_order_id_service.get_order_by_order_id
+        container.order_store.get_order_data_by_order_id(order_id=1)
+    """,
+    "write worker": """
+        from adapters.composition_root import Container
+        from domain.models.order import Address, RequestedOrder
+        from domain.ports.spi.product_catalogue_spi import GetProductVersionIdsSPI
+
+        class Catalogue:
+            def get_product_versions(self, product_ids):
+                return GetProductVersionIdsSPI.Result({}, set(), set())
+
+        with Container(product_catalogue=Catalogue) as container:
+            order = container.place_order_service.place_order(
+                requested_order=RequestedOrder(
+                    customer_id=1, shipping_address=Address(), items=[]
+                )
+            )
+            container.update_order_status_service
+    """,
+    "eager imports, for comparison": """
+        import adapters.cache.order_cache
+        import adapters.cache.product_version_cache
+        import adapters.events.buffered_event_dispatcher
+        import adapters.metrics.instrumentation
+        import adapters.persistence.in_memory_order_store
+        import adapters.persistence.postgres_order_store
+        import adapters.persistence.sqlite_order_store
+        import domain.services.order_data_service
+        import domain.services.place_order_service
+        import domain.services.update_order_status_service
+    """,
+}
+
+
+def run(code: str) -> float:
+    # Times the scenario inside the interpreter, leaving out its own start-up.
+    script = (
+        "import time\nstart = time.perf_counter()\n"
+        + textwrap.dedent(code)
+        + "\nprint(time.perf_counter() - start)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ),
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    over_budget = []
+    for name, code in SCENARIOS.items():
+        timings = [run(code) * 1e3 for _ in range(0, args.runs)]
+        median = statistics.median(timings)
+        print(f"{name:<32} median {median:8.1f} ms  max {max(timings):8.1f} ms")
+        if (
+            args.budget_ms is not None
+            and name.endswith("worker")
+            and median > args.budget_ms
+        ):
+            over_budget.append(name)
+    if over_budget != []:
+        print(f"Over the {args.budget_ms} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
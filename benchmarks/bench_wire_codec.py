@@ -0,0 +1,134 @@
+"""
+Compares the binary wire codec with a JSON baseline
+for encoding and decoding `DispatchableEvent`s.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/bench_wire_codec.py --events 100000 --items 3
+"""
+from adapters.events.wire_codec import (
+    EventBatchView,
+    decode_event,
+    encode_batch,
+    encode_event,
+)
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier, SnowflakeId, SnowflakeIdGenerator
+from domain.models.order import Address, PersistedOrder, VersionedItem
+from domain.models.order_status import Status
+from typing import Any, Callable
+import argparse
+import json
+import time
+
+
+def value(id: Identifier) -> int:
+    assert isinstance(id, SnowflakeId)
+    return id.value
+
+
+def to_json(event: DispatchableEvent) -> bytes:
+    order = event.order
+    document: dict[str, Any] = {
+        "event_type": event.event_type.name,
+        "order": {
+            "id": value(order.id),
+            "customer_id": value(order.customer_id),
+            "status": order.status.name,
+            "items": [
+                {
+                    "product_id": value(item.product_id),
+                    "product_version_id": value(item.product_version_id),
+                    "quantity": item.quantity,
+                }
+                for item in order.items
+            ],
+        },
+    }
+    return json.dumps(document, separators=(",", ":")).encode()
+
+
+def from_json(data: bytes) -> DispatchableEvent:
+    document = json.loads(data)
+    order = document["order"]
+    return DispatchableEvent(
+        order=PersistedOrder(
+            customer_id=SnowflakeId(value=order["customer_id"]),
+            shipping_address=Address(),
+            id=SnowflakeId(value=order["id"]),
+            items=[
+                VersionedItem(
+                    product_id=SnowflakeId(value=item["product_id"]),
+                    quantity=item["quantity"],
+                    product_version_id=SnowflakeId(value=item["product_version_id"]),
+                )
+                for item in order["items"]
+            ],
+            status=Status[order["status"]],
+        ),
+        event_type=DispatchableEvent.EventType[document["event_type"]],
+    )
+
+
+def rate(call: Callable[[], object], count: int) -> float:
+    start = time.perf_counter()
+    call()
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--products", type=int, default=1_000)
+    args = parser.parse_args()
+
+    generate = SnowflakeIdGenerator(worker_id=1).generate_order_id
+    product_ids = [generate() for _ in range(0, args.products)]
+    events = [
+        DispatchableEvent(
+            order=PersistedOrder(
+                customer_id=generate(),
+                shipping_address=Address(),
+                id=generate(),
+                items=[
+                    VersionedItem(
+                        product_id=product_ids[(index + item) % args.products],
+                        quantity=2,
+                        product_version_id=product_ids[(index + item) % args.products],
+                    )
+                    for item in range(0, args.items)
+                ],
+            ),
+            event_type=DispatchableEvent.EventType.TO_BE_ACCEPTED_BY_INVENTORY,
+        )
+        for index in range(0, args.events)
+    ]
+    count = len(events)
+    json_records = [to_json(event) for event in events]
+    binary_records = [encode_event(event) for event in events]
+    frame = encode_batch(events)
+
+    print(f"{count} events with {args.items} items each")
+    print(
+        f"size       json {sum(map(len, json_records)) / count:8.1f} B/event"
+        f"   binary {sum(map(len, binary_records)) / count:8.1f} B/event"
+    )
+    print(
+        f"encode     json {rate(lambda: [to_json(e) for e in events], count):8.0f}/s"
+        f"   binary {rate(lambda: [encode_event(e) for e in events], count):8.0f}/s"
+        f"   batch {rate(lambda: encode_batch(events), count):8.0f}/s"
+    )
+    print(
+        f"decode     json {rate(lambda: [from_json(r) for r in json_records], count):8.0f}/s"  # noqa: E501
+        f"   binary {rate(lambda: [decode_event(r) for r in binary_records], count):8.0f}/s"  # noqa: E501
+        f"   batch {rate(lambda: list(EventBatchView(frame)), count):8.0f}/s"
+    )
+    view = EventBatchView(frame)
+    print(
+        "route      batch order ids without decoding orders "
+        f"{rate(lambda: [view.order_id(i) for i in range(0, count)], count):8.0f}/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+from adapters.cache.lru_cache import CacheStats, LRUCache
+from domain.errors import PlaceOrderInProgressError
+from domain.models.order import PersistedOrder
+from threading import Event, Lock
+from typing import Callable
+import asyncio
+import time
+
+
+class InMemoryIdempotencyStore:
+    """
+    Implements `PlaceOrderIdempotencySPI` in process.
+
+    Placed orders are kept by idempotency key in a bounded LRU cache,
+    and expire after `ttl_seconds`, which should outlast client retries.
+    A claimed key has an event that callers with the same key wait on,
+    for at most `wait_timeout_seconds`. When the claim is released
+    instead of completed, one waiter claims the key and places the order.
+
+    Keys are only deduplicated within one process. Route retries with the same
+    key to the same worker, or use a shared store, when running several.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100_000,
+        ttl_seconds: float | None = 24 * 60 * 60,
+        wait_timeout_seconds: float = 30.0,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._placed: LRUCache[str, PersistedOrder] = LRUCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, _clock=_clock
+        )
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._lock = Lock()
+        self._claims: dict[str, Event] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._placed.stats
+
+    def claim(self, idempotency_key: str) -> PersistedOrder | None:
+        """
+        Raises:
+            PlaceOrderInProgressError: if the key stays claimed
+                for `wait_timeout_seconds`.
+        """
+        deadline = time.monotonic() + self._wait_timeout_seconds
+        while True:
+            with self._lock:
+                placed_order = self._placed.get(key=idempotency_key)
+                if placed_order is not None:
+                    return placed_order
+                claim = self._claims.get(idempotency_key)
+                if claim is None:
+                    self._claims[idempotency_key] = Event()
+                    return None
+            if not claim.wait(timeout=max(deadline - time.monotonic(), 0)):
+                raise PlaceOrderInProgressError(idempotency_key=idempotency_key)
+
+    def complete(self, idempotency_key: str, persisted_order: PersistedOrder) -> None:
+        with self._lock:
+            self._placed.set(key=idempotency_key, value=persisted_order)
+            claim = self._claims.pop(idempotency_key, None)
+        if claim is not None:
+            claim.set()
+
+    def release(self, idempotency_key: str) -> None:
+        with self._lock:
+            claim = self._claims.pop(idempotency_key, None)
+        if claim is not None:
+            claim.set()
+
+
+class AsyncInMemoryIdempotencyStore:
+    """
+    Asyncio twin of `InMemoryIdempotencyStore`, implementing
+    `AsyncPlaceOrderIdempotencySPI` for coroutines of one event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100_000,
+        ttl_seconds: float | None = 24 * 60 * 60,
+        wait_timeout_seconds: float = 30.0,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._placed: LRUCache[str, PersistedOrder] = LRUCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, _clock=_clock
+        )
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._claims: dict[str, asyncio.Event] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._placed.stats
+
+    async def claim(self, idempotency_key: str) -> PersistedOrder | None:
+        deadline = time.monotonic() + self._wait_timeout_seconds
+        while True:
+            placed_order = self._placed.get(key=idempotency_key)
+            if placed_order is not None:
+                return placed_order
+            claim = self._claims.get(idempotency_key)
+            if claim is None:
+                self._claims[idempotency_key] = asyncio.Event()
+                return None
+            try:
+                await asyncio.wait_for(
+                    claim.wait(), timeout=max(deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                raise PlaceOrderInProgressError(idempotency_key=idempotency_key)
+
+    async def complete(
+        self, idempotency_key: str, persisted_order: PersistedOrder
+    ) -> None:
+        self._placed.set(key=idempotency_key, value=persisted_order)
+        claim = self._claims.pop(idempotency_key, None)
+        if claim is not None:
+            claim.set()
+
+    async def release(self, idempotency_key: str) -> None:
+        claim = self._claims.pop(idempotency_key, None)
+        if claim is not None:
+            claim.set()
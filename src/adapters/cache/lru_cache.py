@@ -0,0 +1,130 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+import time
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+class LRUCache(Generic[_K, _V]):
+    """
+    Thread-safe cache with a bounded size, least recently used eviction
+    and an optional time to live for each entry.
+    Values must not be `None`, since `None` is returned on a miss.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float | None = None,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = _clock
+        self._entries: OrderedDict[_K, tuple[_V, float | None]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _K) -> _V | None:
+        with self._lock:
+            return self._get(key=key)
+
+    def get_many(self, keys: Iterable[_K]) -> dict[_K, _V]:
+        """
+        Returns the cached value of each key that is present.
+        """
+        with self._lock:
+            result = {}
+            for key in keys:
+                value = self._get(key=key)
+                if value is not None:
+                    result[key] = value
+            return result
+
+    def set(self, key: _K, value: _V, ttl_seconds: float | None = None) -> None:
+        """
+        Stores `value` under `key`.
+        `ttl_seconds` overrides the default time to live of the cache.
+        """
+        ttl_seconds = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = None if ttl_seconds is None else self._clock() + ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def replace(self, key: _K, update: Callable[[_V], _V]) -> bool:
+        """
+        Replaces the value under `key` with `update(value)`,
+        keeping its expiry. Returns `False` if `key` is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            value, expires_at = entry
+            self._entries[key] = (update(value), expires_at)
+            return True
+
+    def invalidate(self, keys: Iterable[_K]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def _get(self, key: _K) -> _V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
@@ -0,0 +1,229 @@
+from __future__ import annotations
+from adapters.cache.lru_cache import LRUCache, CacheStats
+from adapters.hashing import spread_hash
+from domain.models.identifier import Identifier
+from domain.models.order import PersistedOrder
+from domain.models.order_status import Status
+from domain.ports.spi.order_persistence_spi import (
+    GetOrderByOrderIdSPI,
+    GetOrdersByOrderIdsSPI,
+    UpdateOrderSPI,
+    UpdateOrdersSPI,
+    ConditionalUpdateOrderSPI,
+)
+from contextlib import ExitStack
+from threading import Lock
+from typing import Callable, Iterable
+import time
+
+
+class WriteThroughOrderCache:
+    """
+    Caches persisted orders in front of the order read and update SPIs.
+
+    Reads go through the cache and fill it on a miss.
+    Status updates are written to persistence first. A successful write
+    applies `PersistedOrder.update_status` to the cached order instead of
+    evicting it, so the next transition of the order is served from memory.
+    A write that fails or conflicts evicts the order,
+    since its persisted status is then unknown.
+
+    A read that overlaps a write of an order in the same stripe
+    does not fill the cache, so a slow read cannot cache a stale order.
+    Writes hold the lock of their orders' stripes across the persistence
+    write and the cache update, so concurrent writes of an order through
+    this cache are cached in the order they were persisted.
+
+    Only writes made through this cache keep it current. Deploy it where it
+    sees every status update of its orders, or set `ttl_seconds`.
+    The bulk and conditional SPIs are optional, like in the services;
+    `update_orders_spi` falls back to single writes.
+    """
+
+    def __init__(
+        self,
+        get_order_by_order_id_spi: GetOrderByOrderIdSPI,
+        update_order_spi: UpdateOrderSPI,
+        max_size: int = 100_000,
+        ttl_seconds: float | None = None,
+        get_orders_by_order_ids_spi: GetOrdersByOrderIdsSPI | None = None,
+        update_orders_spi: UpdateOrdersSPI | None = None,
+        conditional_update_order_spi: ConditionalUpdateOrderSPI | None = None,
+        stripes: int = 1024,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._get_order = get_order_by_order_id_spi.get_order_by_order_id
+        self._save_new_status = update_order_spi.update_order_status
+        self._get_orders_spi = get_orders_by_order_ids_spi
+        self._update_orders_spi = update_orders_spi
+        self._conditional_update_spi = conditional_update_order_spi
+        self._cache: LRUCache[Identifier, PersistedOrder] = LRUCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, _clock=_clock
+        )
+        # Write generation of each stripe of order ids. Fills are dropped
+        # if a write to the stripe started after the fill's read did.
+        self._generations = [0] * stripes
+        self._generations_lock = Lock()
+        self._write_locks = [Lock() for _ in range(0, stripes)]
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def invalidate(self, order_ids: Iterable[Identifier]) -> None:
+        self._cache.invalidate(keys=order_ids)
+
+    # GetOrderByOrderIdSPI and GetOrdersByOrderIdsSPI:
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        order = self._cache.get(key=order_id)
+        if order is not None:
+            return order
+        generation = self._generation(order_id=order_id)
+        order = self._get_order(order_id=order_id)
+        if order is not None:
+            self._fill(orders=[order], generations={order_id: generation})
+        return order
+
+    def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        orders = self._cache.get_many(keys=order_ids)
+        missing_ids = [order_id for order_id in order_ids if order_id not in orders]
+        if missing_ids == []:
+            return orders
+        generations = {
+            order_id: self._generation(order_id=order_id) for order_id in missing_ids
+        }
+        if self._get_orders_spi is not None:
+            fetched = list(
+                self._get_orders_spi.get_orders_by_order_ids(
+                    order_ids=missing_ids
+                ).values()
+            )
+        else:
+            fetched = [
+                order
+                for order in map(self._get_order, missing_ids)
+                if order is not None
+            ]
+        self._fill(orders=fetched, generations=generations)
+        orders.update((order.id, order) for order in fetched)
+        return orders
+
+    # UpdateOrderSPI, UpdateOrdersSPI and ConditionalUpdateOrderSPI:
+
+    def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
+        self._write(
+            order_ids=[order_id],
+            new_statuses={order_id: new_status},
+            write=lambda: self._save_new_status(
+                order_id=order_id, new_status=new_status
+            ),
+        )
+
+    def update_order_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        update_orders_spi = self._update_orders_spi
+
+        def write() -> None:
+            if update_orders_spi is not None:
+                update_orders_spi.update_order_statuses(new_statuses=new_statuses)
+                return
+            for order_id, new_status in new_statuses.items():
+                self._save_new_status(order_id=order_id, new_status=new_status)
+
+        self._write(
+            order_ids=list(new_statuses), new_statuses=new_statuses, write=write
+        )
+
+    def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        """
+        Raises:
+            TypeError: if no `conditional_update_order_spi` was given.
+        """
+        if self._conditional_update_spi is None:
+            raise TypeError("WriteThroughOrderCache has no conditional update SPI")
+        conditional_update_spi: ConditionalUpdateOrderSPI = (
+            self._conditional_update_spi
+        )
+        updated = False
+
+        def write() -> None:
+            nonlocal updated
+            updated = conditional_update_spi.update_order_status_if(
+                order_id=order_id,
+                expected_status=expected_status,
+                new_status=new_status,
+            )
+
+        self._write(
+            order_ids=[order_id],
+            new_statuses={order_id: new_status},
+            write=write,
+            applied=lambda: updated,
+        )
+        return updated
+
+    def _write(
+        self,
+        order_ids: list[Identifier],
+        new_statuses: dict[Identifier, Status],
+        write: Callable[[], None],
+        applied: Callable[[], bool] = lambda: True,
+    ) -> None:
+        with ExitStack() as stack:
+            # Taken in stripe order, so bulk writes cannot deadlock.
+            for stripe in sorted({self._stripe(order_id) for order_id in order_ids}):
+                stack.enter_context(self._write_locks[stripe])
+            self._write_locked(
+                order_ids=order_ids,
+                new_statuses=new_statuses,
+                write=write,
+                applied=applied,
+            )
+
+    def _write_locked(
+        self,
+        order_ids: list[Identifier],
+        new_statuses: dict[Identifier, Status],
+        write: Callable[[], None],
+        applied: Callable[[], bool],
+    ) -> None:
+        self._bump_generations(order_ids=order_ids)
+        try:
+            write()
+        except BaseException:
+            self._cache.invalidate(keys=order_ids)
+            raise
+        finally:
+            # Also drops fills whose read overlapped the write.
+            self._bump_generations(order_ids=order_ids)
+        if not applied():
+            self._cache.invalidate(keys=order_ids)
+            return
+        for order_id, new_status in new_statuses.items():
+            self._cache.replace(
+                key=order_id,
+                update=lambda order: order.update_status(new_status=new_status),
+            )
+
+    def _stripe(self, order_id: Identifier) -> int:
+        return spread_hash(order_id) % len(self._generations)
+
+    def _generation(self, order_id: Identifier) -> int:
+        return self._generations[self._stripe(order_id=order_id)]
+
+    def _bump_generations(self, order_ids: list[Identifier]) -> None:
+        with self._generations_lock:
+            for order_id in order_ids:
+                self._generations[self._stripe(order_id=order_id)] += 1
+
+    def _fill(
+        self, orders: list[PersistedOrder], generations: dict[Identifier, int]
+    ) -> None:
+        with self._generations_lock:
+            for order in orders:
+                if self._generation(order_id=order.id) == generations[order.id]:
+                    self._cache.set(key=order.id, value=order)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+from adapters.cache.lru_cache import LRUCache, CacheStats
+from adapters.hashing import spread_hash
+from domain.models.identifier import Identifier
+from domain.models.product import Product, ProductVersion
+from domain.ports.spi.product_catalogue_spi import (
+    GetProductVersionIdsSPI,
+    GetProductVersionsSPI,
+)
+from enum import Enum, auto
+from threading import Lock
+from typing import Callable, Generic, Iterable, TypeVar
+import time
+
+_V = TypeVar("_V")
+
+_STRIPES = 1024
+
+
+class _NegativeEntry(Enum):
+    INVALID = auto()
+    WITHOUT_PRODUCT_VERSION = auto()
+
+
+class _ReadThroughProductCache(Generic[_V]):
+    """
+    Caches one value of type `_V` per product id.
+    Product ids found to be invalid, or without a current product version,
+    are cached as negative entries with their own time to live;
+    `negative_ttl_seconds=None` gives them `ttl_seconds` as well.
+
+    A fetch that overlaps an invalidation of one of its product ids
+    does not store that id, so a slow fetch cannot cache a stale value.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float | None,
+        negative_ttl_seconds: float | None,
+        _clock: Callable[[], float],
+    ) -> None:
+        self._cache: LRUCache[Identifier, _V | _NegativeEntry] = LRUCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, _clock=_clock
+        )
+        self._negative_ttl_seconds = negative_ttl_seconds
+        # Invalidation generation of each stripe of product ids. Fetched values
+        # are dropped if their stripe was invalidated since the fetch started.
+        self._generations = [0] * _STRIPES
+        self._generations_lock = Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def invalidate(self, product_ids: Iterable[Identifier]) -> None:
+        product_ids = list(product_ids)
+        with self._generations_lock:
+            for product_id in product_ids:
+                self._generations[self._stripe(product_id=product_id)] += 1
+            self._cache.invalidate(keys=product_ids)
+
+    def invalidate_all(self) -> None:
+        with self._generations_lock:
+            self._generations = [generation + 1 for generation in self._generations]
+            self._cache.clear()
+
+    def on_product_updated(self, product: Product) -> None:
+        """
+        Invalidation hook to call whenever `product.current_version_id` changes.
+        """
+        self.invalidate(product_ids=[product.id])
+
+    def _lookup(
+        self,
+        product_ids: list[Identifier],
+        fetch: Callable[
+            [list[Identifier]],
+            tuple[dict[Identifier, _V], set[Identifier], set[Identifier]],
+        ],
+    ) -> tuple[dict[Identifier, _V], set[Identifier], set[Identifier]]:
+        """
+        Returns `(values, invalid_ids, ids_without_product_version)`
+        for `product_ids`, calling `fetch` with the cache misses only.
+        """
+        unique_ids = list(dict.fromkeys(product_ids))
+        cached = self._cache.get_many(keys=unique_ids)
+
+        values: dict[Identifier, _V] = {}
+        invalid_ids: set[Identifier] = set()
+        ids_without_product_version: set[Identifier] = set()
+        for product_id, entry in cached.items():
+            if entry is _NegativeEntry.INVALID:
+                invalid_ids.add(product_id)
+            elif entry is _NegativeEntry.WITHOUT_PRODUCT_VERSION:
+                ids_without_product_version.add(product_id)
+            else:
+                values[product_id] = entry
+
+        missing_ids = [id for id in unique_ids if id not in cached]
+        if missing_ids == []:
+            return values, invalid_ids, ids_without_product_version
+
+        generations = {
+            product_id: self._generations[self._stripe(product_id=product_id)]
+            for product_id in missing_ids
+        }
+        fetched_values, fetched_invalid, fetched_without = fetch(missing_ids)
+        with self._generations_lock:
+            current = [
+                product_id
+                for product_id in missing_ids
+                if self._generations[self._stripe(product_id=product_id)]
+                == generations[product_id]
+            ]
+            for product_id in current:
+                if product_id in fetched_values:
+                    self._cache.set(key=product_id, value=fetched_values[product_id])
+                elif product_id in fetched_invalid:
+                    self._cache.set(
+                        key=product_id,
+                        value=_NegativeEntry.INVALID,
+                        ttl_seconds=self._negative_ttl_seconds,
+                    )
+                elif product_id in fetched_without:
+                    self._cache.set(
+                        key=product_id,
+                        value=_NegativeEntry.WITHOUT_PRODUCT_VERSION,
+                        ttl_seconds=self._negative_ttl_seconds,
+                    )
+
+        values.update(fetched_values)
+        invalid_ids.update(fetched_invalid)
+        ids_without_product_version.update(fetched_without)
+        return values, invalid_ids, ids_without_product_version
+
+    @staticmethod
+    def _stripe(product_id: Identifier) -> int:
+        return spread_hash(product_id) % _STRIPES
+
+
+class ProductVersionIdsCache(_ReadThroughProductCache[Identifier]):
+    """
+    Read-through cache implementing `GetProductVersionIdsSPI`
+    on top of another `GetProductVersionIdsSPI`.
+    """
+
+    Result = GetProductVersionIdsSPI.Result
+
+    def __init__(
+        self,
+        get_product_version_ids_spi: GetProductVersionIdsSPI,
+        max_size: int = 10_000,
+        ttl_seconds: float | None = 300,
+        negative_ttl_seconds: float | None = 30,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            max_size=max_size,
+            ttl_seconds=ttl_seconds,
+            negative_ttl_seconds=negative_ttl_seconds,
+            _clock=_clock,
+        )
+        self._spi = get_product_version_ids_spi
+
+    def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionIdsSPI.Result:
+        values, invalid_ids, ids_without_product_version = self._lookup(
+            product_ids=product_ids, fetch=self._fetch
+        )
+        return GetProductVersionIdsSPI.Result(
+            product_version_ids=values,
+            invalid_ids=invalid_ids,
+            ids_without_product_version_id=ids_without_product_version,
+        )
+
+    def _fetch(
+        self, product_ids: list[Identifier]
+    ) -> tuple[dict[Identifier, Identifier], set[Identifier], set[Identifier]]:
+        result = self._spi.get_product_versions(product_ids=product_ids)
+        return (
+            result.product_version_ids,
+            result.invalid_ids,
+            result.ids_without_product_version_id,
+        )
+
+
+class ProductVersionsCache(_ReadThroughProductCache[ProductVersion]):
+    """
+    Read-through cache implementing `GetProductVersionsSPI`
+    on top of another `GetProductVersionsSPI`.
+    """
+
+    Result = GetProductVersionsSPI.Result
+
+    def __init__(
+        self,
+        get_product_versions_spi: GetProductVersionsSPI,
+        max_size: int = 10_000,
+        ttl_seconds: float | None = 300,
+        negative_ttl_seconds: float | None = 30,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            max_size=max_size,
+            ttl_seconds=ttl_seconds,
+            negative_ttl_seconds=negative_ttl_seconds,
+            _clock=_clock,
+        )
+        self._spi = get_product_versions_spi
+
+    def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionsSPI.Result:
+        values, invalid_ids, ids_without_product_version = self._lookup(
+            product_ids=product_ids, fetch=self._fetch
+        )
+        return GetProductVersionsSPI.Result(
+            product_versions=values,
+            invalid_ids=invalid_ids,
+            ids_without_product_version_id=ids_without_product_version,
+        )
+
+    def _fetch(
+        self, product_ids: list[Identifier]
+    ) -> tuple[dict[Identifier, ProductVersion], set[Identifier], set[Identifier]]:
+        result = self._spi.get_product_versions(product_ids=product_ids)
+        return (
+            result.product_versions,
+            result.invalid_ids,
+            result.ids_without_product_version_id,
+        )
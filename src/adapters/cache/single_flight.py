@@ -0,0 +1,300 @@
+from __future__ import annotations
+from dataclasses import dataclass, is_dataclass, replace
+from domain.errors import ReadFromPersistenceError
+from domain.models.identifier import Identifier
+from domain.models.order import OrderData, PersistedOrder
+from domain.ports.spi.order_persistence_spi import (
+    GetOrderByOrderIdSPI,
+    GetOrderDataByOrderIdSPI,
+    GetOrderDataByCustomerIdSPI,
+    AsyncGetOrderByOrderIdSPI,
+    AsyncGetOrderDataByOrderIdSPI,
+    AsyncGetOrderDataByCustomerIdSPI,
+)
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+import asyncio
+import copy
+import time
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    calls: int
+    # Calls that went to persistence; the others shared one of these.
+    executions: int
+    timeouts: int
+
+    @property
+    def collapse_ratio(self) -> float:
+        """
+        Share of calls served by another call's read, from 0 to 1.
+        """
+        if self.calls == 0:
+            return 0.0
+        return 1 - self.executions / self.calls
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.calls = 0
+        self.executions = 0
+        self.timeouts = 0
+
+    def stats(self) -> SingleFlightStats:
+        with self.lock:
+            return SingleFlightStats(
+                calls=self.calls, executions=self.executions, timeouts=self.timeouts
+            )
+
+
+class _Flight:
+    def __init__(self, deadline: float | None) -> None:
+        self.done = Event()
+        self.deadline = deadline
+        self.result: Any = None
+        self.error: Exception | None = None
+        # Set if the call was interrupted, e.g. by `KeyboardInterrupt`,
+        # which concerns its caller only.
+        self.interrupted = False
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers that arrive while
+    a call for their key is in flight wait for it and share its result
+    instead of making their own call. If the call raises, each waiter raises
+    a copy of the error chained from it. If the call is interrupted by
+    anything but an `Exception`, a waiter makes the call again.
+
+    Waiters give up with `ReadFromPersistenceError` once the call for their
+    key has been in flight for `timeout_seconds`, however late they arrived.
+    The caller making the call is not interrupted.
+    """
+
+    def __init__(self, timeout_seconds: float | None = 5.0) -> None:
+        self._timeout_seconds = timeout_seconds
+        self._lock = Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._counters = _Counters()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._counters.stats()
+
+    def do(self, key: Hashable, call: Callable[[], V]) -> V:
+        with self._counters.lock:
+            self._counters.calls += 1
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if flight is None:
+                    flight = self._flights[key] = _Flight(
+                        deadline=_deadline(self._timeout_seconds)
+                    )
+            if leader:
+                with self._counters.lock:
+                    self._counters.executions += 1
+                return self._lead(key, flight, call)
+            if not flight.done.wait(timeout=_remaining(flight.deadline)):
+                with self._counters.lock:
+                    self._counters.timeouts += 1
+                raise ReadFromPersistenceError
+            if flight.interrupted:
+                continue
+            if flight.error is not None:
+                raise _copy(flight.error) from flight.error
+            return flight.result  # type: ignore[no-any-return]
+
+    def _lead(self, key: Hashable, flight: _Flight, call: Callable[[], V]) -> V:
+        try:
+            flight.result = call()
+            return flight.result
+        except Exception as error:
+            flight.error = error
+            raise
+        except BaseException:
+            flight.interrupted = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio twin of `SingleFlight` for coroutines of one event loop.
+
+    The call runs in a task of its own, so cancelling or timing out
+    any caller, including the first, does not cancel it for the others.
+    """
+
+    def __init__(self, timeout_seconds: float | None = 5.0) -> None:
+        self._timeout_seconds = timeout_seconds
+        # The task of each key in flight, with its deadline.
+        self._flights: dict[Hashable, tuple[asyncio.Future[Any], float | None]] = {}
+        self._counters = _Counters()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._counters.stats()
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[V]]) -> V:
+        self._counters.calls += 1
+        if key not in self._flights:
+            self._counters.executions += 1
+            task = asyncio.ensure_future(call())
+            self._flights[key] = (task, _deadline(self._timeout_seconds))
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        flight, deadline = self._flights[key]
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(flight), timeout=_remaining(deadline)
+            )
+        except Exception as error:
+            if not flight.done():
+                self._counters.timeouts += 1
+                raise ReadFromPersistenceError
+            raise _copy(error) from error
+
+
+class CoalescingOrderReader:
+    """
+    Implements `GetOrderByOrderIdSPI`, `GetOrderDataByOrderIdSPI` and
+    `GetOrderDataByCustomerIdSPI` on top of the given SPIs, coalescing
+    concurrent reads of the same order or customer into one call.
+
+    Every SPI is optional; calling a method whose SPI was not given raises
+    `TypeError`. Concurrent callers by customer id each get their own list.
+    """
+
+    def __init__(
+        self,
+        get_order_by_order_id_spi: GetOrderByOrderIdSPI | None = None,
+        get_order_data_by_order_id_spi: GetOrderDataByOrderIdSPI | None = None,
+        get_order_data_by_customer_id_spi: GetOrderDataByCustomerIdSPI | None = None,
+        timeout_seconds: float | None = 5.0,
+    ) -> None:
+        self._get_order_spi = get_order_by_order_id_spi
+        self._get_order_data_spi = get_order_data_by_order_id_spi
+        self._get_customer_order_data_spi = get_order_data_by_customer_id_spi
+        self._flights = SingleFlight(timeout_seconds=timeout_seconds)
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._flights.stats
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        spi = _require(self._get_order_spi, "GetOrderByOrderIdSPI")
+        return self._flights.do(
+            ("order", order_id), lambda: spi.get_order_by_order_id(order_id=order_id)
+        )
+
+    def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
+        spi = _require(self._get_order_data_spi, "GetOrderDataByOrderIdSPI")
+        return self._flights.do(
+            ("order_data", order_id),
+            lambda: spi.get_order_data_by_order_id(order_id=order_id),
+        )
+
+    def get_order_data_by_customer_id(self, customer_id: Identifier) -> list[OrderData]:
+        spi = _require(self._get_customer_order_data_spi, "GetOrderDataByCustomerIdSPI")
+        return list(
+            self._flights.do(
+                ("customer_order_data", customer_id),
+                lambda: spi.get_order_data_by_customer_id(customer_id=customer_id),
+            )
+        )
+
+
+class AsyncCoalescingOrderReader:
+    """
+    Asyncio twin of `CoalescingOrderReader`.
+    """
+
+    def __init__(
+        self,
+        get_order_by_order_id_spi: AsyncGetOrderByOrderIdSPI | None = None,
+        get_order_data_by_order_id_spi: AsyncGetOrderDataByOrderIdSPI | None = None,
+        get_order_data_by_customer_id_spi: (
+            AsyncGetOrderDataByCustomerIdSPI | None
+        ) = None,
+        timeout_seconds: float | None = 5.0,
+    ) -> None:
+        self._get_order_spi = get_order_by_order_id_spi
+        self._get_order_data_spi = get_order_data_by_order_id_spi
+        self._get_customer_order_data_spi = get_order_data_by_customer_id_spi
+        self._flights = AsyncSingleFlight(timeout_seconds=timeout_seconds)
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._flights.stats
+
+    async def get_order_by_order_id(
+        self, order_id: Identifier
+    ) -> PersistedOrder | None:
+        spi = _require(self._get_order_spi, "AsyncGetOrderByOrderIdSPI")
+        return await self._flights.do(
+            ("order", order_id), lambda: spi.get_order_by_order_id(order_id=order_id)
+        )
+
+    async def get_order_data_by_order_id(
+        self, order_id: Identifier
+    ) -> OrderData | None:
+        spi = _require(self._get_order_data_spi, "AsyncGetOrderDataByOrderIdSPI")
+        return await self._flights.do(
+            ("order_data", order_id),
+            lambda: spi.get_order_data_by_order_id(order_id=order_id),
+        )
+
+    async def get_order_data_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[OrderData]:
+        spi = _require(
+            self._get_customer_order_data_spi, "AsyncGetOrderDataByCustomerIdSPI"
+        )
+        return list(
+            await self._flights.do(
+                ("customer_order_data", customer_id),
+                lambda: spi.get_order_data_by_customer_id(customer_id=customer_id),
+            )
+        )
+
+
+T = TypeVar("T")
+
+
+def _deadline(timeout_seconds: float | None) -> float | None:
+    if timeout_seconds is None:
+        return None
+    return time.monotonic() + timeout_seconds
+
+
+def _remaining(deadline: float | None) -> float | None:
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0)
+
+
+def _copy(error: Exception) -> Exception:
+    """
+    Returns a new instance of `error` for a waiter to raise, since raising
+    one instance in several callers would change its traceback under them.
+    """
+    try:
+        if is_dataclass(error) and not isinstance(error, type):
+            return replace(error)
+        return copy.copy(error)
+    except Exception:
+        return ReadFromPersistenceError()
+
+
+def _require(spi: T | None, name: str) -> T:
+    if spi is None:
+        raise TypeError(f"The coalescing order reader has no {name}")
+    return spi
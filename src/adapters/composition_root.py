@@ -0,0 +1,321 @@
+"""
+Wires the order services from a `Settings`.
+
+Nothing is imported or built until a service is first requested,
+and then only the adapters that service needs, so a read-only worker
+never imports the write path or a database driver it does not use.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from adapters.events.buffered_event_dispatcher import BufferedEventDispatcher
+    from adapters.metrics.registry import MetricsRegistry
+    from adapters.persistence.in_memory_order_store import InMemoryOrderStore
+    from adapters.persistence.postgres_order_store import PostgresOrderStore
+    from adapters.persistence.sqlite_order_store import SqliteOrderStore
+    from domain.models.status_transition_validator import (
+        TransitionValidatorProtocol,
+    )
+    from domain.ports.spi.product_catalogue_spi import GetProductVersionIdsSPI
+    from domain.ports.spi.status_update_event_dispatcher_spi import (
+        StatusUpdateEventBatchDispatcherSPI,
+    )
+    from domain.services.order_data_service import (
+        OrderDataByCustomerIdService,
+        OrderDataByOrderIdService,
+        OrderDataPageByCustomerIdService,
+    )
+    from domain.services.place_order_service import PlaceOrderService
+    from domain.services.update_order_status_service import (
+        UpdateOrderStatusService,
+    )
+
+    OrderStore = InMemoryOrderStore | SqliteOrderStore | PostgresOrderStore
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Settings:
+    backend: str = "memory"  # "memory", "sqlite" or "postgres".
+    sqlite_path: str = "orders.sqlite3"
+    postgres_conninfo: str = ""
+    worker_id: int = 0
+    # Zero disables the cache.
+    order_cache_size: int = 0
+    product_catalogue_cache_size: int = 10_000
+    # Placed orders remembered by idempotency key. Zero ignores the keys.
+    idempotency_store_size: int = 100_000
+    compare_and_set: bool = False
+    event_batch_size: int = 100
+    event_max_delay_seconds: float = 0.05
+    metrics: bool = False
+
+
+class Container:
+    """
+    Builds each service and adapter once, on first use.
+
+    Instances are created under one re-entrant lock, since factories
+    request their own dependencies, and read without a lock afterwards.
+    Concurrent first requests therefore share a single instance.
+
+    The product catalogue and the event sink have no adapter
+    in this repository, so they are passed in as factories.
+    The catalogue is only required for `place_order_service`.
+    Without an event sink, events are kept in an `InMemoryEventSink`.
+    """
+
+    def __init__(
+        self,
+        settings: Settings = Settings(),
+        product_catalogue: Callable[[], GetProductVersionIdsSPI] | None = None,
+        event_sink: Callable[[], StatusUpdateEventBatchDispatcherSPI] | None = None,
+    ) -> None:
+        self.settings = settings
+        self._product_catalogue_factory = product_catalogue
+        self._event_sink_factory = event_sink
+        self._lock = RLock()
+        self._instances: dict[str, Any] = {}
+
+    def __enter__(self) -> Container:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Flushes buffered events and closes the order store, if they were built.
+        """
+        with self._lock:
+            instances = self._instances
+            if "event_dispatcher" in instances:
+                instances["event_dispatcher"].close()
+            if "order_store" in instances and hasattr(
+                instances["order_store"], "close"
+            ):
+                instances["order_store"].close()
+
+    # Services:
+
+    @property
+    def place_order_service(self) -> PlaceOrderService:
+        return self._singleton("place_order_service", self._place_order_service)
+
+    @property
+    def update_order_status_service(self) -> UpdateOrderStatusService:
+        return self._singleton(
+            "update_order_status_service", self._update_order_status_service
+        )
+
+    @property
+    def order_data_by_order_id_service(self) -> OrderDataByOrderIdService:
+        def create() -> OrderDataByOrderIdService:
+            from domain.services.order_data_service import OrderDataByOrderIdService
+
+            return self._instrument(
+                OrderDataByOrderIdService(order_data_spi=self._order_data_store())
+            )
+
+        return self._singleton("order_data_by_order_id_service", create)
+
+    @property
+    def order_data_by_customer_id_service(self) -> OrderDataByCustomerIdService:
+        def create() -> OrderDataByCustomerIdService:
+            from domain.services.order_data_service import (
+                OrderDataByCustomerIdService,
+            )
+
+            return self._instrument(
+                OrderDataByCustomerIdService(order_data_spi=self._order_data_store())
+            )
+
+        return self._singleton("order_data_by_customer_id_service", create)
+
+    @property
+    def order_data_page_by_customer_id_service(
+        self,
+    ) -> OrderDataPageByCustomerIdService:
+        def create() -> OrderDataPageByCustomerIdService:
+            from domain.services.order_data_service import (
+                OrderDataPageByCustomerIdService,
+            )
+
+            return self._instrument(
+                OrderDataPageByCustomerIdService(
+                    order_data_page_spi=self._order_data_store()
+                )
+            )
+
+        return self._singleton("order_data_page_by_customer_id_service", create)
+
+    # Adapters:
+
+    @property
+    def order_store(self) -> OrderStore:
+        return self._singleton("order_store", self._order_store)
+
+    @property
+    def event_dispatcher(self) -> BufferedEventDispatcher:
+        def create() -> BufferedEventDispatcher:
+            from adapters.events.buffered_event_dispatcher import (
+                BufferedEventDispatcher,
+            )
+
+            return BufferedEventDispatcher(
+                sink=self._instrument(self._event_sink(), component="event_sink"),
+                max_batch_size=self.settings.event_batch_size,
+                max_delay_seconds=self.settings.event_max_delay_seconds,
+            )
+
+        return self._singleton("event_dispatcher", create)
+
+    @property
+    def metrics_registry(self) -> MetricsRegistry | None:
+        """
+        None unless `Settings.metrics` is set.
+        """
+        if not self.settings.metrics:
+            return None
+
+        def create() -> MetricsRegistry:
+            from adapters.metrics.registry import MetricsRegistry
+
+            return MetricsRegistry()
+
+        return self._singleton("metrics_registry", create)
+
+    def _singleton(self, name: str, create: Callable[[], T]) -> T:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance  # type: ignore[no-any-return]
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = create()
+            return self._instances[name]  # type: ignore[no-any-return]
+
+    def _instrument(self, target: T, component: str | None = None) -> T:
+        if not self.settings.metrics:
+            return target
+        from adapters.metrics.instrumentation import instrument
+
+        return instrument(
+            target,
+            component=component or type(target).__name__,
+            registry=self.metrics_registry,
+        )
+
+    def _order_data_store(self) -> OrderStore:
+        return self._instrument(self.order_store, component="order_store")
+
+    def _order_store(self) -> OrderStore:
+        from domain.models.identifier import SnowflakeIdGenerator
+
+        settings = self.settings
+        order_id_generator = SnowflakeIdGenerator(worker_id=settings.worker_id)
+        if settings.backend == "memory":
+            from adapters.persistence.in_memory_order_store import (
+                InMemoryOrderStore,
+            )
+
+            return InMemoryOrderStore(order_id_generator=order_id_generator)
+        if settings.backend == "sqlite":
+            from adapters.persistence.sqlite_order_store import SqliteOrderStore
+
+            return SqliteOrderStore(
+                path=settings.sqlite_path, order_id_generator=order_id_generator
+            )
+        if settings.backend == "postgres":
+            from adapters.persistence.postgres_order_store import PostgresOrderStore
+
+            return PostgresOrderStore(
+                conninfo=settings.postgres_conninfo,
+                order_id_generator=order_id_generator,
+            )
+        raise ValueError(f"Unknown order store backend {settings.backend!r}")
+
+    def _event_sink(self) -> StatusUpdateEventBatchDispatcherSPI:
+        if self._event_sink_factory is not None:
+            return self._event_sink_factory()
+        from adapters.events.in_memory_event_sink import InMemoryEventSink
+
+        return InMemoryEventSink()
+
+    def _place_order_service(self) -> PlaceOrderService:
+        from domain.services.place_order_service import PlaceOrderService
+
+        if self._product_catalogue_factory is None:
+            raise ValueError("place_order_service needs a product catalogue")
+        product_catalogue = self._product_catalogue_factory()
+        if self.settings.product_catalogue_cache_size > 0:
+            from adapters.cache.product_version_cache import ProductVersionIdsCache
+
+            product_catalogue = ProductVersionIdsCache(
+                get_product_version_ids_spi=product_catalogue,
+                max_size=self.settings.product_catalogue_cache_size,
+            )
+        idempotency_store = None
+        if self.settings.idempotency_store_size > 0:
+            from adapters.cache.idempotency_store import InMemoryIdempotencyStore
+
+            idempotency_store = InMemoryIdempotencyStore(
+                max_size=self.settings.idempotency_store_size
+            )
+        store = self._instrument(self.order_store, component="order_store")
+        return self._instrument(
+            PlaceOrderService(
+                get_product_version_ids_spi=self._instrument(
+                    product_catalogue, component="product_catalogue"
+                ),
+                save_order_spi=store,
+                event_dispatcher=self.event_dispatcher,
+                save_orders_spi=store,
+                batch_event_dispatcher=self.event_dispatcher,
+                idempotency_spi=idempotency_store,
+            )
+        )
+
+    def _update_order_status_service(self) -> UpdateOrderStatusService:
+        from domain.models.status_transition_validator import TransitionValidator
+        from domain.services.update_order_status_service import (
+            UpdateOrderStatusService,
+        )
+
+        settings = self.settings
+        store: Any = self._instrument(self.order_store, component="order_store")
+        if settings.order_cache_size > 0:
+            from adapters.cache.order_cache import WriteThroughOrderCache
+
+            store = WriteThroughOrderCache(
+                get_order_by_order_id_spi=store,
+                update_order_spi=store,
+                max_size=settings.order_cache_size,
+                get_orders_by_order_ids_spi=store,
+                update_orders_spi=store,
+                conditional_update_order_spi=store,
+            )
+        validator: TransitionValidatorProtocol = TransitionValidator
+        if settings.metrics:
+            from adapters.metrics.instrumentation import (
+                instrument_transition_validator,
+            )
+
+            validator = instrument_transition_validator(self.metrics_registry)
+        return self._instrument(
+            UpdateOrderStatusService(
+                update_order_spi=store,
+                get_order_by_order_id_spi=store,
+                status_update_event_dispatcher_spi=self.event_dispatcher,
+                _transition_validator=validator,
+                update_orders_spi=store,
+                get_orders_by_order_ids_spi=store,
+                status_update_event_batch_dispatcher_spi=self.event_dispatcher,
+                conditional_update_order_spi=(
+                    store if settings.compare_and_set else None
+                ),
+            )
+        )
@@ -0,0 +1,331 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from domain.models.event import DispatchableEvent
+from domain.ports.spi.status_update_event_dispatcher_spi import (
+    StatusUpdateEventBatchDispatcherSPI,
+)
+from enum import Enum, auto
+from threading import Condition, Lock, Thread
+from typing import Callable
+import time
+
+
+class Overflow(Enum):
+    BLOCK = auto()  # Wait for room, up to `block_timeout_seconds`, then shed.
+    SHED = auto()  # Drop the event right away.
+
+
+@dataclass
+class PartialDispatchError(Exception):
+    """
+    A sink published the first `published` events of a batch
+    and then failed with `error`.
+    """
+
+    published: int
+    error: Exception
+
+
+@dataclass(frozen=True)
+class DispatcherStats:
+    dispatched: int  # Events handed to the sink without error.
+    shed: int  # Events dropped because the buffer was full.
+    # Events the sink did not publish, and events dropped after it stopped.
+    failed: int
+    # Errors raised by `on_error`, which are otherwise ignored.
+    on_error_failures: int
+    batches: int
+    queue_depth: int
+    flush_seconds_total: float
+    flush_seconds_max: float
+    # Longest time an event waited in the buffer before its batch was flushed.
+    queue_delay_seconds_max: float
+    # Age of the oldest event not yet handed to the sink, including
+    # the batch being flushed; zero when the dispatcher is idle.
+    lag_seconds: float
+
+    @property
+    def flush_seconds_mean(self) -> float:
+        if self.batches == 0:
+            return 0.0
+        return self.flush_seconds_total / self.batches
+
+
+class BufferedEventDispatcher:
+    """
+    Event dispatcher that takes publishing off the request path.
+
+    `dispatch_event` and `dispatch_events` only append to a bounded buffer.
+    A background thread hands the buffered events to `sink` in batches
+    of up to `max_batch_size`, as soon as a batch is full or
+    the oldest buffered event has waited `max_delay_seconds`.
+    When the buffer is full, `overflow` decides whether callers wait
+    for room or the event is shed. Shed events are counted in `stats`.
+
+    A batch the sink raises on is retried up to `max_retries` times,
+    waiting `retry_backoff_seconds` before the first retry and twice as long
+    before each further one. A sink that raises `PartialDispatchError` is
+    only retried with the events it did not publish.
+    The events still unpublished after the last retry are counted as failed
+    and passed to `on_error`. Errors raised by `on_error` itself are only
+    counted in `stats`.
+    With `stop_on_error`, the dispatcher then stops, so no event is published
+    after one that failed: the events still buffered are failed and passed
+    to `on_error` along with them.
+    Once the background thread has stopped on an error,
+    `dispatch_events` and `close` raise `RuntimeError` instead of waiting for it.
+
+    `close` stops accepting events, flushes everything still buffered
+    and stops the background thread.
+    """
+
+    def __init__(
+        self,
+        sink: StatusUpdateEventBatchDispatcherSPI,
+        max_batch_size: int = 100,
+        max_delay_seconds: float = 0.05,
+        max_queue_size: int = 10_000,
+        overflow: Overflow = Overflow.BLOCK,
+        block_timeout_seconds: float | None = None,
+        on_error: Callable[[list[DispatchableEvent], Exception], None] | None = None,
+        max_retries: int = 0,
+        retry_backoff_seconds: float = 0.05,
+        stop_on_error: bool = False,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_batch_size <= 0 or max_queue_size < max_batch_size:
+            raise ValueError(
+                "max_batch_size must be positive and at most max_queue_size"
+            )
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        self._sink = sink
+        self._max_batch_size = max_batch_size
+        self._max_delay_seconds = max_delay_seconds
+        self._max_queue_size = max_queue_size
+        self._overflow = overflow
+        self._block_timeout_seconds = block_timeout_seconds
+        self._on_error = on_error
+        self._max_retries = max_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._stop_on_error = stop_on_error
+        self._clock = _clock
+        # Each event is buffered with the time it was accepted.
+        self._buffer: deque[tuple[DispatchableEvent, float]] = deque()
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+        self._closed = False
+        # Error that stopped the background thread.
+        self._failure: BaseException | None = None
+        # Accept time of the first event of the batch being flushed.
+        self._in_flight_since: float | None = None
+        self._stats_lock = Lock()
+        self._dispatched = 0
+        self._shed = 0
+        self._failed = 0
+        self._on_error_failures = 0
+        self._batches = 0
+        self._flush_seconds_total = 0.0
+        self._flush_seconds_max = 0.0
+        self._queue_delay_seconds_max = 0.0
+        self._worker = Thread(
+            target=self._run, name="buffered-event-dispatcher", daemon=True
+        )
+        self._worker.start()
+
+    def __enter__(self) -> BufferedEventDispatcher:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    # StatusUpdateEventDispatcherSPI and StatusUpdateEventBatchDispatcherSPI:
+
+    def dispatch_event(self, event: DispatchableEvent) -> None:
+        self.dispatch_events(events=[event])
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        """
+        Raises:
+            RuntimeError: if the dispatcher is closed or its background thread
+                has failed.
+        """
+        shed = 0
+        try:
+            with self._lock:
+                for event in events:
+                    if not self._wait_for_room():
+                        shed += 1
+                        continue
+                    self._buffer.append((event, self._clock()))
+                    if len(self._buffer) == 1 or len(self._buffer) >= (
+                        self._max_batch_size
+                    ):
+                        self._not_empty.notify()
+        finally:
+            if shed > 0:
+                with self._stats_lock:
+                    self._shed += shed
+
+    def close(self, timeout_seconds: float | None = None) -> bool:
+        """
+        Flushes all buffered events and stops the background thread.
+        Waits at most `timeout_seconds` for the flush to finish.
+        Returns False if it did not finish in time, leaving events
+        to be flushed in the background.
+
+        Raises:
+            RuntimeError: if the background thread has failed, leaving
+                buffered events unflushed.
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify()
+            self._not_full.notify_all()
+        self._worker.join(timeout=timeout_seconds)
+        self._raise_if_failed()
+        return not self._worker.is_alive()
+
+    @property
+    def stats(self) -> DispatcherStats:
+        with self._lock:
+            queue_depth = len(self._buffer)
+            oldest = self._in_flight_since
+            if oldest is None and queue_depth > 0:
+                oldest = self._buffer[0][1]
+        lag_seconds = 0.0 if oldest is None else self._clock() - oldest
+        with self._stats_lock:
+            return DispatcherStats(
+                dispatched=self._dispatched,
+                shed=self._shed,
+                failed=self._failed,
+                on_error_failures=self._on_error_failures,
+                batches=self._batches,
+                queue_depth=queue_depth,
+                flush_seconds_total=self._flush_seconds_total,
+                flush_seconds_max=self._flush_seconds_max,
+                queue_delay_seconds_max=self._queue_delay_seconds_max,
+                lag_seconds=lag_seconds,
+            )
+
+    def _wait_for_room(self) -> bool:
+        # Called with `_lock` held.
+        self._raise_if_failed()
+        if self._closed:
+            raise RuntimeError("BufferedEventDispatcher is closed")
+        if len(self._buffer) < self._max_queue_size:
+            return True
+        if self._overflow is Overflow.SHED:
+            return False
+        self._not_full.wait_for(
+            lambda: self._closed
+            or self._failure is not None
+            or len(self._buffer) < self._max_queue_size,
+            timeout=self._block_timeout_seconds,
+        )
+        self._raise_if_failed()
+        if self._closed:
+            raise RuntimeError("BufferedEventDispatcher is closed")
+        return len(self._buffer) < self._max_queue_size
+
+    def _raise_if_failed(self) -> None:
+        if self._failure is not None:
+            raise RuntimeError(
+                "BufferedEventDispatcher stopped on an error"
+            ) from self._failure
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                if not self._flush(batch=batch):
+                    return
+        except BaseException as error:
+            with self._lock:
+                self._failure = error
+                self._not_full.notify_all()
+            raise
+
+    def _next_batch(self) -> list[tuple[DispatchableEvent, float]] | None:
+        """
+        Waits until a batch is due and takes it from the buffer.
+        Returns None once the dispatcher is closed and the buffer is empty.
+        """
+        with self._lock:
+            self._not_empty.wait_for(lambda: self._closed or len(self._buffer) > 0)
+            while not self._closed and len(self._buffer) < self._max_batch_size:
+                remaining = (
+                    self._buffer[0][1] + self._max_delay_seconds - self._clock()
+                )
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(timeout=remaining)
+            if len(self._buffer) == 0:
+                return None
+            count = min(len(self._buffer), self._max_batch_size)
+            batch = [self._buffer.popleft() for _ in range(0, count)]
+            self._in_flight_since = batch[0][1]
+            self._not_full.notify(count)
+            return batch
+
+    def _flush(self, batch: list[tuple[DispatchableEvent, float]]) -> bool:
+        """
+        Publishes `batch` and returns whether the dispatcher keeps running.
+        """
+        events = [event for event, _ in batch]
+        start = self._clock()
+        published, error = self._publish(events=events)
+        flush_seconds = self._clock() - start
+        failed = events[published:]
+        with self._lock:
+            self._in_flight_since = None
+            if error is not None and self._stop_on_error:
+                # Later events must not be published ahead of the failed ones.
+                failed += [event for event, _ in self._buffer]
+                self._buffer.clear()
+                self._failure = error
+                self._not_full.notify_all()
+        with self._stats_lock:
+            self._batches += 1
+            self._dispatched += published
+            self._failed += len(failed)
+            self._flush_seconds_total += flush_seconds
+            self._flush_seconds_max = max(self._flush_seconds_max, flush_seconds)
+            self._queue_delay_seconds_max = max(
+                self._queue_delay_seconds_max, start - batch[0][1]
+            )
+        if error is not None and self._on_error is not None:
+            try:
+                self._on_error(failed, error)
+            except Exception:
+                with self._stats_lock:
+                    self._on_error_failures += 1
+        return error is None or not self._stop_on_error
+
+    def _publish(
+        self, events: list[DispatchableEvent]
+    ) -> tuple[int, Exception | None]:
+        """
+        Hands `events` to the sink, retrying the unpublished ones.
+        Returns how many were published and the last error, if any are left.
+        """
+        published = 0
+        backoff_seconds = self._retry_backoff_seconds
+        error: Exception | None = None
+        for attempt in range(0, self._max_retries + 1):
+            if attempt > 0:
+                time.sleep(backoff_seconds)
+                backoff_seconds *= 2
+            try:
+                self._sink.dispatch_events(events=events[published:])
+                return len(events), None
+            except PartialDispatchError as partial:
+                published += partial.published
+                error = partial.error
+            except Exception as exception:
+                error = exception
+        return published, error
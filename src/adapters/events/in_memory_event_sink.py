@@ -0,0 +1,35 @@
+from domain.models.event import DispatchableEvent
+from threading import Lock
+import time
+
+
+class InMemoryEventSink:
+    """
+    Local stand-in for a message broker implementing both event dispatcher SPIs.
+    Records every batch it receives and can simulate a publish round trip
+    with `latency_seconds`.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self._latency_seconds = latency_seconds
+        self._lock = Lock()
+        self._batches: list[list[DispatchableEvent]] = []
+
+    def dispatch_event(self, event: DispatchableEvent) -> None:
+        self.dispatch_events(events=[event])
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        if self._latency_seconds > 0:
+            time.sleep(self._latency_seconds)
+        with self._lock:
+            self._batches.append(list(events))
+
+    @property
+    def batches(self) -> list[list[DispatchableEvent]]:
+        with self._lock:
+            return list(self._batches)
+
+    @property
+    def events(self) -> list[DispatchableEvent]:
+        with self._lock:
+            return [event for batch in self._batches for event in batch]
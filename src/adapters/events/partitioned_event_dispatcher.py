@@ -0,0 +1,155 @@
+from __future__ import annotations
+from adapters.hashing import spread_hash
+from adapters.events.buffered_event_dispatcher import (
+    BufferedEventDispatcher,
+    DispatcherStats,
+    PartialDispatchError,
+)
+from domain.models.event import DispatchableEvent
+from domain.ports.spi.status_update_event_dispatcher_spi import (
+    StatusUpdateEventDispatcherSPI,
+    StatusUpdateEventBatchDispatcherSPI,
+)
+from typing import Callable
+import time
+
+
+class PartitionedEventDispatcher:
+    """
+    Event dispatcher that publishes through several workers in parallel
+    while keeping the events of each order in order.
+
+    Events are routed by the hash of their order id to one of `partitions`
+    `BufferedEventDispatcher`s, each with its own bounded buffer and worker.
+    All events of an order go through the same partition, whose single worker
+    publishes them in the order they were dispatched.
+    Events of different orders in different partitions are published
+    concurrently, so the sinks must be thread-safe.
+
+    Batches are published with `batch_sink` when given,
+    and event by event with `sink` otherwise.
+    The remaining arguments configure every partition,
+    e.g. `max_queue_size` bounds each partition's buffer.
+    Dispatching waits for room in the buffer, since shedding an event
+    would break the order of the events of its order.
+
+    A failed batch is retried up to `max_retries` times with backoff.
+    If it still fails, its partition stops: the unpublished events and
+    everything buffered behind them are counted as failed and passed to
+    `on_error`, in order, and dispatching to the partition raises
+    `RuntimeError`. Other partitions keep publishing.
+    """
+
+    def __init__(
+        self,
+        sink: StatusUpdateEventDispatcherSPI,
+        partitions: int = 8,
+        batch_sink: StatusUpdateEventBatchDispatcherSPI | None = None,
+        max_batch_size: int = 100,
+        max_delay_seconds: float = 0.05,
+        max_queue_size: int = 10_000,
+        on_error: Callable[[list[DispatchableEvent], Exception], None] | None = None,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.05,
+    ) -> None:
+        if partitions <= 0:
+            raise ValueError("partitions must be positive")
+        partition_sink = batch_sink or _SequentialBatchSink(sink=sink)
+        self._partitions = [
+            BufferedEventDispatcher(
+                sink=partition_sink,
+                max_batch_size=max_batch_size,
+                max_delay_seconds=max_delay_seconds,
+                max_queue_size=max_queue_size,
+                on_error=on_error,
+                max_retries=max_retries,
+                retry_backoff_seconds=retry_backoff_seconds,
+                stop_on_error=True,
+            )
+            for _ in range(0, partitions)
+        ]
+
+    def __enter__(self) -> PartitionedEventDispatcher:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    # StatusUpdateEventDispatcherSPI and StatusUpdateEventBatchDispatcherSPI:
+
+    def dispatch_event(self, event: DispatchableEvent) -> None:
+        self._partition(event=event).dispatch_event(event=event)
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        # Keeps the relative order of the events within every partition.
+        by_partition: dict[int, list[DispatchableEvent]] = {}
+        for event in events:
+            by_partition.setdefault(self._partition_index(event=event), []).append(
+                event
+            )
+        for index, partition_events in by_partition.items():
+            self._partitions[index].dispatch_events(events=partition_events)
+
+    def close(self, timeout_seconds: float | None = None) -> bool:
+        """
+        Drains and stops all partitions.
+        Waits at most `timeout_seconds` in total and returns False
+        if a partition did not finish draining in time.
+
+        Raises:
+            RuntimeError: if a partition has stopped on an error,
+                after all partitions are closed.
+        """
+        deadline = None
+        if timeout_seconds is not None:
+            deadline = time.monotonic() + timeout_seconds
+        first_error: Exception | None = None
+        drained = True
+        for partition in self._partitions:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            try:
+                drained = partition.close(timeout_seconds=remaining) and drained
+            except Exception as error:
+                if first_error is None:
+                    first_error = error
+        if first_error is not None:
+            raise first_error
+        return drained
+
+    @property
+    def stats(self) -> list[DispatcherStats]:
+        """
+        Stats of each partition, e.g. its queue depth and lag.
+        """
+        return [partition.stats for partition in self._partitions]
+
+    def _partition(self, event: DispatchableEvent) -> BufferedEventDispatcher:
+        return self._partitions[self._partition_index(event=event)]
+
+    def _partition_index(self, event: DispatchableEvent) -> int:
+        return spread_hash(event.order.id) % len(self._partitions)
+
+
+class _SequentialBatchSink:
+    """
+    Publishes a batch event by event.
+    If an event fails, the rest of the batch is not published.
+
+    Raises:
+        PartialDispatchError: if an event fails, with the number of events
+            published before it.
+    """
+
+    def __init__(self, sink: StatusUpdateEventDispatcherSPI) -> None:
+        self._dispatch_event = sink.dispatch_event
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        for published, event in enumerate(events):
+            try:
+                self._dispatch_event(event=event)
+            except Exception as error:
+                raise PartialDispatchError(
+                    published=published, error=error
+                ) from error
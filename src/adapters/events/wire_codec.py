@@ -0,0 +1,313 @@
+"""
+Versioned binary encoding of `PersistedOrder` and `DispatchableEvent`.
+
+All integers are little-endian. Identifiers must be `SnowflakeId`s
+and are encoded as signed 64-bit integers.
+`Address` has no fields yet, so shipping addresses are not encoded.
+
+Order record:
+    version (u8), status code (u8), order id (i64), customer id (i64),
+    item count (u32), followed by item count items of
+    product id (i64), product version id (i64), quantity (u32).
+
+Event record:
+    version (u8), event type code (u8), followed by the order record
+    without its version byte.
+
+Batch frame:
+    magic b"OEVB", version (u8), event count (u32),
+    event count record offsets (u32) from the start of the frame,
+    followed by the event records.
+"""
+from __future__ import annotations
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier, SnowflakeId
+from domain.models.order import Address, PersistedOrder, VersionedItem
+from domain.models.order_status import Status
+from typing import Any, Iterator, Sequence, overload
+import struct
+
+FORMAT_VERSION = 1
+BATCH_MAGIC = b"OEVB"
+
+# Wire codes are fixed here, so reordering the enums cannot change the format.
+_STATUS_CODES = {
+    Status.PENDING: 1,
+    Status.ACCEPTED_BY_INVENTORY: 2,
+    Status.PAID: 3,
+    Status.SHIPPED: 4,
+    Status.DELIVERED: 5,
+    Status.CANCELLED: 6,
+}
+_EVENT_TYPE_CODES = {
+    DispatchableEvent.EventType.TO_BE_ACCEPTED_BY_INVENTORY: 1,
+    DispatchableEvent.EventType.TO_BE_PAID: 2,
+    DispatchableEvent.EventType.TO_BE_SHIPPED: 3,
+    DispatchableEvent.EventType.SHIPPED: 4,
+    DispatchableEvent.EventType.CANCELLED: 5,
+    DispatchableEvent.EventType.DELIVERED: 6,
+}
+_STATUSES = {code: status for status, code in _STATUS_CODES.items()}
+_EVENT_TYPES = {code: event_type for event_type, code in _EVENT_TYPE_CODES.items()}
+
+_ORDER_HEADER = struct.Struct("<BBqqI")  # version, status, id, customer id, items
+_EVENT_HEADER = struct.Struct("<BBBqqI")  # version, event type, then as above
+_ITEM = struct.Struct("<qqI")
+_BATCH_HEADER = struct.Struct("<4sBI")
+_OFFSET = struct.Struct("<I")
+_MAX_QUANTITY = (1 << 32) - 1
+
+
+_ADDRESS = Address()
+
+
+class WireFormatError(ValueError):
+    """
+    The buffer does not hold a well-formed record of a supported version,
+    or a value to encode does not fit the format.
+    """
+
+
+def encode_order(order: PersistedOrder) -> bytes:
+    return _pack(
+        _ORDER_HEADER,
+        FORMAT_VERSION,
+        _STATUS_CODES[order.status],
+        _id_value(order.id),
+        _id_value(order.customer_id),
+        len(order.items),
+    ) + _encode_items(order.items)
+
+
+def decode_order(buffer: bytes | memoryview) -> PersistedOrder:
+    version, status, order_id, customer_id, item_count = _unpack(
+        _ORDER_HEADER, buffer, 0
+    )
+    _check_version(version)
+    return _order(
+        buffer, _ORDER_HEADER.size, status, order_id, customer_id, item_count, ids={}
+    )
+
+
+def encode_event(event: DispatchableEvent) -> bytes:
+    order = event.order
+    return _pack(
+        _EVENT_HEADER,
+        FORMAT_VERSION,
+        _EVENT_TYPE_CODES[event.event_type],
+        _STATUS_CODES[order.status],
+        _id_value(order.id),
+        _id_value(order.customer_id),
+        len(order.items),
+    ) + _encode_items(order.items)
+
+
+def decode_event(buffer: bytes | memoryview, offset: int = 0) -> DispatchableEvent:
+    return _decode_event(buffer, offset, ids={})
+
+
+def _decode_event(
+    buffer: bytes | memoryview, offset: int, ids: dict[int, SnowflakeId]
+) -> DispatchableEvent:
+    version, event_type, status, order_id, customer_id, item_count = _unpack(
+        _EVENT_HEADER, buffer, offset
+    )
+    _check_version(version)
+    order = _order(
+        buffer,
+        offset + _EVENT_HEADER.size,
+        status,
+        order_id,
+        customer_id,
+        item_count,
+        ids,
+    )
+    try:
+        return DispatchableEvent(order=order, event_type=_EVENT_TYPES[event_type])
+    except KeyError:
+        raise WireFormatError(f"Unknown event type code {event_type}")
+
+
+def encode_batch(events: Sequence[DispatchableEvent]) -> bytes:
+    records = [encode_event(event) for event in events]
+    offsets = []
+    offset = _BATCH_HEADER.size + len(records) * _OFFSET.size
+    for record in records:
+        offsets.append(offset)
+        offset += len(record)
+    return b"".join(
+        [
+            _BATCH_HEADER.pack(BATCH_MAGIC, FORMAT_VERSION, len(records)),
+            _offsets_struct(len(offsets)).pack(*offsets),
+            *records,
+        ]
+    )
+
+
+class EventBatchView(Sequence[DispatchableEvent]):
+    """
+    Read-only view of a batch frame that decodes events on access.
+
+    Works on a `memoryview` of the frame, so no bytes are copied.
+    `order_id` and `event_type` read an event's header without
+    building the order, e.g. to route or filter events.
+    Decoded events share one `SnowflakeId` instance per distinct id,
+    e.g. for products ordered in many events of the batch.
+    """
+
+    def __init__(self, frame: bytes | bytearray | memoryview) -> None:
+        self._frame = memoryview(frame)
+        magic, version, count = _unpack(_BATCH_HEADER, self._frame, 0)
+        if magic != BATCH_MAGIC:
+            raise WireFormatError("Not an event batch frame")
+        _check_version(version)
+        _check_size(self._frame, _BATCH_HEADER.size, count, _OFFSET.size)
+        self._offsets: tuple[int, ...] = _unpack(
+            _offsets_struct(count), self._frame, _BATCH_HEADER.size
+        )
+        self._ids: dict[int, SnowflakeId] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @overload
+    def __getitem__(self, index: int) -> DispatchableEvent:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[DispatchableEvent]:
+        ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> DispatchableEvent | list[DispatchableEvent]:
+        if isinstance(index, slice):
+            return [
+                _decode_event(self._frame, offset, self._ids)
+                for offset in self._offsets[index]
+            ]
+        return _decode_event(self._frame, self._offsets[index], self._ids)
+
+    def __iter__(self) -> Iterator[DispatchableEvent]:
+        frame = self._frame
+        ids = self._ids
+        for offset in self._offsets:
+            yield _decode_event(frame, offset, ids)
+
+    def order_id(self, index: int) -> SnowflakeId:
+        return SnowflakeId(value=self._header(index)[3])
+
+    def event_type(self, index: int) -> DispatchableEvent.EventType:
+        code = self._header(index)[1]
+        try:
+            return _EVENT_TYPES[code]
+        except KeyError:
+            raise WireFormatError(f"Unknown event type code {code}")
+
+    def _header(self, index: int) -> tuple[int, ...]:
+        return _unpack(_EVENT_HEADER, self._frame, self._offsets[index])
+
+
+def _id_value(id: Identifier) -> int:
+    if not isinstance(id, SnowflakeId):
+        raise TypeError(f"Wire codec requires SnowflakeId, got {type(id).__name__}")
+    return id.value
+
+
+def _offsets_struct(count: int) -> struct.Struct:
+    # Only built for counts checked against the frame size.
+    return struct.Struct(f"<{count}I")
+
+
+def _encode_items(items: list[VersionedItem]) -> bytes:
+    buffer = bytearray(len(items) * _ITEM.size)
+    pack_into = _ITEM.pack_into
+    for index, item in enumerate(items):
+        if not 0 <= item.quantity <= _MAX_QUANTITY:
+            raise WireFormatError(f"Quantity {item.quantity} does not fit a u32")
+        try:
+            pack_into(
+                buffer,
+                index * _ITEM.size,
+                _id_value(item.product_id),
+                _id_value(item.product_version_id),
+                item.quantity,
+            )
+        except struct.error as error:
+            raise WireFormatError(str(error))
+    return bytes(buffer)
+
+
+def _order(
+    buffer: bytes | memoryview,
+    offset: int,
+    status: int,
+    order_id: int,
+    customer_id: int,
+    item_count: int,
+    ids: dict[int, SnowflakeId],
+) -> PersistedOrder:
+    end = _check_size(buffer, offset, item_count, _ITEM.size)
+
+    def snowflake_id(value: int) -> SnowflakeId:
+        id = ids.get(value)
+        if id is None:
+            id = ids[value] = SnowflakeId(value=value)
+        return id
+
+    items = [
+        VersionedItem(
+            product_id=snowflake_id(product_id),
+            quantity=quantity,
+            product_version_id=snowflake_id(product_version_id),
+        )
+        for product_id, product_version_id, quantity in _ITEM.iter_unpack(
+            memoryview(buffer)[offset:end]
+        )
+    ]
+    try:
+        status_member = _STATUSES[status]
+    except KeyError:
+        raise WireFormatError(f"Unknown status code {status}")
+    return PersistedOrder(
+        customer_id=snowflake_id(customer_id),
+        shipping_address=_ADDRESS,
+        id=SnowflakeId(value=order_id),
+        items=items,
+        status=status_member,
+    )
+
+
+def _unpack(
+    layout: struct.Struct, buffer: bytes | memoryview, offset: int
+) -> tuple[Any, ...]:
+    try:
+        return layout.unpack_from(buffer, offset)
+    except struct.error:
+        raise WireFormatError("Truncated record")
+
+
+def _pack(layout: struct.Struct, *values: Any) -> bytes:
+    try:
+        return layout.pack(*values)
+    except struct.error as error:
+        raise WireFormatError(str(error))
+
+
+def _check_size(
+    buffer: bytes | memoryview, offset: int, count: int, size: int
+) -> int:
+    """
+    Returns the end of `count` records of `size` bytes at `offset`.
+    Counts are read from the buffer, so they are checked against its length
+    before anything is allocated for them.
+    """
+    end = offset + count * size
+    if end > len(buffer):
+        raise WireFormatError("Truncated record")
+    return end
+
+
+def _check_version(version: int) -> None:
+    if version != FORMAT_VERSION:
+        raise WireFormatError(f"Unsupported format version {version}")
@@ -0,0 +1,15 @@
+from typing import Hashable
+
+_FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+def spread_hash(key: Hashable) -> int:
+    """
+    Returns a 32-bit hash of `key` whose bits all depend on the whole hash.
+
+    Ids may hash to their raw value, e.g. `SnowflakeId`, whose low bits
+    are mostly zero at low rates. Fibonacci hashing spreads them, so
+    `spread_hash(key) % n` distributes keys evenly over n partitions.
+    """
+    return ((hash(key) * _FIBONACCI_MULTIPLIER) & _MASK_64) >> 32
@@ -0,0 +1,355 @@
+"""
+Applies a JSONL feed of order status updates with a pool of worker processes.
+
+Each line holds one update, e.g. `{"order_id": 123, "status": "SHIPPED"}`.
+The file is streamed and the updates are partitioned by order id,
+so all updates of an order go to the same worker and are applied
+in the order of the file. Every worker drives its own
+`UpdateOrderStatusService`, wired by the composition root, and publishes
+the events of its updates to a sink of its own.
+
+Run from the repository root after `pip install -e .`:
+    python -m adapters.ingestion.status_feed feed.jsonl --backend sqlite \\
+        --sqlite-path orders.sqlite3 --event-sink my_broker:EventSink --workers 8
+"""
+from __future__ import annotations
+from adapters.composition_root import Container, Settings
+from adapters.hashing import spread_hash
+from dataclasses import dataclass, replace
+from domain.errors import (
+    DomainError,
+    InsufficientExpectednessError,
+    InvalidOrderIdError,
+)
+from domain.models.identifier import SnowflakeId
+from domain.models.order_status import Status
+from domain.models.status_transition_validator import ExpectednessSetting
+from domain.ports.spi.status_update_event_dispatcher_spi import (
+    StatusUpdateEventBatchDispatcherSPI,
+)
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Callable, Iterable, Sequence
+import argparse
+import importlib
+import json
+import pickle
+import queue
+import time
+import traceback
+
+# Updates are sent to workers in batches of raw order id values and status names,
+# which are cheaper to pickle than domain objects.
+Update = tuple[int, str]
+
+_MAX_ORDER_ID = (1 << 63) - 1
+# How often blocked puts and gets check that the workers are still running.
+_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class IngestionReport:
+    records: int
+    updated: int
+    # Transitions the expectedness setting did not allow.
+    rejected: int
+    # Integer ids outside the range of order ids, or of orders that do not exist.
+    invalid_ids: int
+    # Lines that are not JSON objects with a known status and an order id
+    # that is an integer or a string of ASCII decimal digits.
+    malformed: int
+    # Updates that failed with any other domain error.
+    failed: int
+    seconds: float
+
+    @property
+    def records_per_second(self) -> float:
+        if self.seconds == 0:
+            return 0.0
+        return self.records / self.seconds
+
+
+@dataclass(frozen=True)
+class _WorkerCounts:
+    updated: int = 0
+    rejected: int = 0
+    invalid_ids: int = 0
+    failed: int = 0
+
+
+@dataclass(frozen=True)
+class _WorkerFailure:
+    error: BaseException
+    traceback: str
+
+
+def ingest_status_feed(
+    lines: Iterable[str],
+    settings: Settings,
+    event_sink: Callable[[], StatusUpdateEventBatchDispatcherSPI],
+    workers: int = 4,
+    setting: ExpectednessSetting = ExpectednessSetting.REQUIRE_NEXT_UP,
+    batch_size: int = 1_000,
+) -> IngestionReport:
+    """
+    Applies the updates in `lines` and waits for the workers to finish.
+    At most a few batches per worker are buffered, so memory use does not
+    depend on the size of the feed.
+
+    `event_sink` is called in each worker to create the sink its events
+    are published to, so it must be picklable, e.g. a module-level class.
+    Events still buffered when a worker finishes are flushed to it.
+
+    Raises:
+        ValueError: if `settings` use the in-memory order store, which the
+            worker processes would not share.
+        RuntimeError: if a worker fails, chained from its error.
+            The other workers are stopped.
+    """
+    if settings.backend == "memory":
+        raise ValueError("Status feed ingestion needs a shared order store")
+    start = time.perf_counter()
+    context = get_context()
+    queues: list[Queue[list[Update] | None]] = [
+        context.Queue(maxsize=4) for _ in range(0, workers)
+    ]
+    results: Queue[_WorkerCounts | _WorkerFailure] = context.Queue()
+    processes = [
+        context.Process(
+            target=_work,
+            args=(
+                # Distinct worker ids, in case the services generate order ids.
+                replace(settings, worker_id=settings.worker_id + index),
+                setting,
+                event_sink,
+                queues[index],
+                results,
+            ),
+            name=f"status-feed-worker-{index}",
+        )
+        for index in range(0, workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def put(partition: int, batch: list[Update] | None) -> None:
+        while True:
+            try:
+                queues[partition].put(batch, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                # Workers only exit after their last batch.
+                if not processes[partition].is_alive():
+                    _raise_failure(results)
+
+    records = malformed = invalid_ids = 0
+    batches: list[list[Update]] = [[] for _ in range(0, workers)]
+    try:
+        for line in lines:
+            if line.strip() == "":
+                continue
+            records += 1
+            update = _parse(line)
+            if update is None:
+                malformed += 1
+                continue
+            if not 0 <= update[0] <= _MAX_ORDER_ID:
+                invalid_ids += 1
+                continue
+            partition = spread_hash(update[0]) % workers
+            batch = batches[partition]
+            batch.append(update)
+            if len(batch) >= batch_size:
+                put(partition, batch)
+                batches[partition] = []
+        for partition, batch in enumerate(batches):
+            if batch != []:
+                put(partition, batch)
+            put(partition, None)
+        counts = _collect(results, processes)
+    except BaseException:
+        for process, worker_queue in zip(processes, queues):
+            process.terminate()
+            # Batches left in the queue must not keep this process from exiting.
+            worker_queue.cancel_join_thread()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+    return IngestionReport(
+        records=records,
+        updated=sum(count.updated for count in counts),
+        rejected=sum(count.rejected for count in counts),
+        invalid_ids=invalid_ids + sum(count.invalid_ids for count in counts),
+        malformed=malformed,
+        failed=sum(count.failed for count in counts),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _collect(
+    results: Queue[_WorkerCounts | _WorkerFailure],
+    processes: Sequence[BaseProcess],
+) -> list[_WorkerCounts]:
+    counts: list[_WorkerCounts] = []
+    while len(counts) < len(processes):
+        try:
+            result = results.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            exit_codes = [process.exitcode for process in processes]
+            if any(code not in (None, 0) for code in exit_codes):
+                raise RuntimeError(f"A status feed worker exited with {exit_codes}")
+            if None not in exit_codes:
+                # Every worker has exited, so their results are all queued.
+                _raise_failure(results)
+            continue
+        if isinstance(result, _WorkerFailure):
+            raise RuntimeError(
+                f"A status feed worker failed:\n{result.traceback}"
+            ) from result.error
+        counts.append(result)
+    return counts
+
+
+def _raise_failure(results: Queue[_WorkerCounts | _WorkerFailure]) -> None:
+    try:
+        result = results.get(timeout=_POLL_SECONDS)
+    except queue.Empty:
+        raise RuntimeError("A status feed worker exited without a result")
+    if isinstance(result, _WorkerFailure):
+        raise RuntimeError(
+            f"A status feed worker failed:\n{result.traceback}"
+        ) from result.error
+    raise RuntimeError("A status feed worker exited early")
+
+
+def _parse(line: str) -> Update | None:
+    """
+    Returns the update of `line`, or None if it is malformed.
+    The order id may still be out of range.
+    """
+    try:
+        record = json.loads(line)
+        order_id, status = record["order_id"], record["status"]
+    except (ValueError, TypeError, KeyError):
+        return None
+    if isinstance(order_id, str) and order_id.isascii() and order_id.isdigit():
+        order_id = int(order_id)
+    if not isinstance(order_id, int) or isinstance(order_id, bool):
+        return None
+    if not isinstance(status, str) or status not in Status.__members__:
+        return None
+    return order_id, status
+
+
+def _work(
+    settings: Settings,
+    setting: ExpectednessSetting,
+    event_sink: Callable[[], StatusUpdateEventBatchDispatcherSPI],
+    batches: Queue[list[Update] | None],
+    results: Queue[_WorkerCounts | _WorkerFailure],
+) -> None:
+    try:
+        results.put(_apply(settings, setting, event_sink, batches))
+    except BaseException as error:
+        results.put(
+            _WorkerFailure(error=_picklable(error), traceback=traceback.format_exc())
+        )
+
+
+def _apply(
+    settings: Settings,
+    setting: ExpectednessSetting,
+    event_sink: Callable[[], StatusUpdateEventBatchDispatcherSPI],
+    batches: Queue[list[Update] | None],
+) -> _WorkerCounts:
+    updated = rejected = invalid_ids = failed = 0
+    with Container(settings=settings, event_sink=event_sink) as container:
+        update_order_status = container.update_order_status_service.update_order_status
+        for batch in iter(batches.get, None):
+            for order_id, status in batch:
+                try:
+                    update_order_status(
+                        order_id=SnowflakeId(order_id),
+                        new_status=Status[status],
+                        setting=setting,
+                    )
+                    updated += 1
+                except InsufficientExpectednessError:
+                    rejected += 1
+                except InvalidOrderIdError:
+                    invalid_ids += 1
+                except DomainError:
+                    failed += 1
+    return _WorkerCounts(
+        updated=updated, rejected=rejected, invalid_ids=invalid_ids, failed=failed
+    )
+
+
+def _picklable(error: BaseException) -> BaseException:
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+
+def _load_factory(path: str) -> Callable[[], StatusUpdateEventBatchDispatcherSPI]:
+    module_name, _, attribute = path.partition(":")
+    factory: Callable[[], StatusUpdateEventBatchDispatcherSPI] = getattr(
+        importlib.import_module(module_name), attribute
+    )
+    return factory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path")
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "postgres"])
+    parser.add_argument("--sqlite-path", default="orders.sqlite3")
+    parser.add_argument("--postgres-conninfo", default="")
+    parser.add_argument(
+        "--event-sink",
+        required=True,
+        help="module:attribute of a callable creating the event sink of a worker",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument(
+        "--setting",
+        default=ExpectednessSetting.REQUIRE_NEXT_UP.name,
+        choices=[setting.name for setting in ExpectednessSetting],
+    )
+    args = parser.parse_args()
+
+    settings = Settings(
+        backend=args.backend,
+        sqlite_path=args.sqlite_path,
+        postgres_conninfo=args.postgres_conninfo,
+    )
+    with open(args.path) as file:
+        report = ingest_status_feed(
+            file,
+            settings=settings,
+            event_sink=_load_factory(args.event_sink),
+            workers=args.workers,
+            setting=ExpectednessSetting[args.setting],
+            batch_size=args.batch_size,
+        )
+    print(f"records      {report.records:12,d}")
+    print(f"updated      {report.updated:12,d}")
+    print(f"rejected     {report.rejected:12,d}")
+    print(f"invalid ids  {report.invalid_ids:12,d}")
+    print(f"malformed    {report.malformed:12,d}")
+    print(f"failed       {report.failed:12,d}")
+    print(
+        f"throughput   {report.records_per_second:12,.0f} records/s"
+        f"  in {report.seconds:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
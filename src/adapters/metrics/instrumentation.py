@@ -0,0 +1,155 @@
+from __future__ import annotations
+from adapters.metrics.registry import Counter, Histogram, MetricsRegistry
+from domain.models.order_status import StatusTransitionProtocol
+from domain.models.status_transition_validator import (
+    ExpectednessSetting,
+    TransitionValidator,
+    TransitionValidatorProtocol,
+)
+from typing import Any, Callable, TypeVar, cast
+import inspect
+import time
+
+T = TypeVar("T")
+
+CALL_SECONDS = "call_duration_seconds"
+CALL_ERRORS = "call_errors_total"
+TRANSITIONS = "status_transitions_total"
+
+
+def instrument(target: T, component: str, registry: MetricsRegistry | None) -> T:
+    """
+    Returns `target`, a service or an SPI adapter, with every public method
+    recording its latency and the errors it raises in `registry`,
+    labelled by `component` and method name.
+
+    Returns `target` itself when `registry` is None, so disabled
+    instrumentation costs nothing on the call path.
+    """
+    if registry is None:
+        return target
+    return cast(T, _Instrumented(target, component=component, registry=registry))
+
+
+def instrument_transition_validator(
+    registry: MetricsRegistry | None,
+    validator: TransitionValidatorProtocol = TransitionValidator,
+) -> TransitionValidatorProtocol:
+    """
+    Returns `validator` counting its outcomes in `registry` by from status,
+    to status and `ExpectednessSetting`. Pass it to the update order status
+    services as `_transition_validator`.
+    Returns `validator` itself when `registry` is None.
+    """
+    if registry is None:
+        return validator
+    return cast(
+        TransitionValidatorProtocol,
+        _InstrumentedTransitionValidator(validator=validator, registry=registry),
+    )
+
+
+class _Instrumented:
+    def __init__(
+        self, target: object, component: str, registry: MetricsRegistry
+    ) -> None:
+        self._target = target
+        self._component = component
+        self._registry = registry
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if name.startswith("_") or not callable(value):
+            return value
+        method = _timed(
+            value,
+            histogram=self._registry.histogram(
+                CALL_SECONDS,
+                help="Duration of service and SPI calls.",
+                component=self._component,
+                method=name,
+            ),
+            count_error=self._error_counter(method=name),
+        )
+        # Cached on the instance, so later lookups skip `__getattr__`.
+        setattr(self, name, method)
+        return method
+
+    def _error_counter(self, method: str) -> Callable[[Exception], None]:
+        counters: dict[type, Counter] = {}
+
+        def count_error(error: Exception) -> None:
+            counter = counters.get(type(error))
+            if counter is None:
+                counter = counters[type(error)] = self._registry.counter(
+                    CALL_ERRORS,
+                    help="Errors raised by service and SPI calls.",
+                    component=self._component,
+                    method=method,
+                    error=type(error).__name__,
+                )
+            counter.increment()
+
+        return count_error
+
+
+def _timed(
+    method: Callable[..., Any],
+    histogram: Histogram,
+    count_error: Callable[[Exception], None],
+) -> Callable[..., Any]:
+    observe = histogram.observe
+    clock = time.perf_counter
+
+    if inspect.iscoroutinefunction(method):
+
+        async def timed_coroutine(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return await method(*args, **kwargs)
+            except Exception as error:
+                count_error(error)
+                raise
+            finally:
+                observe(clock() - start)
+
+        return timed_coroutine
+
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        start = clock()
+        try:
+            return method(*args, **kwargs)
+        except Exception as error:
+            count_error(error)
+            raise
+        finally:
+            observe(clock() - start)
+
+    return timed
+
+
+class _InstrumentedTransitionValidator:
+    def __init__(
+        self, validator: TransitionValidatorProtocol, registry: MetricsRegistry
+    ) -> None:
+        self._validate = validator.validate_transition
+        self._registry = registry
+        self._counters: dict[tuple[object, ...], Counter] = {}
+
+    def validate_transition(
+        self, transition: StatusTransitionProtocol, setting: ExpectednessSetting
+    ) -> bool:
+        valid = self._validate(transition=transition, setting=setting)
+        key = (transition.from_status, transition.to_status, setting, valid)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = self._registry.counter(
+                TRANSITIONS,
+                help="Validated status transitions by outcome.",
+                from_status=transition.from_status.name,
+                to_status=transition.to_status.name,
+                setting=setting.name,
+                outcome="accepted" if valid else "rejected",
+            )
+        counter.increment()
+        return valid
@@ -0,0 +1,183 @@
+from __future__ import annotations
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+# Upper bounds in seconds, from 50 us to 10 s.
+DEFAULT_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.value = 0
+
+    def increment(self) -> None:
+        with self._lock:
+            self.value += 1
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self._lock = Lock()
+        self.buckets = buckets
+        # Observations per bucket, not cumulative; the last is above every bound.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms keyed by name and labels,
+    rendered in the Prometheus text exposition format.
+
+    Look up a labelled metric once and keep it: `counter` and `histogram`
+    take the registry lock, while incrementing and observing only
+    lock the metric itself.
+    """
+
+    def __init__(self, namespace: str = "orders") -> None:
+        self._namespace = namespace
+        self._lock = Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        self._counters: dict[tuple[str, Labels], Counter] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+
+    def counter(self, name: str, help: str, **labels: str) -> Counter:
+        key = (self._name(name, kind="counter", help=help), _labels(labels))
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = Counter()
+            return counter
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        key = (self._name(name, kind="histogram", help=help), _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets=buckets)
+            return histogram
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            help = dict(self._help)
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+        lines: list[str] = []
+        rendered: set[str] = set()
+
+        def header(name: str) -> None:
+            if name not in rendered:
+                rendered.add(name)
+                kind, text = help[name]
+                lines.append(f"# HELP {name} {_escape_help(text)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), counter in counters:
+            header(name)
+            lines.append(f"{name}{_format(labels)} {counter.value}")
+        for (name, labels), histogram in histograms:
+            header(name)
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, count = histogram.sum, histogram.count
+            cumulative = 0
+            bounds = [_number(bound) for bound in histogram.buckets] + ["+Inf"]
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                bucket_labels = labels + (("le", bound),)
+                lines.append(f"{name}_bucket{_format(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{_format(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_format(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _name(self, name: str, kind: str, help: str) -> str:
+        full_name = f"{self._namespace}_{name}"
+        with self._lock:
+            known = self._help.setdefault(full_name, (kind, help))
+        if known[0] != kind:
+            raise ValueError(f"{full_name} is already registered as a {known[0]}")
+        return full_name
+
+
+def start_http_server(
+    registry: MetricsRegistry, port: int, address: str = "0.0.0.0"
+) -> ThreadingHTTPServer:
+    """
+    Serves `registry` to Prometheus on every path from a daemon thread.
+    Stop it with `shutdown`.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer((address, port), Handler)
+    Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format(labels: Labels) -> str:
+    if labels == ():
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
@@ -0,0 +1,292 @@
+from adapters.hashing import spread_hash
+from domain.errors import (
+    ReadFromPersistenceError,
+    SaveOrderError,
+    UpdateOrderError,
+)
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import (
+    ItemWithProductVersion,
+    OrderData,
+    PersistedOrder,
+    VersionedOrder,
+)
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from domain.ports.spi.order_id_generator_spi import GenerateOrderIdSPI
+from contextlib import ExitStack
+from threading import Lock
+from typing import Iterable
+
+
+class InMemoryOrderStore:
+    """
+    In-process order store implementing every order persistence SPI.
+
+    Orders are kept in a dict keyed by order id, with secondary indexes
+    by customer id and by status, so orders are returned in the order
+    they were saved. The status index uses insertion-ordered dicts as sets.
+    Orders are never removed, so the customer index is an append-only list
+    per customer, with the position of each order kept for paging.
+
+    Reads of single orders take no locks, since orders are immutable and
+    replaced atomically. Writes lock the stripe of the order they modify
+    while updating the order and its index entries. Bulk writes lock the
+    stripes of all their orders and check the whole batch before writing,
+    so like a database transaction they apply all orders or none.
+    Each secondary index has a single lock of its own, held only while
+    the index is changed, so writers of different orders still take it
+    in turn.
+
+    `OrderData` is assembled from the product versions registered
+    with `save_product_versions`.
+    """
+
+    def __init__(
+        self,
+        order_id_generator: GenerateOrderIdSPI | None = None,
+        lock_stripes: int = 64,
+    ) -> None:
+        self._order_id_generator = order_id_generator or SnowflakeIdGenerator(
+            worker_id=0
+        )
+        self._orders: dict[Identifier, PersistedOrder] = {}
+        self._by_customer: dict[Identifier, list[Identifier]] = {}
+        self._customer_positions: dict[Identifier, int] = {}
+        self._by_status: dict[Status, dict[Identifier, None]] = {
+            status: {} for status in Status
+        }
+        self._product_versions: dict[Identifier, ProductVersion] = {}
+        # Rounded up to a power of two, so a stripe is selected with a bit mask.
+        # Order ids are spread first, since the low bits of a `SnowflakeId`
+        # are a sequence number that is mostly zero at low write rates.
+        stripe_count = 1 << max(lock_stripes - 1, 0).bit_length()
+        self._stripes = [Lock() for _ in range(0, stripe_count)]
+        self._stripe_mask = stripe_count - 1
+        self._customer_index_lock = Lock()
+        self._status_index_lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # Product versions:
+
+    def save_product_versions(self, product_versions: Iterable[ProductVersion]) -> None:
+        self._product_versions.update(
+            (product_version.id, product_version)
+            for product_version in product_versions
+        )
+
+    def get_product_versions_by_id(
+        self, product_version_ids: list[Identifier]
+    ) -> dict[Identifier, ProductVersion]:
+        return {
+            id: self._product_versions[id]
+            for id in product_version_ids
+            if id in self._product_versions
+        }
+
+    # SaveOrderSPI, SaveOrdersSPI and InsertOrdersSPI:
+
+    def save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        persisted_order = versioned_order.to_persisted_order(
+            id=self._order_id_generator.generate_order_id()
+        )
+        self._insert(order=persisted_order)
+        return persisted_order
+
+    def save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        persisted_orders = [
+            versioned_order.to_persisted_order(
+                id=self._order_id_generator.generate_order_id()
+            )
+            for versioned_order in versioned_orders
+        ]
+        self.insert_orders(persisted_orders=persisted_orders)
+        return persisted_orders
+
+    def insert_orders(self, persisted_orders: list[PersistedOrder]) -> None:
+        with self._locked(order_ids=[order.id for order in persisted_orders]):
+            order_ids: set[Identifier] = set()
+            for persisted_order in persisted_orders:
+                if persisted_order.id in self._orders or (
+                    persisted_order.id in order_ids
+                ):
+                    raise SaveOrderError(order=persisted_order)
+                order_ids.add(persisted_order.id)
+            for persisted_order in persisted_orders:
+                self._insert_locked(order=persisted_order)
+
+    # UpdateOrderSPI, UpdateOrdersSPI and ConditionalUpdateOrderSPI:
+
+    def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
+        if order_id not in self._orders:
+            raise UpdateOrderError(order_id=order_id)
+        self._update(order_id=order_id, new_status=new_status)
+
+    def update_order_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        with self._locked(order_ids=list(new_statuses)):
+            missing_ids = [id for id in new_statuses if id not in self._orders]
+            if missing_ids != []:
+                raise UpdateOrderError(order_id=missing_ids[0])
+            for order_id, new_status in new_statuses.items():
+                self._update_locked(order_id=order_id, new_status=new_status)
+
+    def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        if order_id not in self._orders:
+            raise UpdateOrderError(order_id=order_id)
+        return self._update(
+            order_id=order_id, new_status=new_status, expected_status=expected_status
+        )
+
+    # GetOrderByOrderIdSPI, GetOrdersByOrderIdsSPI and GetOrdersByCustomerIdSPI:
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        return self._orders.get(order_id)
+
+    def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        orders = self._orders
+        return {
+            order_id: orders[order_id] for order_id in order_ids if order_id in orders
+        }
+
+    def get_orders_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[PersistedOrder]:
+        with self._customer_index_lock:
+            order_ids = list(self._by_customer.get(customer_id, ()))
+        return [self._orders[order_id] for order_id in order_ids]
+
+    def get_orders_by_status(self, status: Status) -> list[PersistedOrder]:
+        with self._status_index_lock:
+            order_ids = list(self._by_status[status])
+        return [self._orders[order_id] for order_id in order_ids]
+
+    # GetOrderDataByOrderIdSPI, GetOrderDataByCustomerIdSPI
+    # and GetOrderDataPageByCustomerIdSPI:
+
+    def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
+        order = self.get_order_by_order_id(order_id=order_id)
+        if order is None:
+            return None
+        return self._to_order_data(order=order)
+
+    def get_order_data_by_customer_id(self, customer_id: Identifier) -> list[OrderData]:
+        return [
+            self._to_order_data(order=order)
+            for order in self.get_orders_by_customer_id(customer_id=customer_id)
+        ]
+
+    def get_order_data_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        limit: int,
+        after_order_id: Identifier | None = None,
+    ) -> list[OrderData]:
+        with self._customer_index_lock:
+            customer_orders = self._by_customer.get(customer_id, [])
+            start = 0
+            if after_order_id is not None:
+                start = self._customer_positions.get(after_order_id, -1) + 1
+                if start == 0 or self._orders[after_order_id].customer_id != (
+                    customer_id
+                ):
+                    return []
+            order_ids = customer_orders[start:start + limit]
+        return [
+            self._to_order_data(order=self._orders[order_id]) for order_id in order_ids
+        ]
+
+    def _to_order_data(self, order: PersistedOrder) -> OrderData:
+        try:
+            items = [
+                ItemWithProductVersion(
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    product_version=self._product_versions[item.product_version_id],
+                )
+                for item in order.items
+            ]
+        except KeyError:
+            raise ReadFromPersistenceError
+        return OrderData(
+            customer_id=order.customer_id,
+            shipping_address=order.shipping_address,
+            id=order.id,
+            items=items,
+            status=order.status,
+        )
+
+    def _insert(self, order: PersistedOrder) -> None:
+        with self._stripe(order.id):
+            if order.id in self._orders:
+                raise SaveOrderError(order=order)
+            self._insert_locked(order=order)
+
+    def _insert_locked(self, order: PersistedOrder) -> None:
+        # Called with the stripe of the order held.
+        order_id = order.id
+        self._orders[order_id] = order
+        with self._customer_index_lock:
+            customer_orders = self._by_customer.get(order.customer_id)
+            if customer_orders is None:
+                customer_orders = self._by_customer[order.customer_id] = []
+            self._customer_positions[order_id] = len(customer_orders)
+            customer_orders.append(order_id)
+        with self._status_index_lock:
+            self._by_status[order.status][order_id] = None
+
+    def _update(
+        self,
+        order_id: Identifier,
+        new_status: Status,
+        expected_status: Status | None = None,
+    ) -> bool:
+        with self._stripe(order_id):
+            return self._update_locked(
+                order_id=order_id,
+                new_status=new_status,
+                expected_status=expected_status,
+            )
+
+    def _update_locked(
+        self,
+        order_id: Identifier,
+        new_status: Status,
+        expected_status: Status | None = None,
+    ) -> bool:
+        # Called with the stripe of the order held.
+        order = self._orders[order_id]
+        if expected_status is not None and order.status != expected_status:
+            return False
+        self._orders[order_id] = order.update_status(new_status=new_status)
+        with self._status_index_lock:
+            del self._by_status[order.status][order_id]
+            self._by_status[new_status][order_id] = None
+        return True
+
+    def _locked(self, order_ids: list[Identifier]) -> ExitStack:
+        """
+        Returns the held stripes of all `order_ids`.
+        They are taken in stripe order, so bulk writes cannot deadlock.
+        """
+        stack = ExitStack()
+        try:
+            for index in sorted({self._stripe_index(id) for id in order_ids}):
+                stack.enter_context(self._stripes[index])
+        except BaseException:
+            stack.close()
+            raise
+        return stack
+
+    def _stripe(self, order_id: Identifier) -> Lock:
+        return self._stripes[self._stripe_index(order_id)]
+
+    def _stripe_index(self, order_id: Identifier) -> int:
+        return spread_hash(order_id) & self._stripe_mask
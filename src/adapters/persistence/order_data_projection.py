@@ -0,0 +1,278 @@
+from __future__ import annotations
+from adapters.events.buffered_event_dispatcher import BufferedEventDispatcher
+from dataclasses import dataclass, replace
+from domain.errors import ReadFromPersistenceError
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier
+from domain.models.order import ItemWithProductVersion, OrderData, PersistedOrder
+from domain.models.product import ProductVersion
+from domain.ports.spi.product_catalogue_spi import GetProductVersionsByIdSPI
+from threading import Lock
+from typing import Callable, Iterable
+import time
+
+
+@dataclass(frozen=True)
+class ProjectionStats:
+    orders: int
+    customers: int
+    events_applied: int
+    # Events that could not be applied. Rebuild to recover them.
+    events_failed: int
+    # Errors raised by `on_error`, which are otherwise ignored.
+    on_error_failures: int
+    rebuilds: int
+    # Age of the oldest dispatched event not yet applied;
+    # zero when the projection is up to date.
+    lag_seconds: float
+
+
+class OrderDataProjection:
+    """
+    Read model of `OrderData` kept up to date from dispatched events.
+
+    Implements `GetOrderDataByOrderIdSPI` and `GetOrderDataByCustomerIdSPI`
+    from denormalized orders, so reads are a dict lookup instead of a join.
+    It is fed by the events of the place order and update order status
+    services: wire it as their event dispatcher, or as a consumer of the
+    events they publish.
+
+    `dispatch_event` and `dispatch_events` only buffer the events.
+    A background thread applies them in the order they were dispatched,
+    so reads are eventually consistent; `stats.lag_seconds` tells how far
+    behind they are. Callers wait when the buffer is full rather than
+    have events dropped, since a dropped event would leave an order stale.
+    `apply_events` applies events synchronously instead.
+
+    Each event carries the whole order. A status update of a projected order
+    replaces its status. A new order is assembled from the product catalogue,
+    whose versions are immutable and therefore kept once resolved.
+    Events of new orders with a product version the catalogue does not have
+    fail on their own; the other events of their batch are applied.
+    Failed events are counted in `stats` and, for dispatched events,
+    passed to `on_error`. Errors raised by `on_error` are counted as well.
+
+    `rebuild` replaces the projection with the given orders, e.g. after
+    failed events or when deploying the projection on existing orders.
+    """
+
+    def __init__(
+        self,
+        get_product_versions_by_id_spi: GetProductVersionsByIdSPI,
+        max_batch_size: int = 500,
+        max_delay_seconds: float = 0.01,
+        max_queue_size: int = 100_000,
+        on_error: Callable[[list[DispatchableEvent], Exception], None] | None = None,
+        _clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._get_product_versions = (
+            get_product_versions_by_id_spi.get_product_versions_by_id
+        )
+        self._orders: dict[Identifier, OrderData] = {}
+        # Order ids of each customer in an insertion-ordered dict used as a set.
+        self._by_customer: dict[Identifier, dict[Identifier, None]] = {}
+        self._product_versions: dict[Identifier, ProductVersion] = {}
+        # Serializes writers, including rebuilds, and guards the customer index.
+        self._apply_lock = Lock()
+        self._index_lock = Lock()
+        self._events_applied = 0
+        self._events_failed = 0
+        self._on_error_failures = 0
+        self._rebuilds = 0
+        self._on_error = on_error
+        self._buffer = BufferedEventDispatcher(
+            sink=_ProjectionSink(self),
+            max_batch_size=max_batch_size,
+            max_delay_seconds=max_delay_seconds,
+            max_queue_size=max_queue_size,
+            _clock=_clock,
+        )
+
+    def __enter__(self) -> OrderDataProjection:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self, timeout_seconds: float | None = None) -> bool:
+        """
+        Applies all buffered events and stops the background thread.
+        Returns False if that did not finish within `timeout_seconds`.
+        The projection can still be read and rebuilt.
+        """
+        return self._buffer.close(timeout_seconds=timeout_seconds)
+
+    @property
+    def stats(self) -> ProjectionStats:
+        buffer_stats = self._buffer.stats
+        with self._index_lock:
+            return ProjectionStats(
+                orders=len(self._orders),
+                customers=len(self._by_customer),
+                events_applied=self._events_applied,
+                events_failed=(
+                    self._events_failed + buffer_stats.failed + buffer_stats.shed
+                ),
+                on_error_failures=self._on_error_failures,
+                rebuilds=self._rebuilds,
+                lag_seconds=buffer_stats.lag_seconds,
+            )
+
+    # StatusUpdateEventDispatcherSPI and StatusUpdateEventBatchDispatcherSPI:
+
+    def dispatch_event(self, event: DispatchableEvent) -> None:
+        self._buffer.dispatch_events(events=[event])
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        """
+        Raises:
+            RuntimeError: if the projection is closed.
+        """
+        self._buffer.dispatch_events(events=events)
+
+    # GetOrderDataByOrderIdSPI and GetOrderDataByCustomerIdSPI:
+
+    def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
+        return self._orders.get(order_id)
+
+    def get_order_data_by_customer_id(self, customer_id: Identifier) -> list[OrderData]:
+        with self._index_lock:
+            order_ids = list(self._by_customer.get(customer_id, ()))
+            orders = self._orders
+        return [orders[order_id] for order_id in order_ids]
+
+    def apply_events(self, events: list[DispatchableEvent]) -> None:
+        """
+        Applies `events` in order.
+
+        Raises:
+            ReadFromPersistenceError: if a product version of a new order
+                cannot be resolved, after applying the other events.
+        """
+        if self._apply_events(events=events) != []:
+            raise ReadFromPersistenceError
+
+    def rebuild(self, orders: Iterable[PersistedOrder]) -> None:
+        """
+        Replaces the projection with `orders`, e.g. every order of a store.
+
+        Events still buffered are applied after the rebuild. Events applied
+        after `orders` were read but before the rebuild are overwritten
+        by the state in `orders`, so stop dispatching while reading `orders`,
+        or dispatch those events again afterwards.
+
+        Raises:
+            ReadFromPersistenceError: if a product version cannot be resolved.
+                The projection is left unchanged.
+        """
+        with self._apply_lock:
+            orders = list(orders)
+            self._resolve_product_versions(orders=orders)
+            rebuilt: dict[Identifier, OrderData] = {}
+            by_customer: dict[Identifier, dict[Identifier, None]] = {}
+            for order in orders:
+                rebuilt[order.id] = self._to_order_data(order=order)
+                by_customer.setdefault(order.customer_id, {})[order.id] = None
+            with self._index_lock:
+                self._orders = rebuilt
+                self._by_customer = by_customer
+                self._rebuilds += 1
+
+    def _apply_events(
+        self, events: list[DispatchableEvent]
+    ) -> list[DispatchableEvent]:
+        """
+        Applies `events` in order and returns those that failed.
+        """
+        with self._apply_lock:
+            new_orders = [
+                event.order
+                for event in events
+                if event.order.id not in self._orders
+            ]
+            self._resolve_product_versions(orders=new_orders, partial=True)
+            failed: list[DispatchableEvent] = []
+            for event in events:
+                if event.order.id not in self._orders and not self._resolved(
+                    order=event.order
+                ):
+                    failed.append(event)
+                    continue
+                self._apply(order=event.order)
+            with self._index_lock:
+                self._events_applied += len(events) - len(failed)
+                self._events_failed += len(failed)
+        return failed
+
+    def _report(self, failed: list[DispatchableEvent]) -> None:
+        if failed != [] and self._on_error is not None:
+            try:
+                self._on_error(failed, ReadFromPersistenceError())
+            except Exception:
+                with self._index_lock:
+                    self._on_error_failures += 1
+
+    def _resolved(self, order: PersistedOrder) -> bool:
+        return all(
+            item.product_version_id in self._product_versions for item in order.items
+        )
+
+    def _resolve_product_versions(
+        self, orders: list[PersistedOrder], partial: bool = False
+    ) -> None:
+        """
+        Keeps the product versions of `orders` that are not kept yet.
+        Unless `partial`, raises `ReadFromPersistenceError` without keeping
+        any if one cannot be resolved.
+        """
+        # Called with `_apply_lock` held.
+        missing_ids = list(
+            dict.fromkeys(
+                item.product_version_id
+                for order in orders
+                for item in order.items
+                if item.product_version_id not in self._product_versions
+            )
+        )
+        if missing_ids == []:
+            return
+        product_versions = self._get_product_versions(product_version_ids=missing_ids)
+        if not partial and len(product_versions) != len(missing_ids):
+            raise ReadFromPersistenceError
+        self._product_versions.update(product_versions)
+
+    def _apply(self, order: PersistedOrder) -> None:
+        # Called with `_apply_lock` held. Items of an order never change,
+        # so a projected order only needs its new status.
+        projected = self._orders.get(order.id)
+        if projected is not None:
+            self._orders[order.id] = replace(projected, status=order.status)
+            return
+        self._orders[order.id] = self._to_order_data(order=order)
+        with self._index_lock:
+            self._by_customer.setdefault(order.customer_id, {})[order.id] = None
+
+    def _to_order_data(self, order: PersistedOrder) -> OrderData:
+        return OrderData(
+            customer_id=order.customer_id,
+            shipping_address=order.shipping_address,
+            id=order.id,
+            items=[
+                ItemWithProductVersion(
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    product_version=self._product_versions[item.product_version_id],
+                )
+                for item in order.items
+            ],
+            status=order.status,
+        )
+
+
+class _ProjectionSink:
+    def __init__(self, projection: OrderDataProjection) -> None:
+        self._projection = projection
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        projection = self._projection
+        projection._report(failed=projection._apply_events(events=events))
@@ -0,0 +1,323 @@
+from __future__ import annotations
+from adapters.persistence.rows import (
+    Row,
+    id_value,
+    orders_from_rows,
+    order_data_from_rows,
+)
+from domain.errors import (
+    ReadFromPersistenceError,
+    SaveOrderError,
+    UpdateOrderError,
+)
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import OrderData, PersistedOrder, VersionedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from domain.ports.spi.order_id_generator_spi import GenerateOrderIdSPI
+from psycopg_pool import ConnectionPool
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Sequence, cast
+import psycopg
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id BIGINT PRIMARY KEY,
+    customer_id BIGINT NOT NULL,
+    status SMALLINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_customer_id ON orders (customer_id, id);
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id BIGINT NOT NULL REFERENCES orders (id),
+    position INTEGER NOT NULL,
+    product_id BIGINT NOT NULL,
+    product_version_id BIGINT NOT NULL,
+    quantity INTEGER NOT NULL,
+    PRIMARY KEY (order_id, position)
+);
+CREATE TABLE IF NOT EXISTS product_versions (
+    id BIGINT PRIMARY KEY,
+    product_id BIGINT NOT NULL,
+    price_amount BIGINT NOT NULL,
+    price_unit TEXT NOT NULL,
+    price_currency TEXT NOT NULL
+);
+"""
+
+_INSERT_ORDER = "INSERT INTO orders (id, customer_id, status) VALUES (%s, %s, %s)"
+_INSERT_ITEM = (
+    "INSERT INTO order_items"
+    " (order_id, position, product_id, product_version_id, quantity)"
+    " VALUES (%s, %s, %s, %s, %s)"
+)
+_COPY_ORDERS = "COPY orders (id, customer_id, status) FROM STDIN"
+_COPY_ITEMS = (
+    "COPY order_items (order_id, position, product_id, product_version_id, quantity)"
+    " FROM STDIN"
+)
+_UPSERT_PRODUCT_VERSION = (
+    "INSERT INTO product_versions"
+    " (id, product_id, price_amount, price_unit, price_currency)"
+    " VALUES (%s, %s, %s, %s, %s)"
+    " ON CONFLICT (id) DO UPDATE SET"
+    " product_id = EXCLUDED.product_id,"
+    " price_amount = EXCLUDED.price_amount,"
+    " price_unit = EXCLUDED.price_unit,"
+    " price_currency = EXCLUDED.price_currency"
+)
+# Updates every order in one statement and returns the ids that were found.
+_UPDATE_STATUSES = (
+    "UPDATE orders AS o SET status = u.status"
+    " FROM unnest(%s::bigint[], %s::smallint[]) AS u (id, status)"
+    " WHERE o.id = u.id RETURNING o.id"
+)
+_UPDATE_STATUS_IF = (
+    "UPDATE orders SET status = %s WHERE id = %s AND status = %s RETURNING id"
+)
+_ORDER_EXISTS = "SELECT 1 FROM orders WHERE id = %s"
+
+_SELECT_ORDERS = (
+    "SELECT o.id, o.customer_id, o.status,"
+    " i.product_id, i.product_version_id, i.quantity"
+    " FROM orders o LEFT JOIN order_items i ON i.order_id = o.id"
+)
+_SELECT_ORDER_DATA = (
+    "SELECT o.id, o.customer_id, o.status,"
+    " i.product_id, i.product_version_id, i.quantity,"
+    " v.product_id, v.price_amount, v.price_unit, v.price_currency"
+    " FROM orders o"
+    " LEFT JOIN order_items i ON i.order_id = o.id"
+    " LEFT JOIN product_versions v ON v.id = i.product_version_id"
+)
+_BY_ID = " WHERE o.id = %s ORDER BY i.position"
+_BY_IDS = " WHERE o.id = ANY(%s) ORDER BY o.id, i.position"
+_BY_CUSTOMER_ID = " WHERE o.customer_id = %s ORDER BY o.id, i.position"
+# Keyset pagination: the subquery walks the (customer_id, id) index.
+_PAGE_BY_CUSTOMER_ID = (
+    " WHERE o.id IN (SELECT id FROM orders"
+    " WHERE customer_id = %s AND id > %s ORDER BY id LIMIT %s)"
+    " ORDER BY o.id, i.position"
+)
+
+
+class PostgresOrderStore:
+    """
+    Order store on PostgreSQL implementing every order persistence SPI.
+
+    Connections come from a bounded pool, which checks each connection
+    before handing it out and replaces broken or long idle ones.
+    Every statement is prepared server-side on first use.
+    Batches of at least `copy_threshold` orders are written with COPY,
+    smaller ones with a pipelined `executemany`.
+    Orders and `OrderData` are read with single joined queries.
+
+    Identifiers must be `SnowflakeId`s. `Address` has no fields yet,
+    so shipping addresses are not stored.
+    """
+
+    def __init__(
+        self,
+        conninfo: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        max_idle_seconds: float = 300,
+        timeout_seconds: float = 5,
+        copy_threshold: int = 64,
+        order_id_generator: GenerateOrderIdSPI | None = None,
+    ) -> None:
+        self._pool = ConnectionPool(
+            conninfo,
+            min_size=min_size,
+            max_size=max_size,
+            max_idle=max_idle_seconds,
+            timeout=timeout_seconds,
+            check=ConnectionPool.check_connection,
+            kwargs={"prepare_threshold": 0},
+            open=True,
+        )
+        self._copy_threshold = copy_threshold
+        self._order_id_generator = order_id_generator or SnowflakeIdGenerator(
+            worker_id=0
+        )
+
+    def create_schema(self) -> None:
+        with self._connection() as connection:
+            connection.execute(_SCHEMA, prepare=False)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    @property
+    def pool_stats(self) -> dict[str, int]:
+        return self._pool.get_stats()
+
+    # Product versions:
+
+    def save_product_versions(self, product_versions: Iterable[ProductVersion]) -> None:
+        rows = [
+            (
+                id_value(product_version.id),
+                id_value(product_version.product_id),
+                product_version.price.amount,
+                product_version.price.unit,
+                product_version.price.currency,
+            )
+            for product_version in product_versions
+        ]
+        with self._connection() as connection:
+            connection.cursor().executemany(_UPSERT_PRODUCT_VERSION, rows)
+
+    # SaveOrderSPI, SaveOrdersSPI and InsertOrdersSPI:
+
+    def save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        return self.save_orders(versioned_orders=[versioned_order])[0]
+
+    def save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        persisted_orders = [
+            versioned_order.to_persisted_order(
+                id=self._order_id_generator.generate_order_id()
+            )
+            for versioned_order in versioned_orders
+        ]
+        self.insert_orders(persisted_orders=persisted_orders)
+        return persisted_orders
+
+    def insert_orders(self, persisted_orders: list[PersistedOrder]) -> None:
+        if persisted_orders == []:
+            return
+        order_rows = [
+            (id_value(order.id), id_value(order.customer_id), order.status.value)
+            for order in persisted_orders
+        ]
+        item_rows = [
+            (
+                order_id,
+                position,
+                id_value(item.product_id),
+                id_value(item.product_version_id),
+                item.quantity,
+            )
+            for order, (order_id, _, _) in zip(persisted_orders, order_rows)
+            for position, item in enumerate(order.items)
+        ]
+        try:
+            with self._connection() as connection:
+                cursor = connection.cursor()
+                if len(persisted_orders) >= self._copy_threshold:
+                    _copy(cursor, _COPY_ORDERS, order_rows)
+                    _copy(cursor, _COPY_ITEMS, item_rows)
+                else:
+                    cursor.executemany(_INSERT_ORDER, order_rows)
+                    cursor.executemany(_INSERT_ITEM, item_rows)
+        except psycopg.Error:
+            raise SaveOrderError(order=persisted_orders[0])
+
+    # UpdateOrderSPI, UpdateOrdersSPI and ConditionalUpdateOrderSPI:
+
+    def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
+        self.update_order_statuses(new_statuses={order_id: new_status})
+
+    def update_order_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        if new_statuses == {}:
+            return
+        ids = {id_value(order_id): order_id for order_id in new_statuses}
+        statuses = [status.value for status in new_statuses.values()]
+        try:
+            with self._connection() as connection:
+                updated_ids = {
+                    row[0]
+                    for row in connection.execute(
+                        _UPDATE_STATUSES, (list(ids), statuses)
+                    ).fetchall()
+                }
+                missing_ids = [id for id in ids if id not in updated_ids]
+                if missing_ids != []:
+                    # Raising inside the block rolls the whole update back.
+                    raise UpdateOrderError(order_id=ids[missing_ids[0]])
+        except psycopg.Error:
+            raise UpdateOrderError(order_id=next(iter(new_statuses)))
+
+    def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        value = id_value(order_id)
+        try:
+            with self._connection() as connection:
+                updated = connection.execute(
+                    _UPDATE_STATUS_IF, (new_status.value, value, expected_status.value)
+                ).fetchone()
+                if updated is not None:
+                    return True
+                exists = connection.execute(_ORDER_EXISTS, (value,)).fetchone()
+        except psycopg.Error:
+            raise UpdateOrderError(order_id=order_id)
+        if exists is None:
+            raise UpdateOrderError(order_id=order_id)
+        return False
+
+    # GetOrderByOrderIdSPI, GetOrdersByOrderIdsSPI and GetOrdersByCustomerIdSPI:
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        rows = self._read(_SELECT_ORDERS + _BY_ID, (id_value(order_id),))
+        return next(orders_from_rows(rows), None)
+
+    def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        values = list(dict.fromkeys(map(id_value, order_ids)))
+        rows = self._read(_SELECT_ORDERS + _BY_IDS, (values,))
+        return {order.id: order for order in orders_from_rows(rows)}
+
+    def get_orders_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[PersistedOrder]:
+        rows = self._read(_SELECT_ORDERS + _BY_CUSTOMER_ID, (id_value(customer_id),))
+        return list(orders_from_rows(rows))
+
+    # GetOrderDataByOrderIdSPI, GetOrderDataByCustomerIdSPI
+    # and GetOrderDataPageByCustomerIdSPI:
+
+    def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
+        rows = self._read(_SELECT_ORDER_DATA + _BY_ID, (id_value(order_id),))
+        return next(order_data_from_rows(rows), None)
+
+    def get_order_data_by_customer_id(self, customer_id: Identifier) -> list[OrderData]:
+        rows = self._read(
+            _SELECT_ORDER_DATA + _BY_CUSTOMER_ID, (id_value(customer_id),)
+        )
+        return list(order_data_from_rows(rows))
+
+    def get_order_data_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        limit: int,
+        after_order_id: Identifier | None = None,
+    ) -> list[OrderData]:
+        # Stored ids are non-negative, so -1 starts at the first order.
+        after = -1 if after_order_id is None else id_value(after_order_id)
+        rows = self._read(
+            _SELECT_ORDER_DATA + _PAGE_BY_CUSTOMER_ID,
+            (id_value(customer_id), after, limit),
+        )
+        return list(order_data_from_rows(rows))
+
+    @contextmanager
+    def _connection(self) -> Iterator[psycopg.Connection[Row]]:
+        # Commits on a clean exit and rolls back if the block raises.
+        with self._pool.connection() as connection:
+            yield cast(psycopg.Connection[Row], connection)
+
+    def _read(self, sql: str, parameters: tuple[Any, ...]) -> list[Row]:
+        try:
+            with self._connection() as connection:
+                return connection.execute(sql, parameters).fetchall()
+        except psycopg.Error:
+            raise ReadFromPersistenceError
+
+
+def _copy(cursor: psycopg.Cursor[Row], statement: str, rows: Sequence[Row]) -> None:
+    with cursor.copy(statement) as copy:
+        for row in rows:
+            copy.write_row(row)
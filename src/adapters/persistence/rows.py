@@ -0,0 +1,93 @@
+from domain.errors import ReadFromPersistenceError
+from domain.models.identifier import Identifier, SnowflakeId
+from domain.models.order import (
+    Address,
+    ItemWithProductVersion,
+    OrderData,
+    PersistedOrder,
+    VersionedItem,
+)
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from itertools import groupby
+from typing import Any, Iterable, Iterator
+
+# Row layout shared by the SQL adapters, ordered by order id and item position:
+# order id, customer id, status value,
+# product id, product version id, quantity,
+# and for `OrderData` also:
+# product id of version, price amount, price unit, price currency.
+# Item columns are NULL for orders without items.
+Row = tuple[Any, ...]
+
+
+def id_value(id: Identifier) -> int:
+    """
+    Returns the integer stored for `id`. SQL adapters require `SnowflakeId`s.
+    """
+    if not isinstance(id, SnowflakeId):
+        raise TypeError(f"SQL adapters require SnowflakeId, got {type(id).__name__}")
+    return id.value
+
+
+def orders_from_rows(rows: Iterable[Row]) -> Iterator[PersistedOrder]:
+    """
+    Builds one order per consecutive group of rows with the same order id.
+    """
+    address = Address()
+    for (order_id, customer_id, status), group in groupby(
+        rows, key=lambda row: row[:3]
+    ):
+        yield PersistedOrder(
+            customer_id=SnowflakeId(value=customer_id),
+            shipping_address=address,
+            id=SnowflakeId(value=order_id),
+            items=[
+                VersionedItem(
+                    product_id=SnowflakeId(value=row[3]),
+                    quantity=row[5],
+                    product_version_id=SnowflakeId(value=row[4]),
+                )
+                for row in group
+                if row[3] is not None
+            ],
+            status=Status(status),
+        )
+
+
+def order_data_from_rows(rows: Iterable[Row]) -> Iterator[OrderData]:
+    address = Address()
+    product_versions: dict[int, ProductVersion] = {}
+
+    def product_version(row: Row) -> ProductVersion:
+        if row[6] is None:
+            raise ReadFromPersistenceError
+        product_version = product_versions.get(row[4])
+        if product_version is None:
+            product_version = product_versions[row[4]] = ProductVersion(
+                id=SnowflakeId(value=row[4]),
+                product_id=SnowflakeId(value=row[6]),
+                price=ProductVersion.Price(
+                    amount=row[7], unit=row[8], currency=row[9]
+                ),
+            )
+        return product_version
+
+    for (order_id, customer_id, status), group in groupby(
+        rows, key=lambda row: row[:3]
+    ):
+        yield OrderData(
+            customer_id=SnowflakeId(value=customer_id),
+            shipping_address=address,
+            id=SnowflakeId(value=order_id),
+            items=[
+                ItemWithProductVersion(
+                    product_id=SnowflakeId(value=row[3]),
+                    quantity=row[5],
+                    product_version=product_version(row),
+                )
+                for row in group
+                if row[3] is not None
+            ],
+            status=Status(status),
+        )
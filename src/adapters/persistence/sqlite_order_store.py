@@ -0,0 +1,306 @@
+from __future__ import annotations
+from adapters.persistence.rows import (
+    Row,
+    id_value,
+    orders_from_rows,
+    order_data_from_rows,
+)
+from domain.errors import (
+    ReadFromPersistenceError,
+    SaveOrderError,
+    UpdateOrderError,
+)
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import OrderData, PersistedOrder, VersionedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from domain.ports.spi.order_id_generator_spi import GenerateOrderIdSPI
+from threading import local
+from typing import Any, Iterable
+import sqlite3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    customer_id INTEGER NOT NULL,
+    status INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_customer_id ON orders (customer_id, id);
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id INTEGER NOT NULL REFERENCES orders (id),
+    position INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    product_version_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    PRIMARY KEY (order_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS product_versions (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL,
+    price_amount INTEGER NOT NULL,
+    price_unit TEXT NOT NULL,
+    price_currency TEXT NOT NULL
+);
+"""
+
+_INSERT_ORDER = "INSERT INTO orders (id, customer_id, status) VALUES (?, ?, ?)"
+_INSERT_ITEM = (
+    "INSERT INTO order_items"
+    " (order_id, position, product_id, product_version_id, quantity)"
+    " VALUES (?, ?, ?, ?, ?)"
+)
+_UPSERT_PRODUCT_VERSION = (
+    "INSERT OR REPLACE INTO product_versions"
+    " (id, product_id, price_amount, price_unit, price_currency)"
+    " VALUES (?, ?, ?, ?, ?)"
+)
+_UPDATE_STATUS = "UPDATE orders SET status = ? WHERE id = ?"
+_UPDATE_STATUS_IF = "UPDATE orders SET status = ? WHERE id = ? AND status = ?"
+_ORDER_EXISTS = "SELECT 1 FROM orders WHERE id = ?"
+
+# Orders are read with their items in a single query.
+# Orders without items yield one row with NULL item columns.
+_SELECT_ORDERS = (
+    "SELECT o.id, o.customer_id, o.status,"
+    " i.product_id, i.product_version_id, i.quantity"
+    " FROM orders o LEFT JOIN order_items i ON i.order_id = o.id"
+)
+_SELECT_ORDER_DATA = (
+    "SELECT o.id, o.customer_id, o.status,"
+    " i.product_id, i.product_version_id, i.quantity,"
+    " v.product_id, v.price_amount, v.price_unit, v.price_currency"
+    " FROM orders o"
+    " LEFT JOIN order_items i ON i.order_id = o.id"
+    " LEFT JOIN product_versions v ON v.id = i.product_version_id"
+)
+_BY_ID = " WHERE o.id = ? ORDER BY i.position"
+_BY_CUSTOMER_ID = " WHERE o.customer_id = ? ORDER BY o.id, i.position"
+# Keyset pagination: the subquery walks the (customer_id, id) index.
+_PAGE_BY_CUSTOMER_ID = (
+    " WHERE o.id IN (SELECT id FROM orders"
+    " WHERE customer_id = ? AND id > ? ORDER BY id LIMIT ?)"
+    " ORDER BY o.id, i.position"
+)
+
+# Stays below SQLITE_MAX_VARIABLE_NUMBER of older SQLite versions.
+_MAX_PARAMETERS = 900
+
+
+class SqliteOrderStore:
+    """
+    Durable order store on SQLite implementing every order persistence SPI.
+
+    The database runs in WAL mode, so readers do not block the writer.
+    Each thread uses its own connection, whose statement cache
+    keeps every statement of this class prepared.
+    Items of many orders are written with a single `executemany`,
+    and orders are read together with their items in a single joined query.
+
+    Identifiers must be `SnowflakeId`s. `Address` has no fields yet,
+    so shipping addresses are not stored.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        order_id_generator: GenerateOrderIdSPI | None = None,
+        synchronous: str = "NORMAL",
+    ) -> None:
+        self._path = path
+        self._synchronous = synchronous
+        self._order_id_generator = order_id_generator or SnowflakeIdGenerator(
+            worker_id=0
+        )
+        self._local = local()
+        self._connection().executescript(_SCHEMA)
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            del self._local.connection
+
+    def _connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(
+            self._local, "connection", None
+        )
+        if connection is None:
+            connection = sqlite3.connect(
+                self._path, isolation_level=None, cached_statements=64
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute(f"PRAGMA synchronous = {self._synchronous}")
+            connection.execute("PRAGMA foreign_keys = OFF")
+            self._local.connection = connection
+        return connection
+
+    # Product versions:
+
+    def save_product_versions(self, product_versions: Iterable[ProductVersion]) -> None:
+        rows = [
+            (
+                id_value(product_version.id),
+                id_value(product_version.product_id),
+                product_version.price.amount,
+                product_version.price.unit,
+                product_version.price.currency,
+            )
+            for product_version in product_versions
+        ]
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(_UPSERT_PRODUCT_VERSION, rows)
+
+    # SaveOrderSPI, SaveOrdersSPI and InsertOrdersSPI:
+
+    def save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        return self.save_orders(versioned_orders=[versioned_order])[0]
+
+    def save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        persisted_orders = [
+            versioned_order.to_persisted_order(
+                id=self._order_id_generator.generate_order_id()
+            )
+            for versioned_order in versioned_orders
+        ]
+        self.insert_orders(persisted_orders=persisted_orders)
+        return persisted_orders
+
+    def insert_orders(self, persisted_orders: list[PersistedOrder]) -> None:
+        if persisted_orders == []:
+            return
+        try:
+            order_rows = [
+                (
+                    id_value(order.id),
+                    id_value(order.customer_id),
+                    order.status.value,
+                )
+                for order in persisted_orders
+            ]
+            item_rows = [
+                (
+                    order_id,
+                    position,
+                    id_value(item.product_id),
+                    id_value(item.product_version_id),
+                    item.quantity,
+                )
+                for order, (order_id, _, _) in zip(persisted_orders, order_rows)
+                for position, item in enumerate(order.items)
+            ]
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(_INSERT_ORDER, order_rows)
+                connection.executemany(_INSERT_ITEM, item_rows)
+        except sqlite3.Error:
+            raise SaveOrderError(order=persisted_orders[0])
+
+    # UpdateOrderSPI, UpdateOrdersSPI and ConditionalUpdateOrderSPI:
+
+    def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
+        self.update_order_statuses(new_statuses={order_id: new_status})
+
+    def update_order_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        if new_statuses == {}:
+            return
+        order_ids = list(new_statuses)
+        connection = self._connection()
+        try:
+            with connection:
+                connection.execute("BEGIN")
+                for order_id, new_status in new_statuses.items():
+                    cursor = connection.execute(
+                        _UPDATE_STATUS, (new_status.value, id_value(order_id))
+                    )
+                    if cursor.rowcount != 1:
+                        raise UpdateOrderError(order_id=order_id)
+        except sqlite3.Error:
+            raise UpdateOrderError(order_id=order_ids[0])
+
+    def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        value = id_value(order_id)
+        connection = self._connection()
+        try:
+            cursor = connection.execute(
+                _UPDATE_STATUS_IF, (new_status.value, value, expected_status.value)
+            )
+            if cursor.rowcount == 1:
+                return True
+            exists = connection.execute(_ORDER_EXISTS, (value,)).fetchone()
+        except sqlite3.Error:
+            raise UpdateOrderError(order_id=order_id)
+        if exists is None:
+            raise UpdateOrderError(order_id=order_id)
+        return False
+
+    # GetOrderByOrderIdSPI, GetOrdersByOrderIdsSPI and GetOrdersByCustomerIdSPI:
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        rows = self._read(_SELECT_ORDERS + _BY_ID, (id_value(order_id),))
+        orders = list(orders_from_rows(rows))
+        return orders[0] if orders != [] else None
+
+    def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        values = list(dict.fromkeys(map(id_value, order_ids)))
+        orders: dict[Identifier, PersistedOrder] = {}
+        for start in range(0, len(values), _MAX_PARAMETERS):
+            chunk = values[start:start + _MAX_PARAMETERS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._read(
+                _SELECT_ORDERS
+                + f" WHERE o.id IN ({placeholders}) ORDER BY o.id, i.position",
+                chunk,
+            )
+            orders.update((order.id, order) for order in orders_from_rows(rows))
+        return orders
+
+    def get_orders_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[PersistedOrder]:
+        rows = self._read(
+            _SELECT_ORDERS + _BY_CUSTOMER_ID, (id_value(customer_id),)
+        )
+        return list(orders_from_rows(rows))
+
+    # GetOrderDataByOrderIdSPI, GetOrderDataByCustomerIdSPI
+    # and GetOrderDataPageByCustomerIdSPI:
+
+    def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
+        rows = self._read(_SELECT_ORDER_DATA + _BY_ID, (id_value(order_id),))
+        order_data = list(order_data_from_rows(rows))
+        return order_data[0] if order_data != [] else None
+
+    def get_order_data_by_customer_id(self, customer_id: Identifier) -> list[OrderData]:
+        rows = self._read(
+            _SELECT_ORDER_DATA + _BY_CUSTOMER_ID, (id_value(customer_id),)
+        )
+        return list(order_data_from_rows(rows))
+
+    def get_order_data_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        limit: int,
+        after_order_id: Identifier | None = None,
+    ) -> list[OrderData]:
+        # Stored ids are non-negative, so -1 starts at the first order.
+        after = -1 if after_order_id is None else id_value(after_order_id)
+        rows = self._read(
+            _SELECT_ORDER_DATA + _PAGE_BY_CUSTOMER_ID,
+            (id_value(customer_id), after, limit),
+        )
+        return list(order_data_from_rows(rows))
+
+    def _read(self, sql: str, parameters: Iterable[Any]) -> list[Row]:
+        try:
+            return self._connection().execute(sql, tuple(parameters)).fetchall()
+        except sqlite3.Error:
+            raise ReadFromPersistenceError
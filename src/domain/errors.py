@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from domain.models.identifier import Identifier
-from domain.models.order import VersionedOrder
+from domain.models.order import VersionedOrder, PersistedOrder
 
 
 class DomainError(Exception):
@@ -28,6 +28,15 @@ class InvalidOrderIdError(DomainError):
     order_id: Identifier
 
 
+@dataclass(frozen=True)
+class InvalidPageCursorError(DomainError):
+    """
+    The page cursor was not issued for the customer with the given id.
+    """
+
+    customer_id: Identifier
+
+
 # Logical errors:
 
 
@@ -47,6 +56,35 @@ class InsufficientExpectednessError(DomainError):
     """
 
 
+@dataclass
+class UpdateConflictError(DomainError):
+    """
+    The status of the order with id `order_id` kept changing concurrently,
+    so the update gave up after its retries.
+    """
+
+    order_id: Identifier
+
+
+@dataclass
+class IdempotencyKeyReusedError(DomainError):
+    """
+    The idempotency key was already used to place a different order.
+    """
+
+    idempotency_key: str
+
+
+@dataclass
+class PlaceOrderInProgressError(DomainError):
+    """
+    An order with the same idempotency key is still being placed
+    and did not finish in time. Retrying later is safe.
+    """
+
+    idempotency_key: str
+
+
 # Dependency errors:
 
 # All dependencies should log/report errors individually.
@@ -59,7 +97,7 @@ class SaveOrderError(DomainError):
     The order could not be saved.
     """
 
-    order: VersionedOrder
+    order: VersionedOrder | PersistedOrder
 
 
 @dataclass(frozen=True)
@@ -14,6 +14,9 @@ class DispatchableEvent:
         TO_BE_SHIPPED = auto()
         SHIPPED = auto()
         CANCELLED = auto()
+        # Published since the OrderData projection, which needs to see
+        # deliveries. Sinks that only know the other types must skip it.
+        DELIVERED = auto()
 
     order: PersistedOrder
     event_type: EventType
@@ -34,6 +37,7 @@ class StatusToEventMapper(metaclass=SingletonMeta):
         Status.PAID: T.TO_BE_SHIPPED,
         Status.SHIPPED: T.SHIPPED,
         Status.CANCELLED: T.CANCELLED,
+        Status.DELIVERED: T.DELIVERED,
     }
 
     @classmethod
@@ -43,3 +47,27 @@ class StatusToEventMapper(metaclass=SingletonMeta):
         if status not in cls.status_to_event_type_map:
             return None
         return cls.status_to_event_type_map[status]
+
+
+def create_event(
+    event_mapper: StatusToEventMapperProtocol, order: PersistedOrder
+) -> DispatchableEvent | None:
+    """
+    Returns the event for the status of `order`,
+    or None if its status has no event.
+    """
+    event_type = event_mapper.map_status_to_event_type(status=order.status)
+    if event_type is None:
+        return None
+    return DispatchableEvent(order=order, event_type=event_type)
+
+
+def create_events(
+    event_mapper: StatusToEventMapperProtocol, orders: list[PersistedOrder]
+) -> list[DispatchableEvent]:
+    events = []
+    for order in orders:
+        event = create_event(event_mapper, order=order)
+        if event is not None:
+            events.append(event)
+    return events
@@ -1,5 +1,117 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+import time
+
+
 class Identifier:
     """
     Abstract identifier class.
     Implementation should make each instance unique to the object it represents.
     """
+
+    __slots__ = ()
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class SnowflakeId(Identifier):
+    """
+    Compact, time-ordered 64-bit identifier.
+    From the most significant bit, `value` consists of:
+    one unused sign bit, a 41 bit timestamp in milliseconds since `EPOCH_MS`,
+    a 10 bit worker id and a 12 bit sequence number.
+    Ids therefore sort in creation order and fit a signed 64-bit integer.
+    """
+
+    EPOCH_MS = 1_672_531_200_000  # 2023-01-01T00:00:00Z
+    TIMESTAMP_BITS = 41
+    WORKER_ID_BITS = 10
+    SEQUENCE_BITS = 12
+
+    value: int
+
+    @property
+    def timestamp_ms(self) -> int:
+        """
+        Unix time in milliseconds at which the id was generated.
+        """
+        return (self.value >> (self.WORKER_ID_BITS + self.SEQUENCE_BITS)) + (
+            self.EPOCH_MS
+        )
+
+    @property
+    def worker_id(self) -> int:
+        return (self.value >> self.SEQUENCE_BITS) & ((1 << self.WORKER_ID_BITS) - 1)
+
+    @property
+    def sequence(self) -> int:
+        return self.value & ((1 << self.SEQUENCE_BITS) - 1)
+
+    def __int__(self) -> int:
+        return self.value
+
+    # Faster than the generated methods, which compare and hash tuples.
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SnowflakeId):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class SnowflakeIdGenerator:
+    """
+    Thread-safe generator of `SnowflakeId`s.
+    Every process generating ids concurrently must use a unique `worker_id`.
+    Ids from one generator are strictly increasing, also if the clock moves
+    backwards or more than 4096 ids are requested within one millisecond;
+    in both cases the timestamp part runs ahead of the clock until it catches up.
+    """
+
+    MAX_WORKER_ID = (1 << SnowflakeId.WORKER_ID_BITS) - 1
+    _MAX_SEQUENCE = (1 << SnowflakeId.SEQUENCE_BITS) - 1
+    _MAX_TIMESTAMP = (1 << SnowflakeId.TIMESTAMP_BITS) - 1
+
+    def __init__(self, worker_id: int, _clock_ms: Callable[[], int] = _now_ms) -> None:
+        if not 0 <= worker_id <= self.MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be in [0, {self.MAX_WORKER_ID}]")
+        self._worker_bits = worker_id << SnowflakeId.SEQUENCE_BITS
+        self._clock_ms = _clock_ms
+        self._lock = Lock()
+        self._last_timestamp = -1
+        self._sequence = 0
+
+    def generate_order_id(self) -> SnowflakeId:
+        return SnowflakeId(value=self._next_value())
+
+    def generate_order_ids(self, count: int) -> list[SnowflakeId]:
+        return [SnowflakeId(value=self._next_value()) for _ in range(0, count)]
+
+    def _next_value(self) -> int:
+        with self._lock:
+            timestamp = self._clock_ms() - SnowflakeId.EPOCH_MS
+            if timestamp > self._last_timestamp:
+                self._last_timestamp = timestamp
+                self._sequence = 0
+            elif self._sequence < self._MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_timestamp += 1
+                self._sequence = 0
+            if not 0 <= self._last_timestamp <= self._MAX_TIMESTAMP:
+                raise OverflowError("timestamp does not fit a SnowflakeId")
+            return (
+                (
+                    self._last_timestamp
+                    << (SnowflakeId.WORKER_ID_BITS + SnowflakeId.SEQUENCE_BITS)
+                )
+                | self._worker_bits
+                | self._sequence
+            )
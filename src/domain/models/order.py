@@ -2,38 +2,38 @@ from __future__ import annotations
 from .identifier import Identifier
 from .order_status import Status
 from .product import ProductVersion
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from functools import partial
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Address:
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Item:
     product_id: Identifier
     quantity: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VersionedItem(Item):
     product_version_id: Identifier
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ItemWithProductVersion(Item):
     product_version: ProductVersion
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Order:
     customer_id: Identifier
     shipping_address: Address
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RequestedOrder(Order):
     items: list[Item]
 
@@ -58,7 +58,7 @@ class RequestedOrder(Order):
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VersionedOrder(Order):
     items: list[VersionedItem]
 
@@ -80,7 +80,7 @@ class VersionedOrder(Order):
         return create_persisted_order(status=status)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PersistedOrder(Order):
     id: Identifier
     items: list[VersionedItem]
@@ -90,8 +90,107 @@ class PersistedOrder(Order):
         return replace(self, status=new_status)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OrderData(Order):
     id: Identifier
     items: list[ItemWithProductVersion]
     status: Status
+
+
+# Compact variants.
+# Items are stored in tuples, which makes the orders hashable.
+# The hash is computed once and cached on the instance.
+# `update_status` shares the items tuple between the old and the new order.
+
+
+@dataclass(frozen=True, slots=True)
+class CompactPersistedOrder(Order):
+    id: Identifier
+    items: tuple[VersionedItem, ...]
+    status: Status = Status.PENDING
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_hash",
+            hash(
+                (
+                    self.id,
+                    self.customer_id,
+                    self.shipping_address,
+                    self.items,
+                    self.status,
+                )
+            ),
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def update_status(self, new_status: Status) -> CompactPersistedOrder:
+        return replace(self, status=new_status)
+
+    @classmethod
+    def from_persisted_order(cls, order: PersistedOrder) -> CompactPersistedOrder:
+        return cls(
+            customer_id=order.customer_id,
+            shipping_address=order.shipping_address,
+            id=order.id,
+            items=tuple(order.items),
+            status=order.status,
+        )
+
+    def to_persisted_order(self) -> PersistedOrder:
+        return PersistedOrder(
+            customer_id=self.customer_id,
+            shipping_address=self.shipping_address,
+            id=self.id,
+            items=list(self.items),
+            status=self.status,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompactOrderData(Order):
+    id: Identifier
+    items: tuple[ItemWithProductVersion, ...]
+    status: Status
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_hash",
+            hash(
+                (
+                    self.id,
+                    self.customer_id,
+                    self.shipping_address,
+                    self.items,
+                    self.status,
+                )
+            ),
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @classmethod
+    def from_order_data(cls, order_data: OrderData) -> CompactOrderData:
+        return cls(
+            customer_id=order_data.customer_id,
+            shipping_address=order_data.shipping_address,
+            id=order_data.id,
+            items=tuple(order_data.items),
+            status=order_data.status,
+        )
+
+    def to_order_data(self) -> OrderData:
+        return OrderData(
+            customer_id=self.customer_id,
+            shipping_address=self.shipping_address,
+            id=self.id,
+            items=list(self.items),
+            status=self.status,
+        )
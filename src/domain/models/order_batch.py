@@ -0,0 +1,178 @@
+from __future__ import annotations
+from .identifier import Identifier, SnowflakeId
+from .order import Address, PersistedOrder, VersionedItem
+from .order_status import Status
+from .transition_validation_engine import TransitionValidationEngine, StatusCodes
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+import numpy as np
+import numpy.typing as npt
+
+IdColumn = npt.NDArray[np.int64]
+OrderMask = npt.NDArray[np.bool_]
+
+
+def _id_value(id: Identifier) -> int:
+    if not isinstance(id, SnowflakeId):
+        raise TypeError(f"OrderBatch requires SnowflakeId, got {type(id).__name__}")
+    return id.value
+
+
+def _id_column(ids: Iterable[Identifier], count: int) -> IdColumn:
+    return np.fromiter((_id_value(id) for id in ids), dtype=np.int64, count=count)
+
+
+@dataclass(frozen=True, eq=False)
+class OrderBatch:
+    """
+    Struct-of-arrays representation of many `PersistedOrder`s.
+    Row `i` of each order column belongs to the same order.
+    The items of order `i` are rows `item_offsets[i]:item_offsets[i + 1]`
+    of each item column.
+    Identifiers are stored as the values of `SnowflakeId`s and
+    statuses as the status codes of `TransitionValidationEngine`.
+    """
+
+    order_ids: IdColumn
+    customer_ids: IdColumn
+    status_codes: StatusCodes
+    shipping_addresses: tuple[Address, ...]
+    item_offsets: npt.NDArray[np.int64]
+    item_product_ids: IdColumn
+    item_product_version_ids: IdColumn
+    item_quantities: npt.NDArray[np.int64]
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    @property
+    def item_counts(self) -> npt.NDArray[np.int64]:
+        return np.diff(self.item_offsets)
+
+    @classmethod
+    def from_orders(cls, orders: Sequence[PersistedOrder]) -> OrderBatch:
+        order_count = len(orders)
+        items = [item for order in orders for item in order.items]
+        item_count = len(items)
+        item_offsets = np.zeros(order_count + 1, dtype=np.int64)
+        np.cumsum(
+            np.fromiter(
+                (len(order.items) for order in orders),
+                dtype=np.int64,
+                count=order_count,
+            ),
+            out=item_offsets[1:],
+        )
+        return cls(
+            order_ids=_id_column((order.id for order in orders), count=order_count),
+            customer_ids=_id_column(
+                (order.customer_id for order in orders), count=order_count
+            ),
+            status_codes=TransitionValidationEngine.encode_statuses(
+                order.status for order in orders
+            ),
+            shipping_addresses=tuple(order.shipping_address for order in orders),
+            item_offsets=item_offsets,
+            item_product_ids=_id_column(
+                (item.product_id for item in items), count=item_count
+            ),
+            item_product_version_ids=_id_column(
+                (item.product_version_id for item in items), count=item_count
+            ),
+            item_quantities=np.fromiter(
+                (item.quantity for item in items), dtype=np.int64, count=item_count
+            ),
+        )
+
+    def to_orders(self) -> list[PersistedOrder]:
+        statuses = TransitionValidationEngine.decode_statuses(self.status_codes)
+        offsets = self.item_offsets.tolist()
+        items = [
+            VersionedItem(
+                product_id=SnowflakeId(value=product_id),
+                quantity=quantity,
+                product_version_id=SnowflakeId(value=product_version_id),
+            )
+            for product_id, quantity, product_version_id in zip(
+                self.item_product_ids.tolist(),
+                self.item_quantities.tolist(),
+                self.item_product_version_ids.tolist(),
+            )
+        ]
+        return [
+            PersistedOrder(
+                customer_id=SnowflakeId(value=customer_id),
+                shipping_address=shipping_address,
+                id=SnowflakeId(value=order_id),
+                items=items[start:end],
+                status=status,
+            )
+            for order_id, customer_id, status, shipping_address, start, end in zip(
+                self.order_ids.tolist(),
+                self.customer_ids.tolist(),
+                statuses,
+                self.shipping_addresses,
+                offsets,
+                offsets[1:],
+            )
+        ]
+
+    # Vectorized filters:
+
+    def status_mask(self, statuses: Iterable[Status]) -> OrderMask:
+        return np.isin(
+            self.status_codes, TransitionValidationEngine.encode_statuses(statuses)
+        )
+
+    def customer_mask(self, customer_ids: Iterable[Identifier]) -> OrderMask:
+        return np.isin(
+            self.customer_ids, np.fromiter(map(_id_value, customer_ids), np.int64)
+        )
+
+    def order_mask(self, order_ids: Iterable[Identifier]) -> OrderMask:
+        return np.isin(
+            self.order_ids, np.fromiter(map(_id_value, order_ids), np.int64)
+        )
+
+    def where(
+        self,
+        statuses: Iterable[Status] | None = None,
+        customer_ids: Iterable[Identifier] | None = None,
+    ) -> OrderBatch:
+        """
+        Returns the orders matching every given condition,
+        e.g. all `PAID` orders of some customers.
+        """
+        mask = np.ones(len(self), dtype=np.bool_)
+        if statuses is not None:
+            mask &= self.status_mask(statuses=statuses)
+        if customer_ids is not None:
+            mask &= self.customer_mask(customer_ids=customer_ids)
+        return self.select(mask=mask)
+
+    def select(self, mask: OrderMask) -> OrderBatch:
+        return self.take(indices=np.flatnonzero(mask))
+
+    def take(self, indices: npt.NDArray[np.intp]) -> OrderBatch:
+        """
+        Returns the orders at `indices`, in the given order.
+        """
+        counts = self.item_counts[indices]
+        item_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(counts, out=item_offsets[1:])
+        # For every selected item: its start in self plus its index within its order.
+        item_indices = np.repeat(self.item_offsets[:-1][indices], counts) + (
+            np.arange(item_offsets[-1]) - np.repeat(item_offsets[:-1], counts)
+        )
+        return OrderBatch(
+            order_ids=self.order_ids[indices],
+            customer_ids=self.customer_ids[indices],
+            status_codes=self.status_codes[indices],
+            shipping_addresses=tuple(
+                self.shipping_addresses[index] for index in indices.tolist()
+            ),
+            item_offsets=item_offsets,
+            item_product_ids=self.item_product_ids[item_indices],
+            item_product_version_ids=self.item_product_version_ids[item_indices],
+            item_quantities=self.item_quantities[item_indices],
+        )
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from .identifier import Identifier
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class PageCursor:
+    """
+    Position after the last order of a page.
+    Opaque to callers, which pass it back unchanged to fetch the next page.
+    """
+
+    customer_id: Identifier
+    last_order_id: Identifier
+
+
+@dataclass(frozen=True, slots=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: PageCursor | None  # None on the last page.
@@ -2,9 +2,9 @@ from dataclasses import dataclass
 from .identifier import Identifier
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProductVersion:
-    @dataclass(frozen=True)
+    @dataclass(frozen=True, slots=True)
     class Price:
         amount: int
         unit: str
@@ -15,7 +15,7 @@ class ProductVersion:
     price: Price
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Product:
     id: Identifier
     current_version_id: Identifier | None = None
@@ -0,0 +1,160 @@
+from domain.models.order_status import (
+    Status,
+    Expectedness,
+    StatusTransition,
+    TransitionToExpectednessMapper,
+)
+from domain.models.status_transition_validator import (
+    ExpectednessSetting,
+    TransitionValidator,
+)
+from domain.utils.singleton_meta import SingletonMeta
+from typing import Iterable
+import numpy as np
+import numpy.typing as npt
+
+StatusCodes = npt.NDArray[np.int8]
+SettingCodes = npt.NDArray[np.int8]
+ExpectednessCodes = npt.NDArray[np.int8]
+ValidityMask = npt.NDArray[np.bool_]
+
+
+def _compile_expectedness_table() -> ExpectednessCodes:
+    """
+    Copies `TransitionToExpectednessMapper._transition_to_expectedness_matrix`
+    into an array indexed by `[from_code, to_code]`.
+    """
+    return np.array(
+        TransitionToExpectednessMapper._transition_to_expectedness_matrix,
+        dtype=np.int8,
+    )
+
+
+def _compile_validity_table() -> ValidityMask:
+    """
+    Evaluates `TransitionValidator` once for every
+    `(setting, from_status, to_status)` and stores the outcome
+    in an array indexed by `[setting_code, from_code, to_code]`.
+    """
+    status_to_code = TransitionToExpectednessMapper._status_to_index_map
+    table = np.zeros(
+        (len(ExpectednessSetting), len(Status), len(Status)), dtype=np.bool_
+    )
+    for setting_code, setting in enumerate(ExpectednessSetting):
+        for from_status, from_code in status_to_code.items():
+            for to_status, to_code in status_to_code.items():
+                transition = StatusTransition(
+                    from_status=from_status, to_status=to_status
+                )
+                table[setting_code, from_code, to_code] = (
+                    TransitionValidator.validate_transition(
+                        transition=transition, setting=setting
+                    )
+                )
+    return table
+
+
+def _check_codes(
+    name: str, codes: npt.ArrayLike, count: int
+) -> npt.NDArray[np.integer]:
+    """
+    Returns `codes` as an array, after checking that every code
+    is in `range(0, count)`. Negative codes would otherwise index
+    from the end of the tables.
+    """
+    array = np.asarray(codes)
+    if array.size == 0:
+        return array.astype(np.int8)
+    if not np.issubdtype(array.dtype, np.integer):
+        raise ValueError(f"{name} must be integer codes")
+    bad = np.flatnonzero((array < 0) | (array >= count))
+    if bad.size > 0:
+        entries = ", ".join(
+            f"[{index}]={int(array.flat[index])}" for index in bad[0:10]
+        )
+        raise ValueError(
+            f"{name} has {bad.size} codes outside range(0, {count}): {entries}"
+        )
+    return array
+
+
+class TransitionValidationEngine(metaclass=SingletonMeta):
+    """
+    Singleton that validates many status transitions at once.
+    Statuses, settings and expectedness are represented by integer codes
+    so that whole arrays of transitions can be validated
+    with a single lookup into precomputed tables.
+
+    Status codes are the indices of `TransitionToExpectednessMapper`.
+    Expectedness codes are the keys of `TransitionToExpectednessMapper`.
+    Setting codes follow the definition order of `ExpectednessSetting`.
+    """
+
+    _status_to_code_map = TransitionToExpectednessMapper._status_to_index_map
+    _code_to_status_map = {code: status for status, code in _status_to_code_map.items()}
+    _setting_to_code_map = {
+        setting: code for code, setting in enumerate(ExpectednessSetting)
+    }
+    _code_to_expectedness_map = TransitionToExpectednessMapper._key_to_expectedness_map
+
+    _expectedness_table = _compile_expectedness_table()
+    _validity_table = _compile_validity_table()
+
+    @classmethod
+    def encode_statuses(cls, statuses: Iterable[Status]) -> StatusCodes:
+        return np.fromiter(
+            (cls._status_to_code_map[status] for status in statuses), dtype=np.int8
+        )
+
+    @classmethod
+    def decode_statuses(cls, codes: npt.ArrayLike) -> list[Status]:
+        return [cls._code_to_status_map[int(code)] for code in np.ravel(codes)]
+
+    @classmethod
+    def encode_settings(cls, settings: Iterable[ExpectednessSetting]) -> SettingCodes:
+        return np.fromiter(
+            (cls._setting_to_code_map[setting] for setting in settings), dtype=np.int8
+        )
+
+    @classmethod
+    def decode_expectedness(cls, codes: npt.ArrayLike) -> list[Expectedness]:
+        return [cls._code_to_expectedness_map[int(code)] for code in np.ravel(codes)]
+
+    @classmethod
+    def get_expectedness_codes(
+        cls, from_codes: npt.ArrayLike, to_codes: npt.ArrayLike
+    ) -> ExpectednessCodes:
+        """
+        Raises:
+            ValueError: if a status code is out of range.
+        """
+        from_codes = _check_codes("from_codes", from_codes, len(Status))
+        to_codes = _check_codes("to_codes", to_codes, len(Status))
+        result: ExpectednessCodes = cls._expectedness_table[from_codes, to_codes]
+        return result
+
+    @classmethod
+    def validate_transitions(
+        cls,
+        from_codes: npt.ArrayLike,
+        to_codes: npt.ArrayLike,
+        setting: ExpectednessSetting | SettingCodes,
+    ) -> ValidityMask:
+        """
+        Returns a mask that is `True` where the transition
+        `from_codes[i] -> to_codes[i]` is valid under `setting`.
+        `setting` is either a single `ExpectednessSetting`
+        or an array of setting codes with one code per transition.
+
+        Raises:
+            ValueError: if a status or setting code is out of range.
+        """
+        from_codes = _check_codes("from_codes", from_codes, len(Status))
+        to_codes = _check_codes("to_codes", to_codes, len(Status))
+        setting_codes = (
+            cls._setting_to_code_map[setting]
+            if isinstance(setting, ExpectednessSetting)
+            else _check_codes("setting", setting, len(ExpectednessSetting))
+        )
+        result: ValidityMask = cls._validity_table[setting_codes, from_codes, to_codes]
+        return result
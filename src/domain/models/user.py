@@ -2,11 +2,11 @@ from dataclasses import dataclass
 from .identifier import Identifier
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class User:
     id: Identifier
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Customer(User):
     id: Identifier
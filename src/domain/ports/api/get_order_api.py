@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from domain.models.identifier import Identifier
 from domain.models.order import OrderData
+from domain.models.page import Page, PageCursor
+from typing import AsyncIterator, Iterator
 
 
 class GetOrderDataByOrderIdAPI(ABC):
@@ -22,3 +24,84 @@ class GetOrderDataByCustomerIdAPI(ABC):
             ReadFromPersistenceError
         """
         ...
+
+
+class GetOrderDataPageByCustomerIdAPI(ABC):
+    @abstractmethod
+    def get_order_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        page_size: int,
+        cursor: PageCursor | None = None,
+    ) -> Page[OrderData]:
+        """
+        Returns up to `page_size` orders following `cursor`,
+        or the first page if no cursor is given.
+
+        Raises:
+            InvalidPageCursorError
+            ReadFromPersistenceError
+        """
+        ...
+
+    @abstractmethod
+    def iter_order_data_by_customer_id(
+        self, customer_id: Identifier, chunk_size: int
+    ) -> Iterator[list[OrderData]]:
+        """
+        Yields all orders of the customer in chunks of `chunk_size`,
+        reading one chunk at a time from persistence.
+
+        Raises:
+            ReadFromPersistenceError
+        """
+        ...
+
+
+class AsyncGetOrderDataByOrderIdAPI(ABC):
+    @abstractmethod
+    async def get_order_by_order_id(self, order_id: Identifier) -> OrderData:
+        """
+        Raises:
+            InvalidOrderIdError
+            ReadFromPersistenceError
+        """
+        ...
+
+
+class AsyncGetOrderDataByCustomerIdAPI(ABC):
+    @abstractmethod
+    async def get_order_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[OrderData]:
+        """
+        Raises:
+            ReadFromPersistenceError
+        """
+        ...
+
+
+class AsyncGetOrderDataPageByCustomerIdAPI(ABC):
+    @abstractmethod
+    async def get_order_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        page_size: int,
+        cursor: PageCursor | None = None,
+    ) -> Page[OrderData]:
+        """
+        Raises:
+            InvalidPageCursorError
+            ReadFromPersistenceError
+        """
+        ...
+
+    @abstractmethod
+    def iter_order_data_by_customer_id(
+        self, customer_id: Identifier, chunk_size: int
+    ) -> AsyncIterator[list[OrderData]]:
+        """
+        Raises:
+            ReadFromPersistenceError
+        """
+        ...
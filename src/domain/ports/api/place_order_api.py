@@ -1,12 +1,64 @@
 from abc import ABC, abstractmethod
 from domain.models.order import RequestedOrder, PersistedOrder
+from domain.errors import DomainError
 
 
 class PlaceOrderAPI(ABC):
     @abstractmethod
-    def place_order(self, requested_order: RequestedOrder) -> PersistedOrder:
+    def place_order(
+        self, requested_order: RequestedOrder, idempotency_key: str | None = None
+    ) -> PersistedOrder:
         """
+        A repeated `idempotency_key` returns the order placed with it
+        instead of placing another one. Concurrent requests with the same key
+        wait for the first one to finish.
+
+        Raises:
+           InvalidProductIdError
+           NoCurrentProductVersionError
+           IdempotencyKeyReusedError
+           PlaceOrderInProgressError
+        """
+
+    @abstractmethod
+    def place_orders(
+        self, requested_orders: list[RequestedOrder]
+    ) -> list[PersistedOrder | DomainError]:
+        """
+        Places each order in `requested_orders`.
+        Returns one result per requested order, in the same order.
+        Each result is either the `PersistedOrder` or the error that prevented
+        that specific order from being placed:
+           InvalidProductIdError
+           NoCurrentProductVersionError
+
+        Raises:
+           SaveOrderError
+        """
+
+
+class AsyncPlaceOrderAPI(ABC):
+    @abstractmethod
+    async def place_order(
+        self, requested_order: RequestedOrder, idempotency_key: str | None = None
+    ) -> PersistedOrder:
+        """
+        See `PlaceOrderAPI.place_order`.
+
         Raises:
            InvalidProductIdError
            NoCurrentProductVersionError
+           IdempotencyKeyReusedError
+           PlaceOrderInProgressError
+        """
+
+    @abstractmethod
+    async def place_orders(
+        self, requested_orders: list[RequestedOrder]
+    ) -> list[PersistedOrder | DomainError]:
+        """
+        See `PlaceOrderAPI.place_orders`.
+
+        Raises:
+           SaveOrderError
         """
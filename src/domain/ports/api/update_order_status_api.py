@@ -3,6 +3,7 @@ from domain.models.identifier import Identifier
 from domain.models.order import PersistedOrder
 from domain.models.order_status import Status
 from domain.models.status_transition_validator import ExpectednessSetting
+from domain.errors import DomainError
 
 
 class UpdateOrderStatusAPI(ABC):
@@ -18,3 +19,49 @@ class UpdateOrderStatusAPI(ABC):
            InvalidOrderIdError
            InsufficientExpectednessError
         """
+
+    @abstractmethod
+    def update_order_statuses(
+        self, updates: list[tuple[Identifier, Status, ExpectednessSetting]]
+    ) -> list[PersistedOrder | DomainError]:
+        """
+        Applies each update `(order_id, new_status, setting)` in `updates`.
+        Updates are applied in the given order,
+        so several updates may target the same order.
+        Returns one result per update, in the same order.
+        Each result is either the updated `PersistedOrder` or the error
+        that prevented that specific update:
+           InvalidOrderIdError
+           InsufficientExpectednessError
+
+        Raises:
+           ReadFromPersistenceError
+           UpdateOrderError
+        """
+
+
+class AsyncUpdateOrderStatusAPI(ABC):
+    @abstractmethod
+    async def update_order_status(
+        self,
+        order_id: Identifier,
+        new_status: Status,
+        setting: ExpectednessSetting = ExpectednessSetting.REQUIRE_NEXT_UP,
+    ) -> PersistedOrder:
+        """
+        Raises:
+           InvalidOrderIdError
+           InsufficientExpectednessError
+        """
+
+    @abstractmethod
+    async def update_order_statuses(
+        self, updates: list[tuple[Identifier, Status, ExpectednessSetting]]
+    ) -> list[PersistedOrder | DomainError]:
+        """
+        See `UpdateOrderStatusAPI.update_order_statuses`.
+
+        Raises:
+           ReadFromPersistenceError
+           UpdateOrderError
+        """
@@ -0,0 +1,42 @@
+from typing import Protocol
+from domain.models.order import PersistedOrder
+
+
+class PlaceOrderIdempotencySPI(Protocol):
+    def claim(self, idempotency_key: str) -> PersistedOrder | None:
+        """
+        Returns the order placed with `idempotency_key`, if there is one.
+        Otherwise claims the key and returns None. The caller must then
+        `complete` or `release` the key.
+        While another caller holds the claim, waits for it to be completed
+        or released.
+
+        Raises:
+            PlaceOrderInProgressError: if the key stays claimed for too long.
+        """
+        ...
+
+    def complete(self, idempotency_key: str, persisted_order: PersistedOrder) -> None:
+        """
+        Records `persisted_order` as the result of the claimed key.
+        """
+        ...
+
+    def release(self, idempotency_key: str) -> None:
+        """
+        Gives up a claim without a result, so the key can be claimed again.
+        """
+        ...
+
+
+class AsyncPlaceOrderIdempotencySPI(Protocol):
+    async def claim(self, idempotency_key: str) -> PersistedOrder | None:
+        ...
+
+    async def complete(
+        self, idempotency_key: str, persisted_order: PersistedOrder
+    ) -> None:
+        ...
+
+    async def release(self, idempotency_key: str) -> None:
+        ...
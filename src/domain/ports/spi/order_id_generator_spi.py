@@ -0,0 +1,7 @@
+from typing import Protocol
+from domain.models.identifier import Identifier
+
+
+class GenerateOrderIdSPI(Protocol):
+    def generate_order_id(self) -> Identifier:
+        ...
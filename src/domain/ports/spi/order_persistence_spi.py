@@ -13,6 +13,20 @@ class GetOrderByOrderIdSPI(Protocol):
         ...
 
 
+class GetOrdersByOrderIdsSPI(Protocol):
+    def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        """
+        Reads all orders in a single read.
+        Ids without a matching order are left out of the result.
+
+        Raises:
+            ReadFromPersistenceError
+        """
+        ...
+
+
 class GetOrderDataByOrderIdSPI(Protocol):
     def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
         """
@@ -42,6 +56,24 @@ class GetOrderDataByCustomerIdSPI(Protocol):
         ...
 
 
+class GetOrderDataPageByCustomerIdSPI(Protocol):
+    def get_order_data_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        limit: int,
+        after_order_id: Identifier | None = None,
+    ) -> list[OrderData]:
+        """
+        Returns up to `limit` orders of the customer,
+        in the order `get_order_data_by_customer_id` returns them,
+        starting after the order with id `after_order_id`.
+
+        Raises:
+            ReadFromPersistenceError
+        """
+        ...
+
+
 class SaveOrderSPI(Protocol):
     def save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
         """
@@ -51,6 +83,32 @@ class SaveOrderSPI(Protocol):
         ...
 
 
+class SaveOrdersSPI(Protocol):
+    def save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        """
+        Saves all orders in a single write.
+        Returns the persisted orders in the same order as `versioned_orders`.
+
+        Raises:
+            SaveOrderError
+        """
+        ...
+
+
+class InsertOrdersSPI(Protocol):
+    def insert_orders(self, persisted_orders: list[PersistedOrder]) -> None:
+        """
+        Writes orders whose ids have already been assigned by the caller,
+        in a single write and without returning anything.
+
+        Raises:
+            SaveOrderError
+        """
+        ...
+
+
 class UpdateOrderSPI(Protocol):
     def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
         """
@@ -58,3 +116,116 @@ class UpdateOrderSPI(Protocol):
             UpdateOrderError
         """
         ...
+
+
+class UpdateOrdersSPI(Protocol):
+    def update_order_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        """
+        Writes the new status of every order in `new_statuses` in a single write.
+
+        Raises:
+            UpdateOrderError
+        """
+        ...
+
+
+class ConditionalUpdateOrderSPI(Protocol):
+    def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        """
+        Atomically sets the status to `new_status`
+        if the current status is `expected_status`.
+        Returns whether the status was set.
+
+        Raises:
+            UpdateOrderError: if no order has the given id.
+        """
+        ...
+
+
+# Async twins of the protocols above.
+# Semantics, including raised errors, are identical.
+
+
+class AsyncGetOrderByOrderIdSPI(Protocol):
+    async def get_order_by_order_id(
+        self, order_id: Identifier
+    ) -> PersistedOrder | None:
+        ...
+
+
+class AsyncGetOrdersByOrderIdsSPI(Protocol):
+    async def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        ...
+
+
+class AsyncGetOrderDataByOrderIdSPI(Protocol):
+    async def get_order_data_by_order_id(
+        self, order_id: Identifier
+    ) -> OrderData | None:
+        ...
+
+
+class AsyncGetOrdersByCustomerIdSPI(Protocol):
+    async def get_orders_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[PersistedOrder]:
+        ...
+
+
+class AsyncGetOrderDataByCustomerIdSPI(Protocol):
+    async def get_order_data_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[OrderData]:
+        ...
+
+
+class AsyncGetOrderDataPageByCustomerIdSPI(Protocol):
+    async def get_order_data_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        limit: int,
+        after_order_id: Identifier | None = None,
+    ) -> list[OrderData]:
+        ...
+
+
+class AsyncSaveOrderSPI(Protocol):
+    async def save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        ...
+
+
+class AsyncSaveOrdersSPI(Protocol):
+    async def save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        ...
+
+
+class AsyncInsertOrdersSPI(Protocol):
+    async def insert_orders(self, persisted_orders: list[PersistedOrder]) -> None:
+        ...
+
+
+class AsyncUpdateOrderSPI(Protocol):
+    async def update_order_status(
+        self, order_id: Identifier, new_status: Status
+    ) -> None:
+        ...
+
+
+class AsyncUpdateOrdersSPI(Protocol):
+    async def update_order_statuses(
+        self, new_statuses: dict[Identifier, Status]
+    ) -> None:
+        ...
+
+
+class AsyncConditionalUpdateOrderSPI(Protocol):
+    async def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        ...
@@ -50,3 +50,50 @@ class GetProductVersionsSPI(Protocol):
 
     def get_product_versions(self, product_ids: list[Identifier]) -> Result:
         ...
+
+
+class GetProductVersionsByIdSPI(Protocol):
+    def get_product_versions_by_id(
+        self, product_version_ids: list[Identifier]
+    ) -> dict[Identifier, ProductVersion]:
+        """
+        Resolves all product versions in a single call, current or not.
+        Ids without a matching product version are left out of the result.
+
+        Raises:
+            ReadFromPersistenceError
+        """
+        ...
+
+
+class AsyncValidateProductIdSPI(Protocol):
+    async def validate_product_ids(
+        self, product_ids: list[Identifier]
+    ) -> ValidateProductIdSPI.Result:
+        ...
+
+
+class AsyncGetProductSPI(Protocol):
+    async def get_product(self, product_ids: list[Identifier]) -> GetProductSPI.Result:
+        ...
+
+
+class AsyncGetProductVersionIdsSPI(Protocol):
+    async def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionIdsSPI.Result:
+        ...
+
+
+class AsyncGetProductVersionsSPI(Protocol):
+    async def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionsSPI.Result:
+        ...
+
+
+class AsyncGetProductVersionsByIdSPI(Protocol):
+    async def get_product_versions_by_id(
+        self, product_version_ids: list[Identifier]
+    ) -> dict[Identifier, ProductVersion]:
+        ...
@@ -5,3 +5,18 @@ from domain.models.event import DispatchableEvent
 class StatusUpdateEventDispatcherSPI(Protocol):
     def dispatch_event(self, event: DispatchableEvent) -> None:
         ...
+
+
+class StatusUpdateEventBatchDispatcherSPI(Protocol):
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        ...
+
+
+class AsyncStatusUpdateEventDispatcherSPI(Protocol):
+    async def dispatch_event(self, event: DispatchableEvent) -> None:
+        ...
+
+
+class AsyncStatusUpdateEventBatchDispatcherSPI(Protocol):
+    async def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        ...
@@ -0,0 +1,149 @@
+from domain.models.identifier import Identifier
+from domain.models.order import (
+    ItemWithProductVersion,
+    OrderData,
+    PersistedOrder,
+    VersionedItem,
+)
+from domain.models.product import ProductVersion
+from domain.ports.spi.order_persistence_spi import (
+    GetOrderByOrderIdSPI,
+    GetOrdersByCustomerIdSPI,
+    AsyncGetOrderByOrderIdSPI,
+    AsyncGetOrdersByCustomerIdSPI,
+)
+from domain.ports.spi.product_catalogue_spi import (
+    GetProductVersionsByIdSPI,
+    AsyncGetProductVersionsByIdSPI,
+)
+from domain.errors import ReadFromPersistenceError
+
+
+class OrderDataAssemblyService:
+    """
+    Builds `OrderData` from persisted orders and the product catalogue.
+
+    Implements `GetOrderDataByOrderIdSPI` and `GetOrderDataByCustomerIdSPI`,
+    so it can back the order data services when persistence only stores
+    `PersistedOrder`s.
+    The distinct product version ids of all orders are resolved in one call.
+    Each product version, and each equal item, is a single instance
+    shared by all assembled orders.
+    """
+
+    def __init__(
+        self,
+        get_order_by_order_id_spi: GetOrderByOrderIdSPI,
+        get_orders_by_customer_id_spi: GetOrdersByCustomerIdSPI,
+        get_product_versions_by_id_spi: GetProductVersionsByIdSPI,
+    ) -> None:
+        self._get_order = get_order_by_order_id_spi.get_order_by_order_id
+        self._get_orders = get_orders_by_customer_id_spi.get_orders_by_customer_id
+        self._get_product_versions = (
+            get_product_versions_by_id_spi.get_product_versions_by_id
+        )
+
+    def get_order_data_by_order_id(self, order_id: Identifier) -> OrderData | None:
+        order = self._get_order(order_id=order_id)
+        if order is None:
+            return None
+        return self.assemble_order_data(orders=[order])[0]
+
+    def get_order_data_by_customer_id(self, customer_id: Identifier) -> list[OrderData]:
+        orders = self._get_orders(customer_id=customer_id)
+        return self.assemble_order_data(orders=orders)
+
+    def assemble_order_data(self, orders: list[PersistedOrder]) -> list[OrderData]:
+        """
+        Raises:
+            ReadFromPersistenceError: if a product version cannot be resolved.
+        """
+        product_version_ids = _product_version_ids(orders=orders)
+        if product_version_ids == []:
+            return _assemble(orders=orders, product_versions={})
+        product_versions = self._get_product_versions(
+            product_version_ids=product_version_ids
+        )
+        return _assemble(orders=orders, product_versions=product_versions)
+
+
+class AsyncOrderDataAssemblyService:
+    def __init__(
+        self,
+        get_order_by_order_id_spi: AsyncGetOrderByOrderIdSPI,
+        get_orders_by_customer_id_spi: AsyncGetOrdersByCustomerIdSPI,
+        get_product_versions_by_id_spi: AsyncGetProductVersionsByIdSPI,
+    ) -> None:
+        self._get_order = get_order_by_order_id_spi.get_order_by_order_id
+        self._get_orders = get_orders_by_customer_id_spi.get_orders_by_customer_id
+        self._get_product_versions = (
+            get_product_versions_by_id_spi.get_product_versions_by_id
+        )
+
+    async def get_order_data_by_order_id(
+        self, order_id: Identifier
+    ) -> OrderData | None:
+        order = await self._get_order(order_id=order_id)
+        if order is None:
+            return None
+        return (await self.assemble_order_data(orders=[order]))[0]
+
+    async def get_order_data_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[OrderData]:
+        orders = await self._get_orders(customer_id=customer_id)
+        return await self.assemble_order_data(orders=orders)
+
+    async def assemble_order_data(
+        self, orders: list[PersistedOrder]
+    ) -> list[OrderData]:
+        product_version_ids = _product_version_ids(orders=orders)
+        if product_version_ids == []:
+            return _assemble(orders=orders, product_versions={})
+        product_versions = await self._get_product_versions(
+            product_version_ids=product_version_ids
+        )
+        return _assemble(orders=orders, product_versions=product_versions)
+
+
+# Shared between the sync and async services:
+
+
+def _product_version_ids(orders: list[PersistedOrder]) -> list[Identifier]:
+    return list(
+        dict.fromkeys(
+            item.product_version_id for order in orders for item in order.items
+        )
+    )
+
+
+def _assemble(
+    orders: list[PersistedOrder], product_versions: dict[Identifier, ProductVersion]
+) -> list[OrderData]:
+    # Every item refers to the one instance resolved for its product version id,
+    # and equal items are built once.
+    items: dict[VersionedItem, ItemWithProductVersion] = {}
+
+    def item_with_product_version(item: VersionedItem) -> ItemWithProductVersion:
+        result = items.get(item)
+        if result is None:
+            product_version = product_versions.get(item.product_version_id)
+            if product_version is None:
+                raise ReadFromPersistenceError
+            result = items[item] = ItemWithProductVersion(
+                product_id=item.product_id,
+                quantity=item.quantity,
+                product_version=product_version,
+            )
+        return result
+
+    return [
+        OrderData(
+            customer_id=order.customer_id,
+            shipping_address=order.shipping_address,
+            id=order.id,
+            items=[item_with_product_version(item) for item in order.items],
+            status=order.status,
+        )
+        for order in orders
+    ]
@@ -1,14 +1,24 @@
 from domain.models.identifier import Identifier
 from domain.models.order import OrderData
+from domain.models.page import Page, PageCursor
 from domain.ports.api.get_order_api import (
     GetOrderDataByOrderIdAPI,
     GetOrderDataByCustomerIdAPI,
+    GetOrderDataPageByCustomerIdAPI,
+    AsyncGetOrderDataByOrderIdAPI,
+    AsyncGetOrderDataByCustomerIdAPI,
+    AsyncGetOrderDataPageByCustomerIdAPI,
 )
 from domain.ports.spi.order_persistence_spi import (
     GetOrderDataByOrderIdSPI,
     GetOrderDataByCustomerIdSPI,
+    GetOrderDataPageByCustomerIdSPI,
+    AsyncGetOrderDataByOrderIdSPI,
+    AsyncGetOrderDataByCustomerIdSPI,
+    AsyncGetOrderDataPageByCustomerIdSPI,
 )
-from domain.errors import InvalidOrderIdError
+from domain.errors import InvalidOrderIdError, InvalidPageCursorError
+from typing import AsyncIterator, Iterator
 
 
 class OrderDataByOrderIdService(GetOrderDataByOrderIdAPI):
@@ -31,3 +41,147 @@ class OrderDataByCustomerIdService(GetOrderDataByCustomerIdAPI):
             customer_id=customer_id
         )
         return result
+
+
+class OrderDataPageByCustomerIdService(GetOrderDataPageByCustomerIdAPI):
+    """
+    Pages through the orders of a customer with a keyset cursor,
+    so every page is a bounded read no matter how far into the history it is.
+    """
+
+    def __init__(
+        self,
+        order_data_page_spi: GetOrderDataPageByCustomerIdSPI,
+        max_page_size: int = 1_000,
+    ) -> None:
+        self._get_page = order_data_page_spi.get_order_data_page_by_customer_id
+        self._max_page_size = max_page_size
+
+    def get_order_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        page_size: int,
+        cursor: PageCursor | None = None,
+    ) -> Page[OrderData]:
+        _check_size(size=page_size, max_size=self._max_page_size)
+        # One order more than requested tells whether a next page exists.
+        order_data = self._get_page(
+            customer_id=customer_id,
+            limit=page_size + 1,
+            after_order_id=_after_order_id(customer_id=customer_id, cursor=cursor),
+        )
+        return _to_page(
+            customer_id=customer_id, order_data=order_data, page_size=page_size
+        )
+
+    def iter_order_data_by_customer_id(
+        self, customer_id: Identifier, chunk_size: int
+    ) -> Iterator[list[OrderData]]:
+        _check_size(size=chunk_size, max_size=self._max_page_size)
+        after_order_id = None
+        while True:
+            chunk = self._get_page(
+                customer_id=customer_id, limit=chunk_size, after_order_id=after_order_id
+            )
+            if chunk != []:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after_order_id = chunk[-1].id
+
+
+class AsyncOrderDataByOrderIdService(AsyncGetOrderDataByOrderIdAPI):
+    def __init__(self, order_data_spi: AsyncGetOrderDataByOrderIdSPI) -> None:
+        self._order_data_spi = order_data_spi
+
+    async def get_order_by_order_id(self, order_id: Identifier) -> OrderData:
+        result = await self._order_data_spi.get_order_data_by_order_id(
+            order_id=order_id
+        )
+        if result is None:
+            raise InvalidOrderIdError(order_id=order_id)
+        return result
+
+
+class AsyncOrderDataByCustomerIdService(AsyncGetOrderDataByCustomerIdAPI):
+    def __init__(self, order_data_spi: AsyncGetOrderDataByCustomerIdSPI) -> None:
+        self._order_data_spi = order_data_spi
+
+    async def get_order_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[OrderData]:
+        result = await self._order_data_spi.get_order_data_by_customer_id(
+            customer_id=customer_id
+        )
+        return result
+
+
+class AsyncOrderDataPageByCustomerIdService(AsyncGetOrderDataPageByCustomerIdAPI):
+    def __init__(
+        self,
+        order_data_page_spi: AsyncGetOrderDataPageByCustomerIdSPI,
+        max_page_size: int = 1_000,
+    ) -> None:
+        self._get_page = order_data_page_spi.get_order_data_page_by_customer_id
+        self._max_page_size = max_page_size
+
+    async def get_order_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        page_size: int,
+        cursor: PageCursor | None = None,
+    ) -> Page[OrderData]:
+        _check_size(size=page_size, max_size=self._max_page_size)
+        order_data = await self._get_page(
+            customer_id=customer_id,
+            limit=page_size + 1,
+            after_order_id=_after_order_id(customer_id=customer_id, cursor=cursor),
+        )
+        return _to_page(
+            customer_id=customer_id, order_data=order_data, page_size=page_size
+        )
+
+    async def iter_order_data_by_customer_id(
+        self, customer_id: Identifier, chunk_size: int
+    ) -> AsyncIterator[list[OrderData]]:
+        _check_size(size=chunk_size, max_size=self._max_page_size)
+        after_order_id = None
+        while True:
+            chunk = await self._get_page(
+                customer_id=customer_id, limit=chunk_size, after_order_id=after_order_id
+            )
+            if chunk != []:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after_order_id = chunk[-1].id
+
+
+# Shared between the sync and async page services:
+
+
+def _check_size(size: int, max_size: int) -> None:
+    if not 1 <= size <= max_size:
+        raise ValueError(f"Page size must be between 1 and {max_size}, got {size}")
+
+
+def _after_order_id(
+    customer_id: Identifier, cursor: PageCursor | None
+) -> Identifier | None:
+    if cursor is None:
+        return None
+    if cursor.customer_id != customer_id:
+        raise InvalidPageCursorError(customer_id=customer_id)
+    return cursor.last_order_id
+
+
+def _to_page(
+    customer_id: Identifier, order_data: list[OrderData], page_size: int
+) -> Page[OrderData]:
+    if len(order_data) <= page_size:
+        return Page(items=order_data, next_cursor=None)
+    items = order_data[:page_size]
+    return Page(
+        items=items,
+        next_cursor=PageCursor(customer_id=customer_id, last_order_id=items[-1].id),
+    )
@@ -1,17 +1,43 @@
+from domain.models.identifier import Identifier
 from domain.models.order import PersistedOrder, VersionedOrder, RequestedOrder
 from domain.models.event import (
     StatusToEventMapperProtocol,
     StatusToEventMapper,
-    DispatchableEvent,
+    create_event,
+    create_events,
+)
+from domain.ports.api.place_order_api import PlaceOrderAPI, AsyncPlaceOrderAPI
+from domain.ports.spi.product_catalogue_spi import (
+    GetProductVersionIdsSPI,
+    AsyncGetProductVersionIdsSPI,
+)
+from domain.ports.spi.order_persistence_spi import (
+    SaveOrderSPI,
+    SaveOrdersSPI,
+    InsertOrdersSPI,
+    AsyncSaveOrderSPI,
+    AsyncSaveOrdersSPI,
+    AsyncInsertOrdersSPI,
+)
+from domain.ports.spi.order_id_generator_spi import GenerateOrderIdSPI
+from domain.ports.spi.idempotency_spi import (
+    PlaceOrderIdempotencySPI,
+    AsyncPlaceOrderIdempotencySPI,
 )
-from domain.ports.api.place_order_api import PlaceOrderAPI
-from domain.ports.spi.product_catalogue_spi import GetProductVersionIdsSPI
-from domain.ports.spi.order_persistence_spi import SaveOrderSPI
 from domain.ports.spi.status_update_event_dispatcher_spi import (
     StatusUpdateEventDispatcherSPI,
+    StatusUpdateEventBatchDispatcherSPI,
+    AsyncStatusUpdateEventDispatcherSPI,
+    AsyncStatusUpdateEventBatchDispatcherSPI,
+)
+from domain.errors import (
+    DomainError,
+    IdempotencyKeyReusedError,
+    InvalidProductIdError,
+    NoCurrentProductVersionError,
 )
-from domain.errors import InvalidProductIdError, NoCurrentProductVersionError
 from dataclasses import dataclass
+import asyncio
 
 
 @dataclass
@@ -20,33 +46,349 @@ class PlaceOrderService(PlaceOrderAPI):
     save_order_spi: SaveOrderSPI
     event_dispatcher: StatusUpdateEventDispatcherSPI
     _event_mapper: StatusToEventMapperProtocol = StatusToEventMapper
+    # Optional bulk dependencies used by `place_orders`.
+    # Falls back to the single order dependencies above when not provided.
+    save_orders_spi: SaveOrdersSPI | None = None
+    batch_event_dispatcher: StatusUpdateEventBatchDispatcherSPI | None = None
+    # Optional client-side id assignment. When provided, ids are generated
+    # before saving and all orders are written through `insert_orders_spi`.
+    order_id_generator: GenerateOrderIdSPI | None = None
+    insert_orders_spi: InsertOrdersSPI | None = None
+    # Optional deduplication of `place_order` calls with an idempotency key.
+    # Without it, idempotency keys are ignored.
+    idempotency_spi: PlaceOrderIdempotencySPI | None = None
 
-    def place_order(self, requested_order: RequestedOrder) -> PersistedOrder:
-        versioned_order = self._version_order(requested_order=requested_order)
-        persisted_order = self.save_order_spi.save_order(
-            versioned_order=versioned_order
-        )
-        event_type = self._event_mapper.map_status_to_event_type(
-            status=persisted_order.status
+    def __post_init__(self) -> None:
+        _check_id_assignment(self.order_id_generator, self.insert_orders_spi)
+
+    def place_order(
+        self, requested_order: RequestedOrder, idempotency_key: str | None = None
+    ) -> PersistedOrder:
+        if idempotency_key is None or self.idempotency_spi is None:
+            return self._place_order(requested_order=requested_order)
+        placed_order = self.idempotency_spi.claim(idempotency_key=idempotency_key)
+        if placed_order is not None:
+            return _check_same_order(
+                requested_order, placed_order, idempotency_key=idempotency_key
+            )
+        try:
+            persisted_order = self._place_order(requested_order=requested_order)
+        except BaseException:
+            self.idempotency_spi.release(idempotency_key=idempotency_key)
+            raise
+        self.idempotency_spi.complete(
+            idempotency_key=idempotency_key, persisted_order=persisted_order
         )
-        if event_type is not None:
-            event = DispatchableEvent(order=persisted_order, event_type=event_type)
+        return persisted_order
+
+    def _place_order(self, requested_order: RequestedOrder) -> PersistedOrder:
+        versioned_order = self._version_order(requested_order=requested_order)
+        persisted_order = self._save_order(versioned_order=versioned_order)
+        event = create_event(self._event_mapper, order=persisted_order)
+        if event is not None:
             self.event_dispatcher.dispatch_event(event=event)
         return persisted_order
 
+    def place_orders(
+        self, requested_orders: list[RequestedOrder]
+    ) -> list[PersistedOrder | DomainError]:
+        if requested_orders == []:
+            return []
+        get_result = self.get_product_version_ids_spi.get_product_versions(
+            product_ids=_combine_product_ids(requested_orders=requested_orders)
+        )
+        results, versioned_orders = _version_orders(
+            requested_orders=requested_orders, get_result=get_result
+        )
+        persisted_orders = self._save_orders(versioned_orders=versioned_orders)
+        self._dispatch_events(persisted_orders=persisted_orders)
+        return _merge_results(results=results, persisted_orders=persisted_orders)
+
     def _version_order(self, requested_order: RequestedOrder) -> VersionedOrder:
         product_ids = requested_order.get_product_ids()
         get_result = self.get_product_version_ids_spi.get_product_versions(
             product_ids=product_ids
         )
+        return _version_order_from_own_result(
+            requested_order=requested_order, get_result=get_result
+        )
+
+    def _save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        if self.order_id_generator is None or self.insert_orders_spi is None:
+            return self.save_order_spi.save_order(versioned_order=versioned_order)
+        return self._save_orders(versioned_orders=[versioned_order])[0]
+
+    def _save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        if versioned_orders == []:
+            return []
+        if self.order_id_generator is not None and self.insert_orders_spi is not None:
+            persisted_orders = _assign_ids(
+                self.order_id_generator, versioned_orders=versioned_orders
+            )
+            self.insert_orders_spi.insert_orders(persisted_orders=persisted_orders)
+            return persisted_orders
+        if self.save_orders_spi is not None:
+            return self.save_orders_spi.save_orders(versioned_orders=versioned_orders)
+        return [
+            self.save_order_spi.save_order(versioned_order=versioned_order)
+            for versioned_order in versioned_orders
+        ]
+
+    def _dispatch_events(self, persisted_orders: list[PersistedOrder]) -> None:
+        events = create_events(self._event_mapper, orders=persisted_orders)
+        if events == []:
+            return
+        if self.batch_event_dispatcher is not None:
+            self.batch_event_dispatcher.dispatch_events(events=events)
+            return
+        for event in events:
+            self.event_dispatcher.dispatch_event(event=event)
+
+
+@dataclass
+class AsyncPlaceOrderService(AsyncPlaceOrderAPI):
+    """
+    Asyncio twin of `PlaceOrderService` with identical validation
+    and event semantics.
+    """
+
+    get_product_version_ids_spi: AsyncGetProductVersionIdsSPI
+    save_order_spi: AsyncSaveOrderSPI
+    event_dispatcher: AsyncStatusUpdateEventDispatcherSPI
+    _event_mapper: StatusToEventMapperProtocol = StatusToEventMapper
+    save_orders_spi: AsyncSaveOrdersSPI | None = None
+    batch_event_dispatcher: AsyncStatusUpdateEventBatchDispatcherSPI | None = None
+    order_id_generator: GenerateOrderIdSPI | None = None
+    insert_orders_spi: AsyncInsertOrdersSPI | None = None
+    idempotency_spi: AsyncPlaceOrderIdempotencySPI | None = None
+
+    def __post_init__(self) -> None:
+        _check_id_assignment(self.order_id_generator, self.insert_orders_spi)
+
+    async def place_order(
+        self, requested_order: RequestedOrder, idempotency_key: str | None = None
+    ) -> PersistedOrder:
+        if idempotency_key is None or self.idempotency_spi is None:
+            return await self._place_order(requested_order=requested_order)
+        placed_order = await self.idempotency_spi.claim(
+            idempotency_key=idempotency_key
+        )
+        if placed_order is not None:
+            return _check_same_order(
+                requested_order, placed_order, idempotency_key=idempotency_key
+            )
+        try:
+            persisted_order = await self._place_order(requested_order=requested_order)
+        except BaseException:
+            await self.idempotency_spi.release(idempotency_key=idempotency_key)
+            raise
+        await self.idempotency_spi.complete(
+            idempotency_key=idempotency_key, persisted_order=persisted_order
+        )
+        return persisted_order
+
+    async def _place_order(self, requested_order: RequestedOrder) -> PersistedOrder:
+        get_result = await self.get_product_version_ids_spi.get_product_versions(
+            product_ids=requested_order.get_product_ids()
+        )
+        versioned_order = _version_order_from_own_result(
+            requested_order=requested_order, get_result=get_result
+        )
+        persisted_order = await self._save_order(versioned_order=versioned_order)
+        event = create_event(self._event_mapper, order=persisted_order)
+        if event is not None:
+            await self.event_dispatcher.dispatch_event(event=event)
+        return persisted_order
+
+    async def place_orders(
+        self, requested_orders: list[RequestedOrder]
+    ) -> list[PersistedOrder | DomainError]:
+        if requested_orders == []:
+            return []
+        get_result = await self.get_product_version_ids_spi.get_product_versions(
+            product_ids=_combine_product_ids(requested_orders=requested_orders)
+        )
+        results, versioned_orders = _version_orders(
+            requested_orders=requested_orders, get_result=get_result
+        )
+        persisted_orders = await self._save_orders(versioned_orders=versioned_orders)
+        await self._dispatch_events(persisted_orders=persisted_orders)
+        return _merge_results(results=results, persisted_orders=persisted_orders)
+
+    async def _save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        if self.order_id_generator is None or self.insert_orders_spi is None:
+            return await self.save_order_spi.save_order(versioned_order=versioned_order)
+        return (await self._save_orders(versioned_orders=[versioned_order]))[0]
 
-        if get_result.invalid_ids != set():
-            raise InvalidProductIdError(product_id=list(get_result.invalid_ids)[0])
-        if get_result.ids_without_product_version_id != set():
-            raise NoCurrentProductVersionError(
-                product_id=list(get_result.ids_without_product_version_id)[0]
+    async def _save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        if versioned_orders == []:
+            return []
+        if self.order_id_generator is not None and self.insert_orders_spi is not None:
+            persisted_orders = _assign_ids(
+                self.order_id_generator, versioned_orders=versioned_orders
             )
+            await self.insert_orders_spi.insert_orders(
+                persisted_orders=persisted_orders
+            )
+            return persisted_orders
+        if self.save_orders_spi is not None:
+            return await self.save_orders_spi.save_orders(
+                versioned_orders=versioned_orders
+            )
+        # Without a bulk dependency the single saves are run concurrently.
+        return list(
+            await asyncio.gather(
+                *(
+                    self.save_order_spi.save_order(versioned_order=versioned_order)
+                    for versioned_order in versioned_orders
+                )
+            )
+        )
+
+    async def _dispatch_events(self, persisted_orders: list[PersistedOrder]) -> None:
+        events = create_events(self._event_mapper, orders=persisted_orders)
+        if events == []:
+            return
+        if self.batch_event_dispatcher is not None:
+            await self.batch_event_dispatcher.dispatch_events(events=events)
+            return
+        for event in events:
+            await self.event_dispatcher.dispatch_event(event=event)
+
+
+# Logic shared by `PlaceOrderService` and `AsyncPlaceOrderService`:
+
+
+def _check_id_assignment(
+    order_id_generator: object | None, insert_orders_spi: object | None
+) -> None:
+    if (order_id_generator is None) != (insert_orders_spi is None):
+        raise ValueError(
+            "order_id_generator and insert_orders_spi must be provided together"
+        )
+
+
+def _assign_ids(
+    order_id_generator: GenerateOrderIdSPI, versioned_orders: list[VersionedOrder]
+) -> list[PersistedOrder]:
+    return [
+        versioned_order.to_persisted_order(id=order_id_generator.generate_order_id())
+        for versioned_order in versioned_orders
+    ]
+
 
-        return requested_order.to_versioned_order(
-            product_versions=get_result.product_version_ids
+def _version_order_from_own_result(
+    requested_order: RequestedOrder, get_result: GetProductVersionIdsSPI.Result
+) -> VersionedOrder:
+    """
+    Versions `requested_order` using a lookup result of its own product ids only.
+    """
+    if get_result.invalid_ids != set():
+        raise InvalidProductIdError(product_id=list(get_result.invalid_ids)[0])
+    if get_result.ids_without_product_version_id != set():
+        raise NoCurrentProductVersionError(
+            product_id=list(get_result.ids_without_product_version_id)[0]
         )
+
+    return requested_order.to_versioned_order(
+        product_versions=get_result.product_version_ids
+    )
+
+
+def _version_order_from_shared_result(
+    requested_order: RequestedOrder, get_result: GetProductVersionIdsSPI.Result
+) -> VersionedOrder:
+    """
+    Versions `requested_order` using a lookup result that may span
+    several orders. Only the product ids of `requested_order` are considered.
+    """
+    product_ids = requested_order.get_product_ids()
+
+    invalid_id = _first_in(product_ids, get_result.invalid_ids)
+    if invalid_id is not None:
+        raise InvalidProductIdError(product_id=invalid_id)
+    id_without_version = _first_in(
+        product_ids, get_result.ids_without_product_version_id
+    )
+    if id_without_version is not None:
+        raise NoCurrentProductVersionError(product_id=id_without_version)
+
+    return requested_order.to_versioned_order(
+        product_versions=get_result.product_version_ids
+    )
+
+
+def _first_in(
+    product_ids: list[Identifier], id_set: set[Identifier]
+) -> Identifier | None:
+    if id_set == set():
+        return None
+    return next((id for id in product_ids if id in id_set), None)
+
+
+def _combine_product_ids(requested_orders: list[RequestedOrder]) -> list[Identifier]:
+    return list(
+        dict.fromkeys(
+            product_id
+            for requested_order in requested_orders
+            for product_id in requested_order.get_product_ids()
+        )
+    )
+
+
+def _version_orders(
+    requested_orders: list[RequestedOrder],
+    get_result: GetProductVersionIdsSPI.Result,
+) -> tuple[list[DomainError | None], list[VersionedOrder]]:
+    """
+    Returns one entry per requested order, which is either the error that
+    prevents the order from being placed or `None`,
+    together with the versioned orders that can be placed.
+    """
+    results: list[DomainError | None] = []
+    versioned_orders: list[VersionedOrder] = []
+    for requested_order in requested_orders:
+        try:
+            versioned_order = _version_order_from_shared_result(
+                requested_order=requested_order, get_result=get_result
+            )
+        except (InvalidProductIdError, NoCurrentProductVersionError) as error:
+            results.append(error)
+            continue
+        results.append(None)
+        versioned_orders.append(versioned_order)
+    return results, versioned_orders
+
+
+def _merge_results(
+    results: list[DomainError | None], persisted_orders: list[PersistedOrder]
+) -> list[PersistedOrder | DomainError]:
+    """
+    Fills each `None` in `results` with the next persisted order.
+    """
+    persisted_orders_iter = iter(persisted_orders)
+    return [
+        next(persisted_orders_iter) if result is None else result
+        for result in results
+    ]
+
+
+def _check_same_order(
+    requested_order: RequestedOrder, placed_order: PersistedOrder, idempotency_key: str
+) -> PersistedOrder:
+    """
+    Returns `placed_order` if it was placed from an order equal to
+    `requested_order`, so a reused idempotency key is not mistaken for a retry.
+    """
+    if (
+        placed_order.customer_id != requested_order.customer_id
+        or placed_order.shipping_address != requested_order.shipping_address
+        or [(item.product_id, item.quantity) for item in placed_order.items]
+        != [(item.product_id, item.quantity) for item in requested_order.items]
+    ):
+        raise IdempotencyKeyReusedError(idempotency_key=idempotency_key)
+    return placed_order
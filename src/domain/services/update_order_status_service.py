@@ -1,10 +1,25 @@
 from domain.models.identifier import Identifier
 from domain.ports.api.update_order_status_api import (
     UpdateOrderStatusAPI,
+    AsyncUpdateOrderStatusAPI,
+)
+from domain.ports.spi.order_persistence_spi import (
+    UpdateOrderSPI,
+    UpdateOrdersSPI,
+    ConditionalUpdateOrderSPI,
+    GetOrderByOrderIdSPI,
+    GetOrdersByOrderIdsSPI,
+    AsyncUpdateOrderSPI,
+    AsyncUpdateOrdersSPI,
+    AsyncConditionalUpdateOrderSPI,
+    AsyncGetOrderByOrderIdSPI,
+    AsyncGetOrdersByOrderIdsSPI,
 )
-from domain.ports.spi.order_persistence_spi import UpdateOrderSPI, GetOrderByOrderIdSPI
 from domain.ports.spi.status_update_event_dispatcher_spi import (
     StatusUpdateEventDispatcherSPI,
+    StatusUpdateEventBatchDispatcherSPI,
+    AsyncStatusUpdateEventDispatcherSPI,
+    AsyncStatusUpdateEventBatchDispatcherSPI,
 )
 from domain.models.order import PersistedOrder
 from domain.models.order_status import (
@@ -19,9 +34,16 @@ from domain.models.status_transition_validator import (
 from domain.models.event import (
     StatusToEventMapper,
     StatusToEventMapperProtocol,
-    DispatchableEvent,
+    create_event,
+    create_events,
+)
+from domain.errors import (
+    DomainError,
+    InvalidOrderIdError,
+    InsufficientExpectednessError,
+    UpdateConflictError,
 )
-from domain.errors import InvalidOrderIdError, InsufficientExpectednessError
+import asyncio
 
 
 class UpdateOrderStatusService(UpdateOrderStatusAPI):
@@ -32,12 +54,29 @@ class UpdateOrderStatusService(UpdateOrderStatusAPI):
         status_update_event_dispatcher_spi: StatusUpdateEventDispatcherSPI,
         _transition_validator: TransitionValidatorProtocol = TransitionValidator,
         _status_to_event_mapper: StatusToEventMapperProtocol = StatusToEventMapper,
+        # Optional bulk dependencies used by `update_order_statuses`.
+        # Falls back to the single order dependencies above when not provided.
+        update_orders_spi: UpdateOrdersSPI | None = None,
+        get_orders_by_order_ids_spi: GetOrdersByOrderIdsSPI | None = None,
+        status_update_event_batch_dispatcher_spi: (
+            StatusUpdateEventBatchDispatcherSPI | None
+        ) = None,
+        # Optional compare-and-set dependency. When provided, every update
+        # is written only if the order still has the status it was validated
+        # against, and is retried up to `max_conflict_retries` times otherwise.
+        conditional_update_order_spi: ConditionalUpdateOrderSPI | None = None,
+        max_conflict_retries: int = 3,
     ) -> None:
         self._save_new_status = update_order_spi.update_order_status
         self._get_order = get_order_by_order_id_spi.get_order_by_order_id
         self._dispatch_event = status_update_event_dispatcher_spi.dispatch_event
-        self._validate_transition = _transition_validator.validate_transition
+        self._transition_validator = _transition_validator
         self._event_mapper = _status_to_event_mapper
+        self._update_orders_spi = update_orders_spi
+        self._get_orders_spi = get_orders_by_order_ids_spi
+        self._batch_dispatcher = status_update_event_batch_dispatcher_spi
+        self._conditional_update_spi = conditional_update_order_spi
+        self._max_conflict_retries = max_conflict_retries
 
     def update_order_status(
         self,
@@ -45,31 +84,366 @@ class UpdateOrderStatusService(UpdateOrderStatusAPI):
         new_status: Status,
         setting: ExpectednessSetting = ExpectednessSetting.REQUIRE_NEXT_UP,
     ) -> PersistedOrder:
-        order = self._get_order_or_raise(order_id)
-        transition = StatusTransition(from_status=order.status, to_status=new_status)
-        transition_is_invalid = not self._validate_transition(
-            transition=transition, setting=setting
+        order = _order_or_raise(self._get_order(order_id=order_id), order_id=order_id)
+        if self._conditional_update_spi is not None:
+            return self._update_conditionally(
+                self._conditional_update_spi,
+                order=order,
+                new_status=new_status,
+                setting=setting,
+            )
+        _validate_or_raise(
+            self._transition_validator,
+            order=order,
+            new_status=new_status,
+            setting=setting,
         )
-        if transition_is_invalid:
-            raise InsufficientExpectednessError
         updated_order = self._perform_update(order=order, new_status=new_status)
         return updated_order
 
-    def _get_order_or_raise(self, order_id: Identifier) -> PersistedOrder:
-        order = self._get_order(order_id=order_id)
-        if order is None:
-            raise InvalidOrderIdError(order_id=order_id)
-        return order
+    def update_order_statuses(
+        self, updates: list[tuple[Identifier, Status, ExpectednessSetting]]
+    ) -> list[PersistedOrder | DomainError]:
+        orders = self._get_orders(order_ids=_unique_order_ids(updates=updates))
+        if self._conditional_update_spi is not None:
+            # Each update is written conditionally on its own,
+            # re-reading only the orders whose write conflicts.
+            results: list[PersistedOrder | DomainError] = []
+            for order_id, new_status, setting in updates:
+                try:
+                    updated_order = self._update_conditionally(
+                        self._conditional_update_spi,
+                        order=_order_or_raise(orders.get(order_id), order_id=order_id),
+                        new_status=new_status,
+                        setting=setting,
+                    )
+                    orders[order_id] = updated_order
+                    results.append(updated_order)
+                except DomainError as error:
+                    results.append(error)
+            return results
+        results, new_statuses, updated_orders = _apply_updates(
+            self._transition_validator, orders=orders, updates=updates
+        )
+        self._save_new_statuses(new_statuses=new_statuses)
+        self._dispatch_events(updated_orders=updated_orders)
+        return results
 
     def _perform_update(
         self, order: PersistedOrder, new_status: Status
     ) -> PersistedOrder:
         self._save_new_status(order_id=order.id, new_status=new_status)
+        return self._complete_update(order=order, new_status=new_status)
+
+    def _update_conditionally(
+        self,
+        conditional_update_spi: ConditionalUpdateOrderSPI,
+        order: PersistedOrder,
+        new_status: Status,
+        setting: ExpectednessSetting,
+    ) -> PersistedOrder:
+        order_id = order.id
+        for attempt in range(0, self._max_conflict_retries + 1):
+            if attempt > 0:
+                order = _order_or_raise(
+                    self._get_order(order_id=order_id), order_id=order_id
+                )
+            _validate_or_raise(
+                self._transition_validator,
+                order=order,
+                new_status=new_status,
+                setting=setting,
+            )
+            if conditional_update_spi.update_order_status_if(
+                order_id=order_id, expected_status=order.status, new_status=new_status
+            ):
+                return self._complete_update(order=order, new_status=new_status)
+        raise UpdateConflictError(order_id=order_id)
+
+    def _complete_update(
+        self, order: PersistedOrder, new_status: Status
+    ) -> PersistedOrder:
         updated_order = order.update_status(new_status=new_status)
-        event_type = self._event_mapper.map_status_to_event_type(
-            status=updated_order.status
+        event = create_event(self._event_mapper, order=updated_order)
+        if event is not None:
+            self._dispatch_event(event=event)
+        return updated_order
+
+    def _get_orders(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        if order_ids == []:
+            return {}
+        if self._get_orders_spi is not None:
+            orders = self._get_orders_spi.get_orders_by_order_ids(order_ids=order_ids)
+            return dict(orders)
+        return _found_orders(
+            order_ids=order_ids,
+            orders=[self._get_order(order_id=order_id) for order_id in order_ids],
         )
-        if event_type is not None:
-            event = DispatchableEvent(order=updated_order, event_type=event_type)
+
+    def _save_new_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        if new_statuses == {}:
+            return
+        if self._update_orders_spi is not None:
+            self._update_orders_spi.update_order_statuses(new_statuses=new_statuses)
+            return
+        for order_id, new_status in new_statuses.items():
+            self._save_new_status(order_id=order_id, new_status=new_status)
+
+    def _dispatch_events(self, updated_orders: list[PersistedOrder]) -> None:
+        events = create_events(self._event_mapper, orders=updated_orders)
+        if events == []:
+            return
+        if self._batch_dispatcher is not None:
+            self._batch_dispatcher.dispatch_events(events=events)
+            return
+        for event in events:
             self._dispatch_event(event=event)
+
+
+class AsyncUpdateOrderStatusService(AsyncUpdateOrderStatusAPI):
+    """
+    Asyncio twin of `UpdateOrderStatusService` with identical validation
+    and event semantics.
+    """
+
+    def __init__(
+        self,
+        update_order_spi: AsyncUpdateOrderSPI,
+        get_order_by_order_id_spi: AsyncGetOrderByOrderIdSPI,
+        status_update_event_dispatcher_spi: AsyncStatusUpdateEventDispatcherSPI,
+        _transition_validator: TransitionValidatorProtocol = TransitionValidator,
+        _status_to_event_mapper: StatusToEventMapperProtocol = StatusToEventMapper,
+        update_orders_spi: AsyncUpdateOrdersSPI | None = None,
+        get_orders_by_order_ids_spi: AsyncGetOrdersByOrderIdsSPI | None = None,
+        status_update_event_batch_dispatcher_spi: (
+            AsyncStatusUpdateEventBatchDispatcherSPI | None
+        ) = None,
+        conditional_update_order_spi: AsyncConditionalUpdateOrderSPI | None = None,
+        max_conflict_retries: int = 3,
+    ) -> None:
+        self._save_new_status = update_order_spi.update_order_status
+        self._get_order = get_order_by_order_id_spi.get_order_by_order_id
+        self._dispatch_event = status_update_event_dispatcher_spi.dispatch_event
+        self._transition_validator = _transition_validator
+        self._event_mapper = _status_to_event_mapper
+        self._update_orders_spi = update_orders_spi
+        self._get_orders_spi = get_orders_by_order_ids_spi
+        self._batch_dispatcher = status_update_event_batch_dispatcher_spi
+        self._conditional_update_spi = conditional_update_order_spi
+        self._max_conflict_retries = max_conflict_retries
+
+    async def update_order_status(
+        self,
+        order_id: Identifier,
+        new_status: Status,
+        setting: ExpectednessSetting = ExpectednessSetting.REQUIRE_NEXT_UP,
+    ) -> PersistedOrder:
+        order = _order_or_raise(
+            await self._get_order(order_id=order_id), order_id=order_id
+        )
+        if self._conditional_update_spi is not None:
+            return await self._update_conditionally(
+                self._conditional_update_spi,
+                order=order,
+                new_status=new_status,
+                setting=setting,
+            )
+        _validate_or_raise(
+            self._transition_validator,
+            order=order,
+            new_status=new_status,
+            setting=setting,
+        )
+        await self._save_new_status(order_id=order.id, new_status=new_status)
+        return await self._complete_update(order=order, new_status=new_status)
+
+    async def update_order_statuses(
+        self, updates: list[tuple[Identifier, Status, ExpectednessSetting]]
+    ) -> list[PersistedOrder | DomainError]:
+        orders = await self._get_orders(order_ids=_unique_order_ids(updates=updates))
+        if self._conditional_update_spi is not None:
+            results: list[PersistedOrder | DomainError] = []
+            for order_id, new_status, setting in updates:
+                try:
+                    updated_order = await self._update_conditionally(
+                        self._conditional_update_spi,
+                        order=_order_or_raise(orders.get(order_id), order_id=order_id),
+                        new_status=new_status,
+                        setting=setting,
+                    )
+                    orders[order_id] = updated_order
+                    results.append(updated_order)
+                except DomainError as error:
+                    results.append(error)
+            return results
+        results, new_statuses, updated_orders = _apply_updates(
+            self._transition_validator, orders=orders, updates=updates
+        )
+        await self._save_new_statuses(new_statuses=new_statuses)
+        await self._dispatch_events(updated_orders=updated_orders)
+        return results
+
+    async def _update_conditionally(
+        self,
+        conditional_update_spi: AsyncConditionalUpdateOrderSPI,
+        order: PersistedOrder,
+        new_status: Status,
+        setting: ExpectednessSetting,
+    ) -> PersistedOrder:
+        order_id = order.id
+        for attempt in range(0, self._max_conflict_retries + 1):
+            if attempt > 0:
+                order = _order_or_raise(
+                    await self._get_order(order_id=order_id), order_id=order_id
+                )
+            _validate_or_raise(
+                self._transition_validator,
+                order=order,
+                new_status=new_status,
+                setting=setting,
+            )
+            if await conditional_update_spi.update_order_status_if(
+                order_id=order_id, expected_status=order.status, new_status=new_status
+            ):
+                return await self._complete_update(order=order, new_status=new_status)
+        raise UpdateConflictError(order_id=order_id)
+
+    async def _complete_update(
+        self, order: PersistedOrder, new_status: Status
+    ) -> PersistedOrder:
+        updated_order = order.update_status(new_status=new_status)
+        event = create_event(self._event_mapper, order=updated_order)
+        if event is not None:
+            await self._dispatch_event(event=event)
         return updated_order
+
+    async def _get_orders(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        if order_ids == []:
+            return {}
+        if self._get_orders_spi is not None:
+            orders = await self._get_orders_spi.get_orders_by_order_ids(
+                order_ids=order_ids
+            )
+            return dict(orders)
+        # Without a bulk dependency the single reads are run concurrently.
+        return _found_orders(
+            order_ids=order_ids,
+            orders=await asyncio.gather(
+                *(self._get_order(order_id=order_id) for order_id in order_ids)
+            ),
+        )
+
+    async def _save_new_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        if new_statuses == {}:
+            return
+        if self._update_orders_spi is not None:
+            await self._update_orders_spi.update_order_statuses(
+                new_statuses=new_statuses
+            )
+            return
+        await asyncio.gather(
+            *(
+                self._save_new_status(order_id=order_id, new_status=new_status)
+                for order_id, new_status in new_statuses.items()
+            )
+        )
+
+    async def _dispatch_events(self, updated_orders: list[PersistedOrder]) -> None:
+        events = create_events(self._event_mapper, orders=updated_orders)
+        if events == []:
+            return
+        if self._batch_dispatcher is not None:
+            await self._batch_dispatcher.dispatch_events(events=events)
+            return
+        for event in events:
+            await self._dispatch_event(event=event)
+
+
+# Logic shared by `UpdateOrderStatusService` and `AsyncUpdateOrderStatusService`:
+
+
+def _order_or_raise(
+    order: PersistedOrder | None, order_id: Identifier
+) -> PersistedOrder:
+    if order is None:
+        raise InvalidOrderIdError(order_id=order_id)
+    return order
+
+
+def _is_valid_transition(
+    validator: TransitionValidatorProtocol,
+    order: PersistedOrder,
+    new_status: Status,
+    setting: ExpectednessSetting,
+) -> bool:
+    transition = StatusTransition(from_status=order.status, to_status=new_status)
+    return validator.validate_transition(transition=transition, setting=setting)
+
+
+def _validate_or_raise(
+    validator: TransitionValidatorProtocol,
+    order: PersistedOrder,
+    new_status: Status,
+    setting: ExpectednessSetting,
+) -> None:
+    if not _is_valid_transition(
+        validator, order=order, new_status=new_status, setting=setting
+    ):
+        raise InsufficientExpectednessError
+
+
+def _unique_order_ids(
+    updates: list[tuple[Identifier, Status, ExpectednessSetting]]
+) -> list[Identifier]:
+    return list(dict.fromkeys(order_id for order_id, _, _ in updates))
+
+
+def _found_orders(
+    order_ids: list[Identifier], orders: list[PersistedOrder | None]
+) -> dict[Identifier, PersistedOrder]:
+    return {
+        order_id: order
+        for order_id, order in zip(order_ids, orders)
+        if order is not None
+    }
+
+
+def _apply_updates(
+    validator: TransitionValidatorProtocol,
+    orders: dict[Identifier, PersistedOrder],
+    updates: list[tuple[Identifier, Status, ExpectednessSetting]],
+) -> tuple[
+    list[PersistedOrder | DomainError],
+    dict[Identifier, Status],
+    list[PersistedOrder],
+]:
+    """
+    Validates and applies `updates` in memory, in the given order.
+    Returns the result of each update, the final status of each updated order
+    and every updated order in the order the updates were applied.
+    """
+    orders = dict(orders)
+    results: list[PersistedOrder | DomainError] = []
+    new_statuses: dict[Identifier, Status] = {}
+    updated_orders: list[PersistedOrder] = []
+    for order_id, new_status, setting in updates:
+        order = orders.get(order_id)
+        if order is None:
+            results.append(InvalidOrderIdError(order_id=order_id))
+            continue
+        if not _is_valid_transition(
+            validator, order=order, new_status=new_status, setting=setting
+        ):
+            results.append(InsufficientExpectednessError())
+            continue
+        updated_order = order.update_status(new_status=new_status)
+        # Later updates of the same order transition from the new status.
+        orders[order_id] = updated_order
+        new_statuses[order_id] = new_status
+        updated_orders.append(updated_order)
+        results.append(updated_order)
+    return results, new_statuses, updated_orders
@@ -0,0 +1,33 @@
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import Address
+from test_domain.conftest import (  # noqa: F401
+    address_generator,
+    identifier,
+    product_version_ids,
+    product_versions,
+    requested_items,
+    versioned_items,
+    items_with_product_versions,
+    requested_order,
+    versioned_order,
+    persisted_order,
+    order_data,
+)
+from typing import Callable
+from pytest import fixture
+
+
+@fixture
+def id_generator() -> Callable[[], Identifier]:
+    """
+    Adapters persist identifiers, so they are tested with `SnowflakeId`s.
+    """
+    return SnowflakeIdGenerator(worker_id=0).generate_order_id
+
+
+@fixture
+def address() -> Address:
+    """
+    `Address` has no fields yet, so adapters cannot persist subclasses of it.
+    """
+    return Address()
@@ -0,0 +1,130 @@
+from adapters.cache.idempotency_store import (
+    AsyncInMemoryIdempotencyStore,
+    InMemoryIdempotencyStore,
+)
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from domain.errors import PlaceOrderInProgressError
+from domain.models.identifier import Identifier
+from domain.models.order import PersistedOrder, RequestedOrder, VersionedOrder
+from domain.services.place_order_service import PlaceOrderService
+from test_domain.dummies import GetProductVersionIdsDummy, SaveOrderDummy
+from dataclasses import dataclass
+from threading import Barrier, Thread
+import asyncio
+import pytest
+import time
+
+
+@dataclass
+class SlowSaveOrderDummy(SaveOrderDummy):
+    def save_order(self, versioned_order: VersionedOrder) -> PersistedOrder:
+        time.sleep(0.02)
+        return super().save_order(versioned_order=versioned_order)
+
+
+@dataclass
+class ClockDummy:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_duplicates_wait_for_first(
+    product_version_ids: dict[Identifier, Identifier],
+    requested_order: RequestedOrder,
+    persisted_order: PersistedOrder,
+) -> None:
+    """
+    Assert that concurrent requests with the same key place the order once
+    and all return it.
+    """
+
+    # Setup:
+    save_order_dummy = SlowSaveOrderDummy(persisted_order_to_return=persisted_order)
+    service = PlaceOrderService(
+        get_product_version_ids_spi=GetProductVersionIdsDummy(
+            product_version_ids=product_version_ids
+        ),
+        save_order_spi=save_order_dummy,
+        event_dispatcher=InMemoryEventSink(),
+        idempotency_spi=InMemoryIdempotencyStore(),
+    )
+    barrier = Barrier(8)
+    results = []
+
+    def place_order() -> None:
+        barrier.wait()
+        results.append(
+            service.place_order(requested_order=requested_order, idempotency_key="a")
+        )
+
+    # Run:
+    threads = [Thread(target=place_order) for _ in range(0, 8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert:
+    assert results == [persisted_order] * 8
+    assert len(save_order_dummy.read()) == 1
+
+
+def test_released_key_can_be_claimed_again(persisted_order: PersistedOrder) -> None:
+    store = InMemoryIdempotencyStore()
+
+    assert store.claim(idempotency_key="a") is None
+    store.release(idempotency_key="a")
+    assert store.claim(idempotency_key="a") is None
+    store.complete(idempotency_key="a", persisted_order=persisted_order)
+    assert store.claim(idempotency_key="a") == persisted_order
+
+
+def test_placed_orders_expire(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    clock = ClockDummy()
+    store = InMemoryIdempotencyStore(ttl_seconds=10, _clock=clock)
+    store.claim(idempotency_key="a")
+    store.complete(idempotency_key="a", persisted_order=persisted_order)
+
+    # Run:
+    clock.now = 11
+
+    # Assert:
+    assert store.claim(idempotency_key="a") is None
+
+
+def test_wait_times_out() -> None:
+    # Setup:
+    store = InMemoryIdempotencyStore(wait_timeout_seconds=0.01)
+    store.claim(idempotency_key="a")
+
+    # Run:
+    with pytest.raises(PlaceOrderInProgressError) as error_info:
+        store.claim(idempotency_key="a")
+
+    # Assert:
+    assert error_info.value.idempotency_key == "a"
+
+
+def test_async_duplicates_wait_for_first(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    store = AsyncInMemoryIdempotencyStore()
+
+    async def first() -> PersistedOrder | None:
+        claimed = await store.claim(idempotency_key="a")
+        await asyncio.sleep(0.01)
+        await store.complete(idempotency_key="a", persisted_order=persisted_order)
+        return claimed
+
+    async def run() -> list[PersistedOrder | None]:
+        return list(
+            await asyncio.gather(first(), store.claim("a"), store.claim("a"))
+        )
+
+    # Run:
+    results = asyncio.run(run())
+
+    # Assert:
+    assert results == [None, persisted_order, persisted_order]
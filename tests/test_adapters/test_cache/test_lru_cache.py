@@ -0,0 +1,69 @@
+from adapters.cache.lru_cache import LRUCache
+from dataclasses import dataclass
+import pytest
+
+
+@dataclass
+class ClockDummy:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.set(key="a", value=1)
+    cache.set(key="b", value=2)
+    cache.get(key="a")
+    cache.set(key="c", value=3)
+
+    assert cache.get(key="a") == 1
+    assert cache.get(key="b") is None
+    assert cache.get(key="c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_expires_entries() -> None:
+    clock = ClockDummy()
+    cache: LRUCache[str, int] = LRUCache(max_size=10, ttl_seconds=10, _clock=clock)
+    cache.set(key="a", value=1)
+    cache.set(key="b", value=2, ttl_seconds=1)
+
+    clock.now = 5
+    assert cache.get_many(keys=["a", "b"]) == {"a": 1}
+
+    clock.now = 10
+    assert cache.get(key="a") is None
+    assert cache.stats.expirations == 2
+
+
+def test_replace_and_invalidate() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=10)
+    cache.set(key="a", value=1)
+
+    assert cache.replace(key="a", update=lambda value: value + 1) is True
+    assert cache.replace(key="b", update=lambda value: value + 1) is False
+    assert cache.get(key="a") == 2
+
+    cache.invalidate(keys=["a"])
+    assert cache.get(key="a") is None
+
+
+def test_stats_hit_rate() -> None:
+    cache: LRUCache[str, int] = LRUCache(max_size=10)
+    assert cache.stats.hit_rate == 0.0
+
+    cache.set(key="a", value=1)
+    cache.get(key="a")
+    cache.get(key="a")
+    cache.get(key="b")
+
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+
+def test_requires_positive_size() -> None:
+    with pytest.raises(ValueError):
+        LRUCache(max_size=0)
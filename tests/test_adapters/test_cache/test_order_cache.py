@@ -0,0 +1,305 @@
+from adapters.cache.order_cache import WriteThroughOrderCache
+from domain.errors import UpdateOrderError
+from domain.models.identifier import Identifier
+from domain.models.order import PersistedOrder
+from domain.models.order_status import Status
+from domain.services.update_order_status_service import UpdateOrderStatusService
+from test_domain.dummies import (
+    ConditionalUpdateOrderDummy,
+    EventDispatcherDummy,
+    GetOrderByOrderIdDummy,
+    UpdateOrderDummy,
+)
+from dataclasses import dataclass, field, replace
+from threading import Event, Thread
+from typing import Callable
+import pytest
+
+
+@dataclass
+class CountingGetOrderDummy(GetOrderByOrderIdDummy):
+    reads: list[Identifier] = field(default_factory=list)
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        self.reads.append(order_id)
+        return super().get_order_by_order_id(order_id=order_id)
+
+
+@dataclass
+class FailingUpdateOrderDummy(UpdateOrderDummy):
+    def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
+        raise UpdateOrderError(order_id=order_id)
+
+
+def make_cache(
+    get_order_dummy: GetOrderByOrderIdDummy,
+    update_order_dummy: UpdateOrderDummy,
+    max_size: int = 100,
+) -> WriteThroughOrderCache:
+    return WriteThroughOrderCache(
+        get_order_by_order_id_spi=get_order_dummy,
+        update_order_spi=update_order_dummy,
+        max_size=max_size,
+        get_orders_by_order_ids_spi=get_order_dummy,
+        update_orders_spi=update_order_dummy,
+        conditional_update_order_spi=ConditionalUpdateOrderDummy(
+            get_order_dummy=get_order_dummy
+        ),
+    )
+
+
+def test_reads_through_once(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    get_order_dummy = CountingGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    cache = make_cache(get_order_dummy, UpdateOrderDummy())
+
+    # Run:
+    orders = [
+        cache.get_order_by_order_id(order_id=persisted_order.id) for _ in range(3)
+    ]
+
+    # Assert:
+    assert orders == [persisted_order] * 3
+    assert get_order_dummy.reads == [persisted_order.id]
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+
+def test_write_updates_cached_order(persisted_order: PersistedOrder) -> None:
+    """
+    Assert that a status update is applied to the cached order,
+    so the next read does not go to persistence.
+    """
+
+    # Setup:
+    get_order_dummy = CountingGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    update_order_dummy = UpdateOrderDummy()
+    cache = make_cache(get_order_dummy, update_order_dummy)
+    cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Run:
+    cache.update_order_status(
+        order_id=persisted_order.id, new_status=Status.ACCEPTED_BY_INVENTORY
+    )
+    order = cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Assert:
+    assert update_order_dummy.statuses == {
+        persisted_order.id: Status.ACCEPTED_BY_INVENTORY
+    }
+    assert order == persisted_order.update_status(
+        new_status=Status.ACCEPTED_BY_INVENTORY
+    )
+    assert get_order_dummy.reads == [persisted_order.id]
+
+
+def test_bulk_reads_and_writes(
+    id_generator: Callable[[], Identifier], persisted_order: PersistedOrder
+) -> None:
+    # Setup:
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(3)]
+    get_order_dummy = CountingGetOrderDummy()
+    for order in orders:
+        get_order_dummy.add(order)
+    update_order_dummy = UpdateOrderDummy()
+    cache = make_cache(get_order_dummy, update_order_dummy)
+    cache.get_order_by_order_id(order_id=orders[0].id)
+
+    # Run:
+    cache.update_order_statuses(
+        new_statuses={order.id: Status.ACCEPTED_BY_INVENTORY for order in orders}
+    )
+    read = cache.get_orders_by_order_ids(order_ids=[order.id for order in orders])
+
+    # Assert:
+    assert get_order_dummy.bulk_reads == [[orders[1].id, orders[2].id]]
+    assert update_order_dummy.bulk_writes == [
+        {order.id: Status.ACCEPTED_BY_INVENTORY for order in orders}
+    ]
+    assert read[orders[0].id].status == Status.ACCEPTED_BY_INVENTORY
+    # Not cached when written, so read from the dummy, which is unchanged.
+    assert read[orders[1].id] == orders[1]
+
+
+def test_is_bounded(
+    id_generator: Callable[[], Identifier], persisted_order: PersistedOrder
+) -> None:
+    # Setup:
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(3)]
+    get_order_dummy = CountingGetOrderDummy()
+    for order in orders:
+        get_order_dummy.add(order)
+    cache = make_cache(get_order_dummy, UpdateOrderDummy(), max_size=2)
+
+    # Run:
+    for order in orders + [orders[0]]:
+        cache.get_order_by_order_id(order_id=order.id)
+
+    # Assert:
+    assert get_order_dummy.reads == [order.id for order in orders + [orders[0]]]
+    assert cache.stats.evictions == 2
+
+
+def test_failed_write_invalidates(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    get_order_dummy = CountingGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    cache = make_cache(get_order_dummy, FailingUpdateOrderDummy())
+    cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Run:
+    with pytest.raises(UpdateOrderError):
+        cache.update_order_status(
+            order_id=persisted_order.id, new_status=Status.ACCEPTED_BY_INVENTORY
+        )
+    cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Assert:
+    assert get_order_dummy.reads == [persisted_order.id] * 2
+
+
+def test_conditional_update(persisted_order: PersistedOrder) -> None:
+    """
+    Assert that a successful compare-and-set updates the cached order
+    and a failed one evicts it.
+    """
+
+    # Setup:
+    get_order_dummy = CountingGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    cache = make_cache(get_order_dummy, UpdateOrderDummy())
+    cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Run:
+    updated = cache.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.ACCEPTED_BY_INVENTORY,
+    )
+    cached = cache.get_order_by_order_id(order_id=persisted_order.id)
+    conflicted = cache.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.PAID,
+    )
+    reread = cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Assert:
+    assert (updated, conflicted) == (True, False)
+    assert cached is not None and cached.status == Status.ACCEPTED_BY_INVENTORY
+    assert reread is not None and reread.status == Status.ACCEPTED_BY_INVENTORY
+    assert get_order_dummy.reads == [persisted_order.id] * 2
+
+
+def test_read_overlapping_write_is_not_cached(
+    persisted_order: PersistedOrder,
+) -> None:
+    """
+    Assert that an order read before a write completes is returned
+    but not cached, since it may be stale.
+    """
+
+    # Setup:
+    cache: WriteThroughOrderCache
+
+    @dataclass
+    class WritingGetOrderDummy(CountingGetOrderDummy):
+        def get_order_by_order_id(
+            self, order_id: Identifier
+        ) -> PersistedOrder | None:
+            order = super().get_order_by_order_id(order_id=order_id)
+            if len(self.reads) == 1:
+                cache.update_order_status(
+                    order_id=order_id, new_status=Status.ACCEPTED_BY_INVENTORY
+                )
+            return order
+
+    get_order_dummy = WritingGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    cache = make_cache(get_order_dummy, UpdateOrderDummy())
+
+    # Run:
+    stale = cache.get_order_by_order_id(order_id=persisted_order.id)
+    cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Assert:
+    assert stale == persisted_order
+    assert get_order_dummy.reads == [persisted_order.id] * 2
+
+
+def test_concurrent_writes_are_cached_in_persisted_order(
+    persisted_order: PersistedOrder,
+) -> None:
+    """
+    Assert that a write persisted after another one is also cached after it,
+    so the cache ends up with the persisted status.
+    """
+
+    # Setup:
+    @dataclass
+    class GatedUpdateOrderDummy(UpdateOrderDummy):
+        # The first write pauses after persisting, before it is cached.
+        entered: Event = field(default_factory=Event)
+        gate: Event = field(default_factory=Event)
+
+        def update_order_status(
+            self, order_id: Identifier, new_status: Status
+        ) -> None:
+            super().update_order_status(order_id=order_id, new_status=new_status)
+            if not self.entered.is_set():
+                self.entered.set()
+                self.gate.wait(timeout=5)
+
+    get_order_dummy = GetOrderByOrderIdDummy()
+    get_order_dummy.add(persisted_order)
+    update_order_dummy = GatedUpdateOrderDummy()
+    cache = make_cache(get_order_dummy, update_order_dummy)
+    cache.get_order_by_order_id(order_id=persisted_order.id)
+
+    def write(new_status: Status) -> Thread:
+        thread = Thread(
+            target=cache.update_order_status,
+            kwargs={"order_id": persisted_order.id, "new_status": new_status},
+        )
+        thread.start()
+        return thread
+
+    # Run:
+    first = write(Status.ACCEPTED_BY_INVENTORY)
+    update_order_dummy.entered.wait(timeout=5)
+    second = write(Status.PAID)
+    second.join(timeout=0.05)
+    second_waited = second.is_alive()
+    update_order_dummy.gate.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+
+    # Assert:
+    assert second_waited
+    assert update_order_dummy.statuses == {persisted_order.id: Status.PAID}
+    cached = cache.get_order_by_order_id(order_id=persisted_order.id)
+    assert cached is not None and cached.status == Status.PAID
+
+
+def test_serves_update_order_status_service(
+    persisted_order: PersistedOrder,
+) -> None:
+    # Setup:
+    get_order_dummy = CountingGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    update_order_dummy = UpdateOrderDummy()
+    cache = make_cache(get_order_dummy, update_order_dummy)
+    service = UpdateOrderStatusService(
+        update_order_spi=cache,
+        get_order_by_order_id_spi=cache,
+        status_update_event_dispatcher_spi=EventDispatcherDummy(),
+    )
+
+    # Run:
+    for new_status in (Status.ACCEPTED_BY_INVENTORY, Status.PAID):
+        service.update_order_status(order_id=persisted_order.id, new_status=new_status)
+
+    # Assert:
+    assert update_order_dummy.statuses == {persisted_order.id: Status.PAID}
+    assert get_order_dummy.reads == [persisted_order.id]
@@ -0,0 +1,171 @@
+from adapters.cache.product_version_cache import (
+    ProductVersionIdsCache,
+    ProductVersionsCache,
+)
+from domain.models.identifier import Identifier
+from domain.models.product import Product, ProductVersion
+from domain.ports.spi.product_catalogue_spi import GetProductVersionsSPI
+from test_domain.dummies import GetProductVersionIdsDummy
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class GetProductVersionsDummy:
+    product_versions: dict[Identifier, ProductVersion] = field(default_factory=dict)
+
+    requested_product_ids: list[list[Identifier]] = field(default_factory=list)
+
+    def get_product_versions(
+        self, product_ids: list[Identifier]
+    ) -> GetProductVersionsSPI.Result:
+        self.requested_product_ids.append(product_ids)
+        return GetProductVersionsSPI.Result(
+            product_versions={
+                id: self.product_versions[id]
+                for id in product_ids
+                if id in self.product_versions
+            },
+            invalid_ids={id for id in product_ids if id not in self.product_versions},
+            ids_without_product_version_id=set(),
+        )
+
+
+@dataclass
+class ClockDummy:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fetches_only_cache_misses(
+    product_version_ids: dict[Identifier, Identifier],
+) -> None:
+    product_ids = list(product_version_ids)
+    dummy = GetProductVersionIdsDummy(product_version_ids=product_version_ids)
+    cache = ProductVersionIdsCache(get_product_version_ids_spi=dummy)
+
+    cache.get_product_versions(product_ids=product_ids[:5])
+    result = cache.get_product_versions(product_ids=product_ids)
+
+    assert dummy.requested_product_ids == [product_ids[:5], product_ids[5:]]
+    assert result.product_version_ids == product_version_ids
+    assert cache.stats.hits == 5
+    assert cache.stats.misses == len(product_ids)
+
+
+def test_caches_negative_entries(id_generator: Callable[[], Identifier]) -> None:
+    invalid_id = id_generator()
+    id_without_version = id_generator()
+    dummy = GetProductVersionIdsDummy(
+        invalid_ids={invalid_id},
+        ids_without_product_version_id={id_without_version},
+    )
+    clock = ClockDummy()
+    cache = ProductVersionIdsCache(
+        get_product_version_ids_spi=dummy,
+        ttl_seconds=100,
+        negative_ttl_seconds=10,
+        _clock=clock,
+    )
+    product_ids = [invalid_id, id_without_version]
+
+    cache.get_product_versions(product_ids=product_ids)
+    result = cache.get_product_versions(product_ids=product_ids)
+
+    assert len(dummy.requested_product_ids) == 1
+    assert result.invalid_ids == {invalid_id}
+    assert result.ids_without_product_version_id == {id_without_version}
+
+    clock.now = 10
+    cache.get_product_versions(product_ids=product_ids)
+    assert len(dummy.requested_product_ids) == 2
+
+
+def test_on_product_updated_invalidates(
+    product_versions: dict[Identifier, ProductVersion],
+    id_generator: Callable[[], Identifier],
+) -> None:
+    dummy = GetProductVersionsDummy(product_versions=dict(product_versions))
+    cache = ProductVersionsCache(get_product_versions_spi=dummy)
+    product_id = list(product_versions)[0]
+
+    cache.get_product_versions(product_ids=[product_id])
+    new_version = ProductVersion(
+        id=id_generator(),
+        product_id=product_id,
+        price=product_versions[product_id].price,
+    )
+    dummy.product_versions[product_id] = new_version
+    cache.on_product_updated(
+        product=Product(id=product_id, current_version_id=new_version.id)
+    )
+    result = cache.get_product_versions(product_ids=[product_id])
+
+    assert result.product_versions == {product_id: new_version}
+    assert dummy.requested_product_ids == [[product_id], [product_id]]
+
+
+def test_evicts_least_recently_used(
+    product_versions: dict[Identifier, ProductVersion],
+) -> None:
+    dummy = GetProductVersionsDummy(product_versions=product_versions)
+    cache = ProductVersionsCache(get_product_versions_spi=dummy, max_size=2)
+    a, b, c = list(product_versions)[:3]
+
+    cache.get_product_versions(product_ids=[a, b])
+    cache.get_product_versions(product_ids=[a])
+    cache.get_product_versions(product_ids=[c])
+    cache.get_product_versions(product_ids=[a, b])
+
+    assert dummy.requested_product_ids == [[a, b], [c], [b]]
+
+
+def test_negative_entries_default_to_ttl(
+    id_generator: Callable[[], Identifier],
+) -> None:
+    invalid_id = id_generator()
+    dummy = GetProductVersionIdsDummy(invalid_ids={invalid_id})
+    clock = ClockDummy()
+    cache = ProductVersionIdsCache(
+        get_product_version_ids_spi=dummy,
+        ttl_seconds=100,
+        negative_ttl_seconds=None,
+        _clock=clock,
+    )
+
+    cache.get_product_versions(product_ids=[invalid_id])
+    clock.now = 99
+    cache.get_product_versions(product_ids=[invalid_id])
+    assert len(dummy.requested_product_ids) == 1
+    clock.now = 100
+    cache.get_product_versions(product_ids=[invalid_id])
+    assert len(dummy.requested_product_ids) == 2
+
+
+def test_invalidation_during_fetch_is_not_overwritten(
+    product_versions: dict[Identifier, ProductVersion],
+) -> None:
+    dummy = GetProductVersionsDummy(product_versions=dict(product_versions))
+    cache = ProductVersionsCache(get_product_versions_spi=dummy)
+    product_id, other_product_id = list(product_versions)[:2]
+    fetch = dummy.get_product_versions
+
+    def fetch_then_invalidate(
+        product_ids: list[Identifier],
+    ) -> GetProductVersionsSPI.Result:
+        result = fetch(product_ids=product_ids)
+        # The product changes after the fetch read it.
+        cache.invalidate(product_ids=[product_id])
+        return result
+
+    dummy.get_product_versions = fetch_then_invalidate  # type: ignore[method-assign]
+    cache.get_product_versions(product_ids=[product_id, other_product_id])
+    dummy.get_product_versions = fetch  # type: ignore[method-assign]
+    cache.get_product_versions(product_ids=[product_id, other_product_id])
+
+    assert dummy.requested_product_ids == [
+        [product_id, other_product_id],
+        [product_id],
+    ]
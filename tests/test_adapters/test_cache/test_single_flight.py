@@ -0,0 +1,247 @@
+from adapters.cache.single_flight import (
+    AsyncCoalescingOrderReader,
+    CoalescingOrderReader,
+)
+from domain.errors import ReadFromPersistenceError
+from domain.models.identifier import Identifier
+from domain.models.order import OrderData, PersistedOrder
+from test_domain.dummies import GetOrderByOrderIdDummy, OrderDataByCustomerIdDummy
+from dataclasses import dataclass, field
+from threading import Barrier, Thread
+from typing import Callable
+import asyncio
+import pytest
+import time
+
+
+@dataclass
+class SlowGetOrderDummy(GetOrderByOrderIdDummy):
+    delay_seconds: float = 0.05
+    reads: list[Identifier] = field(default_factory=list)
+    error: Exception | None = None
+
+    def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
+        self.reads.append(order_id)
+        time.sleep(self.delay_seconds)
+        if self.error is not None:
+            raise self.error
+        return super().get_order_by_order_id(order_id=order_id)
+
+
+@dataclass
+class AsyncSlowGetOrderDummy:
+    orders: dict[Identifier, PersistedOrder] = field(default_factory=dict)
+    reads: list[Identifier] = field(default_factory=list)
+
+    async def get_order_by_order_id(
+        self, order_id: Identifier
+    ) -> PersistedOrder | None:
+        self.reads.append(order_id)
+        await asyncio.sleep(0.02)
+        return self.orders.get(order_id)
+
+
+def run_concurrently(call: Callable[[], object], threads: int) -> list[object]:
+    barrier = Barrier(threads)
+    results: list[object] = []
+
+    def run() -> None:
+        barrier.wait()
+        try:
+            results.append(call())
+        except Exception as error:
+            results.append(error)
+
+    workers = [Thread(target=run) for _ in range(0, threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def test_concurrent_reads_share_one_call(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    get_order_dummy = SlowGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    reader = CoalescingOrderReader(get_order_by_order_id_spi=get_order_dummy)
+
+    # Run:
+    results = run_concurrently(
+        lambda: reader.get_order_by_order_id(order_id=persisted_order.id), threads=8
+    )
+
+    # Assert:
+    assert results == [persisted_order] * 8
+    assert get_order_dummy.reads == [persisted_order.id]
+    assert reader.stats.collapse_ratio == 7 / 8
+
+
+def test_sequential_reads_are_not_shared(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    get_order_dummy = SlowGetOrderDummy(delay_seconds=0)
+    reader = CoalescingOrderReader(get_order_by_order_id_spi=get_order_dummy)
+
+    # Run:
+    for _ in range(0, 2):
+        reader.get_order_by_order_id(order_id=persisted_order.id)
+
+    # Assert:
+    assert len(get_order_dummy.reads) == 2
+    assert reader.stats.collapse_ratio == 0
+
+
+def test_error_is_shared(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    get_order_dummy = SlowGetOrderDummy(error=ReadFromPersistenceError())
+    reader = CoalescingOrderReader(get_order_by_order_id_spi=get_order_dummy)
+
+    # Run:
+    results = run_concurrently(
+        lambda: reader.get_order_by_order_id(order_id=persisted_order.id), threads=4
+    )
+
+    # Assert:
+    assert all(isinstance(result, ReadFromPersistenceError) for result in results)
+    assert len(get_order_dummy.reads) == 1
+    # Waiters raise their own copy, chained from the error of the call.
+    assert len({id(result) for result in results}) == 4
+    assert sum(
+        isinstance(result, Exception) and result.__cause__ is None
+        for result in results
+    ) == 1
+
+
+def test_waiter_retries_interrupted_call(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    class Interrupt(BaseException):
+        pass
+
+    @dataclass
+    class InterruptedGetOrderDummy(SlowGetOrderDummy):
+        def get_order_by_order_id(
+            self, order_id: Identifier
+        ) -> PersistedOrder | None:
+            order = super().get_order_by_order_id(order_id=order_id)
+            if len(self.reads) == 1:
+                raise Interrupt
+            return order
+
+    get_order_dummy = InterruptedGetOrderDummy()
+    get_order_dummy.add(persisted_order)
+    reader = CoalescingOrderReader(get_order_by_order_id_spi=get_order_dummy)
+    results: list[object] = []
+
+    def read() -> None:
+        try:
+            results.append(reader.get_order_by_order_id(order_id=persisted_order.id))
+        except Interrupt as interrupt:
+            results.append(interrupt)
+
+    # Run:
+    leader = Thread(target=read)
+    leader.start()
+    while get_order_dummy.reads == []:
+        time.sleep(0.001)
+    waiter = Thread(target=read)
+    waiter.start()
+    leader.join()
+    waiter.join()
+
+    # Assert:
+    assert isinstance(results[0], Interrupt)
+    assert results[1] == persisted_order
+    assert len(get_order_dummy.reads) == 2
+
+
+def test_waiters_time_out(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    get_order_dummy = SlowGetOrderDummy(delay_seconds=0.2)
+    get_order_dummy.add(persisted_order)
+    reader = CoalescingOrderReader(
+        get_order_by_order_id_spi=get_order_dummy, timeout_seconds=0.01
+    )
+
+    # Run:
+    results = run_concurrently(
+        lambda: reader.get_order_by_order_id(order_id=persisted_order.id), threads=2
+    )
+
+    # Assert:
+    assert persisted_order in results
+    assert any(isinstance(result, ReadFromPersistenceError) for result in results)
+    assert reader.stats.timeouts == 1
+
+
+def test_timeout_is_counted_from_start_of_call(
+    persisted_order: PersistedOrder,
+) -> None:
+    # Setup:
+    get_order_dummy = SlowGetOrderDummy(delay_seconds=0.5)
+    get_order_dummy.add(persisted_order)
+    reader = CoalescingOrderReader(
+        get_order_by_order_id_spi=get_order_dummy, timeout_seconds=0.2
+    )
+    leader = Thread(
+        target=reader.get_order_by_order_id, kwargs={"order_id": persisted_order.id}
+    )
+    leader.start()
+    time.sleep(0.15)
+
+    # Run:
+    start = time.monotonic()
+    with pytest.raises(ReadFromPersistenceError):
+        reader.get_order_by_order_id(order_id=persisted_order.id)
+    waited = time.monotonic() - start
+    leader.join()
+
+    # Assert:
+    assert waited < 0.15
+
+
+def test_customer_reads_get_own_lists(order_data: OrderData) -> None:
+    # Setup:
+    reader = CoalescingOrderReader(
+        get_order_data_by_customer_id_spi=OrderDataByCustomerIdDummy(
+            order_data_list=[order_data]
+        )
+    )
+
+    # Run:
+    first = reader.get_order_data_by_customer_id(customer_id=order_data.customer_id)
+    first.clear()
+
+    # Assert:
+    assert reader.get_order_data_by_customer_id(
+        customer_id=order_data.customer_id
+    ) == [order_data]
+    with pytest.raises(TypeError):
+        reader.get_order_by_order_id(order_id=order_data.id)
+
+
+def test_async_concurrent_reads_share_one_call(
+    persisted_order: PersistedOrder,
+) -> None:
+    # Setup:
+    get_order_dummy = AsyncSlowGetOrderDummy(
+        orders={persisted_order.id: persisted_order}
+    )
+    reader = AsyncCoalescingOrderReader(get_order_by_order_id_spi=get_order_dummy)
+
+    async def read_concurrently() -> list[PersistedOrder | None]:
+        return list(
+            await asyncio.gather(
+                *(
+                    reader.get_order_by_order_id(order_id=persisted_order.id)
+                    for _ in range(0, 5)
+                )
+            )
+        )
+
+    # Run:
+    results = asyncio.run(read_concurrently())
+
+    # Assert:
+    assert results == [persisted_order] * 5
+    assert get_order_dummy.reads == [persisted_order.id]
+    assert reader.stats.collapse_ratio == 4 / 5
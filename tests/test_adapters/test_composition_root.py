@@ -0,0 +1,107 @@
+from adapters.composition_root import Container, Settings
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from domain.models.identifier import Identifier
+from domain.models.order import Address, Item, RequestedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from test_domain.dummies import GetProductVersionIdsDummy
+from threading import Barrier, Thread
+from typing import Callable
+import time
+
+
+def test_builds_only_what_is_requested() -> None:
+    # Setup:
+    created: list[str] = []
+
+    def product_catalogue() -> GetProductVersionIdsDummy:
+        created.append("product_catalogue")
+        return GetProductVersionIdsDummy()
+
+    def event_sink() -> InMemoryEventSink:
+        created.append("event_sink")
+        return InMemoryEventSink()
+
+    # Run:
+    with Container(
+        product_catalogue=product_catalogue, event_sink=event_sink
+    ) as container:
+        container.order_data_by_order_id_service
+        container.order_data_by_customer_id_service
+
+    # Assert:
+    assert created == []
+
+
+def test_concurrent_first_use_shares_one_instance(
+    id_generator: Callable[[], Identifier]
+) -> None:
+    # Setup:
+    created: list[InMemoryEventSink] = []
+
+    def slow_event_sink() -> InMemoryEventSink:
+        time.sleep(0.01)
+        created.append(InMemoryEventSink())
+        return created[-1]
+
+    container = Container(event_sink=slow_event_sink)
+    barrier = Barrier(8)
+    services = []
+
+    def get_service() -> None:
+        barrier.wait()
+        services.append(container.update_order_status_service)
+
+    # Run:
+    threads = [Thread(target=get_service) for _ in range(0, 8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    container.close()
+
+    # Assert:
+    assert len(created) == 1
+    assert len(set(map(id, services))) == 1
+
+
+def test_wires_write_and_read_paths(
+    product_version_ids: dict[Identifier, Identifier],
+    product_versions: dict[Identifier, ProductVersion],
+    id_generator: Callable[[], Identifier],
+) -> None:
+    # Setup:
+    sink = InMemoryEventSink()
+    container = Container(
+        settings=Settings(order_cache_size=100, compare_and_set=True, metrics=True),
+        product_catalogue=lambda: GetProductVersionIdsDummy(
+            product_version_ids=product_version_ids
+        ),
+        event_sink=lambda: sink,
+    )
+    container.order_store.save_product_versions(product_versions.values())
+    requested_order = RequestedOrder(
+        customer_id=id_generator(),
+        shipping_address=Address(),
+        items=[Item(product_id=id, quantity=1) for id in product_version_ids],
+    )
+
+    # Run:
+    order = container.place_order_service.place_order(requested_order=requested_order)
+    container.update_order_status_service.update_order_status(
+        order_id=order.id, new_status=Status.ACCEPTED_BY_INVENTORY
+    )
+    order_data = container.order_data_by_order_id_service.get_order_by_order_id(
+        order_id=order.id
+    )
+    container.close()
+
+    # Assert:
+    assert order_data.status == Status.ACCEPTED_BY_INVENTORY
+    assert len(sink.events) == 2
+    metrics_registry = container.metrics_registry
+    assert metrics_registry is not None
+    assert (
+        'orders_call_duration_seconds_count{component="PlaceOrderService",'
+        'method="place_order"} 1'
+    ) in metrics_registry.render_prometheus()
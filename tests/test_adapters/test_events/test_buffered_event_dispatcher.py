@@ -0,0 +1,296 @@
+from adapters.events.buffered_event_dispatcher import (
+    BufferedEventDispatcher,
+    Overflow,
+    PartialDispatchError,
+)
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from domain.models.event import DispatchableEvent
+from domain.models.order import PersistedOrder
+from threading import Event, Thread
+import pytest
+import time
+
+
+@pytest.fixture
+def events(persisted_order: PersistedOrder) -> list[DispatchableEvent]:
+    return [
+        DispatchableEvent(
+            order=persisted_order,
+            event_type=DispatchableEvent.EventType.TO_BE_ACCEPTED_BY_INVENTORY,
+        )
+        for _ in range(0, 10)
+    ]
+
+
+class GatedSink(InMemoryEventSink):
+    """
+    Blocks every batch until `gate` is set.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = Event()
+        self.entered = Event()
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        self.entered.set()
+        self.gate.wait()
+        super().dispatch_events(events=events)
+
+
+class FailingSink:
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        raise ConnectionError
+
+
+def test_flushes_full_batches(events: list[DispatchableEvent]) -> None:
+    sink = InMemoryEventSink()
+    with BufferedEventDispatcher(
+        sink=sink, max_batch_size=5, max_delay_seconds=60
+    ) as dispatcher:
+        dispatcher.dispatch_events(events=events)
+        deadline = time.monotonic() + 5
+        while len(sink.events) < 10 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    assert sink.batches == [events[0:5], events[5:10]]
+    assert dispatcher.stats.dispatched == 10
+    assert dispatcher.stats.batches == 2
+
+
+def test_flushes_partial_batch_after_delay(events: list[DispatchableEvent]) -> None:
+    sink = InMemoryEventSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink, max_batch_size=100, max_delay_seconds=0.01
+    )
+
+    for event in events[0:3]:
+        dispatcher.dispatch_event(event=event)
+    deadline = time.monotonic() + 5
+    while sink.events == [] and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    assert sink.batches == [events[0:3]]
+    stats = dispatcher.stats
+    assert stats.queue_depth == 0
+    assert stats.queue_delay_seconds_max >= 0.01
+    dispatcher.close()
+
+
+def test_close_drains_buffer(events: list[DispatchableEvent]) -> None:
+    sink = InMemoryEventSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink, max_batch_size=4, max_delay_seconds=60
+    )
+    dispatcher.dispatch_events(events=events)
+
+    dispatcher.close()
+
+    assert sink.events == events
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch_event(event=events[0])
+
+
+def test_sheds_when_full(events: list[DispatchableEvent]) -> None:
+    # Setup:
+    sink = GatedSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink,
+        max_batch_size=1,
+        max_delay_seconds=0,
+        max_queue_size=2,
+        overflow=Overflow.SHED,
+    )
+    dispatcher.dispatch_event(event=events[0])
+    sink.entered.wait(timeout=5)
+
+    # Run:
+    # The worker holds the first event, so two more fill the buffer.
+    dispatcher.dispatch_events(events=events[1:5])
+
+    # Assert:
+    assert dispatcher.stats.shed == 2
+    assert dispatcher.stats.queue_depth == 2
+    sink.gate.set()
+    dispatcher.close()
+    assert sink.events == events[0:3]
+
+
+def test_blocks_when_full(events: list[DispatchableEvent]) -> None:
+    # Setup:
+    sink = GatedSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink, max_batch_size=1, max_delay_seconds=0, max_queue_size=1
+    )
+    dispatcher.dispatch_event(event=events[0])
+    sink.entered.wait(timeout=5)
+    dispatcher.dispatch_event(event=events[1])
+
+    # Run:
+    producer = Thread(target=dispatcher.dispatch_event, args=(events[2],))
+    producer.start()
+    producer.join(timeout=0.05)
+
+    # Assert:
+    assert producer.is_alive()
+    sink.gate.set()
+    producer.join(timeout=5)
+    assert not producer.is_alive()
+    dispatcher.close()
+    assert sink.events == events[0:3]
+    assert dispatcher.stats.shed == 0
+
+
+def test_block_timeout_sheds(events: list[DispatchableEvent]) -> None:
+    sink = GatedSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink,
+        max_batch_size=1,
+        max_delay_seconds=0,
+        max_queue_size=1,
+        block_timeout_seconds=0.01,
+    )
+    dispatcher.dispatch_event(event=events[0])
+    sink.entered.wait(timeout=5)
+
+    dispatcher.dispatch_events(events=events[1:3])
+
+    assert dispatcher.stats.shed == 1
+    sink.gate.set()
+    dispatcher.close()
+
+
+def test_counts_and_reports_failed_batches(events: list[DispatchableEvent]) -> None:
+    errors: list[tuple[list[DispatchableEvent], Exception]] = []
+    dispatcher = BufferedEventDispatcher(
+        sink=FailingSink(),
+        max_batch_size=5,
+        max_delay_seconds=60,
+        on_error=lambda events, error: errors.append((events, error)),
+    )
+
+    dispatcher.dispatch_events(events=events)
+    dispatcher.close()
+
+    assert dispatcher.stats.failed == 10
+    assert dispatcher.stats.dispatched == 0
+    assert [failed_events for failed_events, _ in errors] == [
+        events[0:5],
+        events[5:10],
+    ]
+    assert all(isinstance(error, ConnectionError) for _, error in errors)
+
+
+def test_reports_only_unpublished_events_of_partial_failures(
+    events: list[DispatchableEvent],
+) -> None:
+    # Setup:
+    class PartialSink(InMemoryEventSink):
+        def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+            super().dispatch_events(events=events[0:2])
+            raise PartialDispatchError(published=2, error=ConnectionError())
+
+    sink = PartialSink()
+    errors: list[tuple[list[DispatchableEvent], Exception]] = []
+    dispatcher = BufferedEventDispatcher(
+        sink=sink,
+        max_batch_size=10,
+        max_delay_seconds=60,
+        on_error=lambda events, error: errors.append((events, error)),
+        max_retries=1,
+        retry_backoff_seconds=0,
+    )
+
+    # Run:
+    dispatcher.dispatch_events(events=events)
+    dispatcher.close()
+
+    # Assert:
+    assert sink.batches == [events[0:2], events[2:4]]
+    assert len(errors) == 1
+    assert errors[0][0] == events[4:10]
+    assert isinstance(errors[0][1], ConnectionError)
+    assert (dispatcher.stats.dispatched, dispatcher.stats.failed) == (4, 6)
+
+
+def test_keeps_flushing_when_on_error_raises(
+    events: list[DispatchableEvent],
+) -> None:
+    reported: list[list[DispatchableEvent]] = []
+
+    def on_error(events: list[DispatchableEvent], error: Exception) -> None:
+        reported.append(events)
+        raise ValueError
+
+    dispatcher = BufferedEventDispatcher(
+        sink=FailingSink(), max_batch_size=5, max_delay_seconds=60, on_error=on_error
+    )
+
+    dispatcher.dispatch_events(events=events)
+    dispatcher.close()
+
+    assert reported == [events[0:5], events[5:10]]
+    assert dispatcher.stats.failed == 10
+    assert dispatcher.stats.on_error_failures == 2
+
+
+def test_close_tells_whether_the_buffer_was_drained(
+    events: list[DispatchableEvent],
+) -> None:
+    # Setup:
+    sink = GatedSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink, max_batch_size=1, max_delay_seconds=0
+    )
+    dispatcher.dispatch_events(events=events)
+    sink.entered.wait(timeout=5)
+
+    # Run:
+    drained_in_time = dispatcher.close(timeout_seconds=0.01)
+    sink.gate.set()
+    drained = dispatcher.close(timeout_seconds=5)
+
+    # Assert:
+    assert not drained_in_time
+    assert drained
+    assert sink.events == events
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_raises_instead_of_blocking_after_worker_failure(
+    events: list[DispatchableEvent],
+) -> None:
+    # Setup:
+    class StoppingSink(GatedSink):
+        def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+            self.entered.set()
+            self.gate.wait()
+            raise SystemExit
+
+    sink = StoppingSink()
+    dispatcher = BufferedEventDispatcher(
+        sink=sink, max_batch_size=1, max_delay_seconds=0, max_queue_size=1
+    )
+    dispatcher.dispatch_event(event=events[0])
+    sink.entered.wait(timeout=5)
+    dispatcher.dispatch_event(event=events[1])
+    errors: list[Exception] = []
+
+    def produce() -> None:
+        try:
+            dispatcher.dispatch_event(event=events[2])
+        except RuntimeError as error:
+            errors.append(error)
+
+    producer = Thread(target=produce)
+    producer.start()
+
+    # Run:
+    sink.gate.set()
+    producer.join(timeout=5)
+
+    # Assert:
+    assert not producer.is_alive()
+    assert len(errors) == 1
+    with pytest.raises(RuntimeError):
+        dispatcher.close(timeout_seconds=5)
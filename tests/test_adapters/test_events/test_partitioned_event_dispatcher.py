@@ -0,0 +1,260 @@
+from adapters.events.in_memory_event_sink import InMemoryEventSink
+from adapters.events.partitioned_event_dispatcher import PartitionedEventDispatcher
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier, SnowflakeId
+from domain.models.order import PersistedOrder
+from domain.models.order_status import Status
+from dataclasses import replace
+from threading import Event, Lock
+from typing import Callable
+import pytest
+import random
+import time
+
+T = DispatchableEvent.EventType
+LIFECYCLE = [
+    (Status.PENDING, T.TO_BE_ACCEPTED_BY_INVENTORY),
+    (Status.ACCEPTED_BY_INVENTORY, T.TO_BE_PAID),
+    (Status.PAID, T.TO_BE_SHIPPED),
+    (Status.SHIPPED, T.SHIPPED),
+]
+
+
+class SlowSink:
+    """
+    Publishes event by event with a random delay
+    and records the highest number of concurrent publishes.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[DispatchableEvent] = []
+        self.max_concurrency = 0
+        self._concurrency = 0
+        self._lock = Lock()
+
+    def dispatch_event(self, event: DispatchableEvent) -> None:
+        with self._lock:
+            self._concurrency += 1
+            self.max_concurrency = max(self.max_concurrency, self._concurrency)
+        time.sleep(random.uniform(0, 0.002))
+        with self._lock:
+            self._concurrency -= 1
+            self.events.append(event)
+
+
+class FlakySink:
+    """
+    Publishes event by event and raises on `failing_event`
+    for its first `failures` attempts.
+    """
+
+    def __init__(self, failing_event: DispatchableEvent, failures: int) -> None:
+        self.events: list[DispatchableEvent] = []
+        self.failing_event = failing_event
+        self.failures = failures
+        self._lock = Lock()
+
+    def dispatch_event(self, event: DispatchableEvent) -> None:
+        with self._lock:
+            if event is self.failing_event and self.failures > 0:
+                self.failures -= 1
+                raise ConnectionError
+            self.events.append(event)
+
+
+def lifecycle_events(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> list[DispatchableEvent]:
+    """
+    Returns the events of 20 orders, interleaved by order.
+    """
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(0, 20)]
+    return [
+        DispatchableEvent(order=order.update_status(new_status=status), event_type=type)
+        for status, type in LIFECYCLE
+        for order in orders
+    ]
+
+
+def test_keeps_order_of_events_per_order(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> None:
+    # Setup:
+    sink = SlowSink()
+    events = lifecycle_events(persisted_order, id_generator)
+
+    # Run:
+    with PartitionedEventDispatcher(
+        sink=sink, partitions=4, max_batch_size=3, max_delay_seconds=0.001
+    ) as dispatcher:
+        for event in events:
+            dispatcher.dispatch_event(event=event)
+
+    # Assert:
+    assert len(sink.events) == len(events)
+    for order_id in {event.order.id for event in events}:
+        assert [
+            event.event_type for event in sink.events if event.order.id == order_id
+        ] == [type for _, type in LIFECYCLE]
+    assert sink.max_concurrency > 1
+
+
+def test_dispatch_events_keeps_order_per_order(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> None:
+    batch_sink = InMemoryEventSink()
+    events = lifecycle_events(persisted_order, id_generator)
+
+    with PartitionedEventDispatcher(
+        sink=InMemoryEventSink(), batch_sink=batch_sink, partitions=3
+    ) as dispatcher:
+        dispatcher.dispatch_events(events=events)
+
+    published = batch_sink.events
+    assert sorted(map(id, published)) == sorted(map(id, events))
+    for order_id in {event.order.id for event in events}:
+        assert [event for event in published if event.order.id == order_id] == [
+            event for event in events if event.order.id == order_id
+        ]
+
+
+def test_spreads_sparse_snowflake_ids(persisted_order: PersistedOrder) -> None:
+    # Ids generated one per millisecond all have a zero sequence.
+    orders = [
+        replace(persisted_order, id=SnowflakeId(value=ms << 22)) for ms in range(0, 64)
+    ]
+    sink = InMemoryEventSink()
+    dispatcher = PartitionedEventDispatcher(sink=sink, partitions=4)
+
+    dispatcher.dispatch_events(
+        events=[
+            DispatchableEvent(order=order, event_type=T.TO_BE_PAID) for order in orders
+        ]
+    )
+    dispatcher.close()
+
+    assert all(partition.dispatched >= 8 for partition in dispatcher.stats)
+
+
+def test_reports_depth_and_lag_per_partition(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> None:
+    # Setup:
+    gate = Event()
+
+    class GatedSink:
+        def dispatch_event(self, event: DispatchableEvent) -> None:
+            gate.wait()
+
+    dispatcher = PartitionedEventDispatcher(
+        sink=GatedSink(), partitions=2, max_batch_size=1, max_delay_seconds=0
+    )
+    events = lifecycle_events(persisted_order, id_generator)
+
+    # Run:
+    dispatcher.dispatch_events(events=events)
+    time.sleep(0.01)
+    stats = dispatcher.stats
+
+    # Assert:
+    assert len(stats) == 2
+    # Each partition holds one event in flight and buffers the rest.
+    assert sum(partition.queue_depth for partition in stats) == len(events) - 2
+    assert all(partition.lag_seconds >= 0.01 for partition in stats)
+    gate.set()
+    dispatcher.close()
+    assert all(partition.lag_seconds == 0 for partition in dispatcher.stats)
+    assert sum(partition.dispatched for partition in dispatcher.stats) == len(events)
+
+
+def test_retries_only_unpublished_events(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> None:
+    # Setup:
+    events = lifecycle_events(persisted_order, id_generator)
+    sink = FlakySink(failing_event=events[30], failures=2)
+
+    # Run:
+    with PartitionedEventDispatcher(
+        sink=sink, partitions=2, max_batch_size=10, retry_backoff_seconds=0.001
+    ) as dispatcher:
+        dispatcher.dispatch_events(events=events)
+
+    # Assert:
+    assert sorted(map(id, sink.events)) == sorted(map(id, events))
+    for order_id in {event.order.id for event in events}:
+        assert [event for event in sink.events if event.order.id == order_id] == [
+            event for event in events if event.order.id == order_id
+        ]
+    assert sum(partition.failed for partition in dispatcher.stats) == 0
+
+
+def test_holds_back_later_events_of_a_failed_order(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> None:
+    """
+    Assert that once an event fails for good, no later event of its order
+    is published, and the unpublished events are reported in order.
+    """
+
+    # Setup:
+    events = lifecycle_events(persisted_order, id_generator)
+    failing_event = events[25]
+    sink = FlakySink(failing_event=failing_event, failures=10)
+    errors: list[tuple[list[DispatchableEvent], Exception]] = []
+    dispatcher = PartitionedEventDispatcher(
+        sink=sink,
+        partitions=2,
+        max_batch_size=5,
+        max_delay_seconds=0.001,
+        max_retries=1,
+        retry_backoff_seconds=0.001,
+        on_error=lambda events, error: errors.append((events, error)),
+    )
+
+    # Run:
+    dispatcher.dispatch_events(events=events)
+    with pytest.raises(RuntimeError):
+        dispatcher.close(timeout_seconds=5)
+
+    # Assert:
+    order_events = [
+        event for event in events if event.order.id == failing_event.order.id
+    ]
+    published = [
+        event for event in sink.events if event.order.id == failing_event.order.id
+    ]
+    assert published == order_events[0:order_events.index(failing_event)]
+    assert len(errors) == 1
+    failed_events, error = errors[0]
+    assert failed_events[0] is failing_event
+    assert isinstance(error, ConnectionError)
+    assert len(sink.events) + len(failed_events) == len(events)
+    stats = dispatcher.stats
+    assert sum(partition.failed for partition in stats) == len(failed_events)
+    assert sorted(partition.failed == 0 for partition in stats) == [False, True]
+    with pytest.raises(RuntimeError):
+        dispatcher.dispatch_event(event=failing_event)
+
+
+def test_close_stops_every_partition(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> None:
+    # Setup:
+    events = lifecycle_events(persisted_order, id_generator)
+    sink = FlakySink(failing_event=events[0], failures=10)
+    dispatcher = PartitionedEventDispatcher(
+        sink=sink, partitions=4, max_delay_seconds=60, max_retries=0
+    )
+    dispatcher.dispatch_events(events=events)
+
+    # Run:
+    with pytest.raises(RuntimeError):
+        dispatcher.close(timeout_seconds=5)
+
+    # Assert:
+    # Every partition was drained, including those after the failed one.
+    stats = dispatcher.stats
+    assert sum(partition.dispatched + partition.failed for partition in stats) == (
+        len(events)
+    )
@@ -0,0 +1,139 @@
+from adapters.events.wire_codec import (
+    EventBatchView,
+    WireFormatError,
+    decode_event,
+    decode_order,
+    encode_batch,
+    encode_event,
+    encode_order,
+)
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier
+from domain.models.order import PersistedOrder
+from domain.models.order_status import Status
+from dataclasses import replace
+from typing import Callable
+from uuid import uuid4
+import pytest
+
+
+@pytest.fixture
+def events(
+    persisted_order: PersistedOrder, id_generator: Callable[[], Identifier]
+) -> list[DispatchableEvent]:
+    return [
+        DispatchableEvent(
+            order=replace(
+                persisted_order,
+                id=id_generator(),
+                items=persisted_order.items[:count],
+                status=status,
+            ),
+            event_type=event_type,
+        )
+        for count, (status, event_type) in enumerate(
+            [
+                (
+                    Status.PENDING,
+                    DispatchableEvent.EventType.TO_BE_ACCEPTED_BY_INVENTORY,
+                ),
+                (Status.PAID, DispatchableEvent.EventType.TO_BE_SHIPPED),
+                (Status.CANCELLED, DispatchableEvent.EventType.CANCELLED),
+            ]
+        )
+    ]
+
+
+@pytest.mark.parametrize("status", list(Status))
+def test_order_round_trip(persisted_order: PersistedOrder, status: Status) -> None:
+    order = persisted_order.update_status(new_status=status)
+
+    assert decode_order(encode_order(order)) == order
+
+
+def test_event_round_trip(events: list[DispatchableEvent]) -> None:
+    for event in events:
+        assert decode_event(encode_event(event)) == event
+
+
+def test_batch_decodes_lazily(events: list[DispatchableEvent]) -> None:
+    frame = bytearray(encode_batch(events))
+
+    view = EventBatchView(frame)
+
+    assert len(view) == 3
+    assert view[2] == events[2]
+    assert view[1:] == events[1:]
+    assert list(view) == events
+    assert [view.order_id(index) for index in range(0, 3)] == [
+        event.order.id for event in events
+    ]
+    assert view.event_type(1) == DispatchableEvent.EventType.TO_BE_SHIPPED
+    # Ids repeated within the batch are decoded to one instance.
+    assert view[1].order.customer_id is view[2].order.customer_id
+
+
+def test_empty_batch() -> None:
+    assert list(EventBatchView(encode_batch([]))) == []
+
+
+def test_record_is_compact(events: list[DispatchableEvent]) -> None:
+    # Header of 23 bytes plus 20 bytes per item.
+    assert len(encode_event(events[2])) == 23 + 2 * 20
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda record: record[:-1],
+        lambda record: b"\x02" + record[1:],
+        lambda record: record[:1] + b"\xff" + record[2:],
+        # An item count far beyond the record.
+        lambda record: record[:19] + b"\xff\xff\xff\xff" + record[23:],
+    ],
+)
+def test_rejects_malformed_records(
+    events: list[DispatchableEvent], corrupt: Callable[[bytes], bytes]
+) -> None:
+    with pytest.raises(WireFormatError):
+        decode_event(corrupt(encode_event(events[2])))
+
+
+def test_rejects_malformed_batches(events: list[DispatchableEvent]) -> None:
+    frame = encode_batch(events)
+
+    with pytest.raises(WireFormatError):
+        EventBatchView(b"XXXX" + frame[4:])
+    with pytest.raises(WireFormatError):
+        EventBatchView(frame[:10])
+    with pytest.raises(WireFormatError):
+        EventBatchView(frame[:5] + b"\xff\xff\xff\xff" + frame[9:])
+
+
+def test_rejects_unknown_event_type_in_header(
+    events: list[DispatchableEvent],
+) -> None:
+    frame = bytearray(encode_batch(events))
+    first_record = 9 + 3 * 4
+    frame[first_record + 1] = 0xFF
+
+    with pytest.raises(WireFormatError):
+        EventBatchView(frame).event_type(0)
+
+
+def test_rejects_quantities_out_of_range(persisted_order: PersistedOrder) -> None:
+    item = replace(persisted_order.items[0], quantity=-1)
+
+    with pytest.raises(WireFormatError):
+        encode_order(replace(persisted_order, items=[item]))
+
+
+def test_requires_snowflake_ids(persisted_order: PersistedOrder) -> None:
+    class UUIDIdentifier(Identifier):
+        __slots__ = ("value",)
+
+        def __init__(self) -> None:
+            self.value = uuid4()
+
+    with pytest.raises(TypeError):
+        encode_order(replace(persisted_order, id=UUIDIdentifier()))
@@ -0,0 +1,141 @@
+from adapters.composition_root import Settings
+from adapters.ingestion.status_feed import ingest_status_feed
+from adapters.persistence.sqlite_order_store import SqliteOrderStore
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier
+from domain.models.order import VersionedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from domain.models.status_transition_validator import ExpectednessSetting
+from functools import partial
+from pathlib import Path
+import json
+import pytest
+
+T = DispatchableEvent.EventType
+
+
+class JsonLinesEventSink:
+    """
+    Appends the order id and event type of each event to a file shared
+    by the worker processes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        with open(self._path, "a") as file:
+            file.write(
+                "".join(
+                    json.dumps([event.order.id.value, event.event_type.name]) + "\n"
+                    for event in events
+                )
+            )
+
+
+def test_ingest_status_feed(
+    tmp_path: Path,
+    product_versions: dict[Identifier, ProductVersion],
+    versioned_order: VersionedOrder,
+) -> None:
+    # Setup:
+    path = str(tmp_path / "orders.sqlite3")
+    events_path = str(tmp_path / "events.jsonl")
+    store = SqliteOrderStore(path=path)
+    store.save_product_versions(product_versions.values())
+    shipped, cancelled, untouched = store.save_orders(
+        versioned_orders=[versioned_order] * 3
+    )
+    updates = [
+        (shipped.id.value, "ACCEPTED_BY_INVENTORY"),
+        (cancelled.id.value, "CANCELLED"),
+        (shipped.id.value, "PAID"),
+        (untouched.id.value, "PENDING"),
+        (shipped.id.value, "SHIPPED"),
+        (cancelled.id.value, "PAID"),
+        (1, "PAID"),
+    ]
+    lines = [
+        json.dumps({"order_id": str(order_id), "status": status})
+        for order_id, status in updates
+    ]
+    lines += [
+        json.dumps({"order_id": "not-an-id", "status": "PAID"}),
+        json.dumps({"order_id": "²", "status": "PAID"}),
+        json.dumps({"order_id": 1.0, "status": "PAID"}),
+        json.dumps({"order_id": -1, "status": "PAID"}),
+        json.dumps({"order_id": 1, "status": "LOST"}),
+        "{",
+        "",
+    ]
+
+    # Run:
+    report = ingest_status_feed(
+        lines,
+        settings=Settings(backend="sqlite", sqlite_path=path),
+        event_sink=partial(JsonLinesEventSink, path=events_path),
+        workers=2,
+        setting=ExpectednessSetting.ALLOW_UNEXPECTED,
+        batch_size=2,
+    )
+
+    # Assert:
+    assert (report.records, report.updated, report.rejected) == (13, 4, 2)
+    assert (report.invalid_ids, report.malformed, report.failed) == (2, 5, 0)
+    assert report.records_per_second > 0
+    assert store.get_order_by_order_id(order_id=shipped.id).status == Status.SHIPPED
+    assert (
+        store.get_order_by_order_id(order_id=cancelled.id).status == Status.CANCELLED
+    )
+    assert store.get_order_by_order_id(order_id=untouched.id).status == Status.PENDING
+    store.close()
+    with open(events_path) as file:
+        events = [json.loads(line) for line in file]
+    assert [event_type for id, event_type in events if id == shipped.id.value] == [
+        T.TO_BE_PAID.name,
+        T.TO_BE_SHIPPED.name,
+        T.SHIPPED.name,
+    ]
+    assert [event_type for id, event_type in events if id == cancelled.id.value] == [
+        T.CANCELLED.name
+    ]
+    assert len(events) == 4
+
+
+def test_ingest_status_feed_raises_when_a_worker_fails(tmp_path: Path) -> None:
+    # Setup:
+    # Workers cannot open the store.
+    settings = Settings(
+        backend="sqlite", sqlite_path=str(tmp_path / "missing" / "orders.sqlite3")
+    )
+    lines = [
+        json.dumps({"order_id": order_id, "status": "PAID"})
+        for order_id in range(0, 100)
+    ]
+
+    # Run:
+    with pytest.raises(RuntimeError) as error_info:
+        ingest_status_feed(
+            lines,
+            settings=settings,
+            event_sink=partial(
+                JsonLinesEventSink, path=str(tmp_path / "events.jsonl")
+            ),
+            workers=2,
+            batch_size=1,
+        )
+
+    # Assert:
+    assert error_info.value.__cause__ is not None
+
+
+def test_ingest_status_feed_needs_a_shared_store(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ingest_status_feed(
+            [],
+            settings=Settings(backend="memory"),
+            event_sink=partial(
+                JsonLinesEventSink, path=str(tmp_path / "events.jsonl")
+            ),
+        )
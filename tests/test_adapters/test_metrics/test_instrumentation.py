@@ -0,0 +1,109 @@
+from adapters.metrics.instrumentation import (
+    instrument,
+    instrument_transition_validator,
+)
+from adapters.metrics.registry import MetricsRegistry
+from adapters.persistence.in_memory_order_store import InMemoryOrderStore
+from domain.errors import InsufficientExpectednessError, InvalidOrderIdError
+from domain.models.identifier import Identifier
+from domain.models.order import PersistedOrder
+from domain.models.order_status import Status
+from domain.models.status_transition_validator import ExpectednessSetting
+from domain.services.update_order_status_service import (
+    AsyncUpdateOrderStatusService,
+    UpdateOrderStatusService,
+)
+from test_domain.dummies import AsyncDummy, EventDispatcherDummy
+from typing import Callable
+import asyncio
+import pytest
+
+
+def test_disabled_returns_target() -> None:
+    store = InMemoryOrderStore()
+
+    assert instrument(store, component="store", registry=None) is store
+
+
+def test_records_calls_errors_and_transitions(
+    id_generator: Callable[[], Identifier], persisted_order: PersistedOrder
+) -> None:
+    # Setup:
+    registry = MetricsRegistry()
+    store = instrument(InMemoryOrderStore(), component="store", registry=registry)
+    store.insert_orders(persisted_orders=[persisted_order])
+    service = instrument(
+        UpdateOrderStatusService(
+            update_order_spi=store,
+            get_order_by_order_id_spi=store,
+            status_update_event_dispatcher_spi=EventDispatcherDummy(),
+            _transition_validator=instrument_transition_validator(registry),
+        ),
+        component="update_order_status_service",
+        registry=registry,
+    )
+
+    # Run:
+    service.update_order_status(
+        order_id=persisted_order.id, new_status=Status.ACCEPTED_BY_INVENTORY
+    )
+    with pytest.raises(InsufficientExpectednessError):
+        service.update_order_status(
+            order_id=persisted_order.id, new_status=Status.DELIVERED
+        )
+    with pytest.raises(InvalidOrderIdError):
+        service.update_order_status(order_id=id_generator(), new_status=Status.PAID)
+    text = registry.render_prometheus()
+
+    # Assert:
+    assert (
+        'orders_call_duration_seconds_count{component="store",'
+        'method="get_order_by_order_id"} 3'
+    ) in text
+    assert (
+        'orders_call_duration_seconds_count{component="store",'
+        'method="update_order_status"} 1'
+    ) in text
+    assert (
+        'orders_call_errors_total{component="update_order_status_service",'
+        'error="InsufficientExpectednessError",method="update_order_status"} 1'
+    ) in text
+    assert (
+        'orders_status_transitions_total{from_status="ACCEPTED_BY_INVENTORY",'
+        'outcome="rejected",setting="REQUIRE_NEXT_UP",to_status="DELIVERED"} 1'
+    ) in text
+    assert (
+        'orders_status_transitions_total{from_status="PENDING",'
+        'outcome="accepted",setting="REQUIRE_NEXT_UP",'
+        'to_status="ACCEPTED_BY_INVENTORY"} 1'
+    ) in text
+
+
+def test_times_coroutines(persisted_order: PersistedOrder) -> None:
+    # Setup:
+    registry = MetricsRegistry()
+    store = InMemoryOrderStore()
+    store.insert_orders(persisted_orders=[persisted_order])
+    async_store = instrument(
+        AsyncDummy(store), component="async_store", registry=registry
+    )
+    service = AsyncUpdateOrderStatusService(
+        update_order_spi=async_store,
+        get_order_by_order_id_spi=async_store,
+        status_update_event_dispatcher_spi=AsyncDummy(EventDispatcherDummy()),
+    )
+
+    # Run:
+    asyncio.run(
+        service.update_order_status(
+            order_id=persisted_order.id,
+            new_status=Status.PAID,
+            setting=ExpectednessSetting.REQUIRE_FORSEEN,
+        )
+    )
+
+    # Assert:
+    assert (
+        'orders_call_duration_seconds_count{component="async_store",'
+        'method="update_order_status"} 1'
+    ) in registry.render_prometheus()
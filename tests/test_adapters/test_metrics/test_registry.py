@@ -0,0 +1,65 @@
+from adapters.metrics.registry import MetricsRegistry, start_http_server
+from urllib.request import urlopen
+import pytest
+
+
+def test_render_counter_and_histogram() -> None:
+    # Setup:
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", help="Events.", kind='a"b')
+    histogram = registry.histogram(
+        "call_seconds", help="Calls.", buckets=(0.1, 1.0), method="get"
+    )
+
+    # Run:
+    counter.increment()
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    text = registry.render_prometheus()
+
+    # Assert:
+    assert text == "\n".join(
+        [
+            "# HELP orders_events_total Events.",
+            "# TYPE orders_events_total counter",
+            'orders_events_total{kind="a\\"b"} 1',
+            "# HELP orders_call_seconds Calls.",
+            "# TYPE orders_call_seconds histogram",
+            'orders_call_seconds_bucket{method="get",le="0.1"} 1',
+            'orders_call_seconds_bucket{method="get",le="1.0"} 2',
+            'orders_call_seconds_bucket{method="get",le="+Inf"} 3',
+            'orders_call_seconds_sum{method="get"} 5.55',
+            'orders_call_seconds_count{method="get"} 3',
+            "",
+        ]
+    )
+
+
+def test_same_labels_share_metric() -> None:
+    registry = MetricsRegistry()
+
+    assert registry.counter("a", help="A.", x="1") is registry.counter(
+        "a", help="A.", x="1"
+    )
+    assert registry.counter("a", help="A.", x="1") is not registry.counter(
+        "a", help="A.", x="2"
+    )
+    with pytest.raises(ValueError):
+        registry.histogram("a", help="A.")
+
+
+def test_http_server() -> None:
+    # Setup:
+    registry = MetricsRegistry()
+    registry.counter("events_total", help="Events.").increment()
+    server = start_http_server(registry, port=0, address="127.0.0.1")
+
+    # Run:
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+
+    # Assert:
+    assert "orders_events_total 1\n" in body
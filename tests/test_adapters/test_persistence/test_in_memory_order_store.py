@@ -0,0 +1,319 @@
+from adapters.persistence.in_memory_order_store import InMemoryOrderStore
+from domain.errors import (
+    DomainError,
+    InsufficientExpectednessError,
+    ReadFromPersistenceError,
+    SaveOrderError,
+    UpdateOrderError,
+)
+from domain.models.identifier import Identifier, SnowflakeId
+from domain.models.order import OrderData, PersistedOrder, VersionedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from domain.models.status_transition_validator import ExpectednessSetting
+from domain.services.update_order_status_service import UpdateOrderStatusService
+from test_domain.dummies import EventDispatcherDummy
+from dataclasses import replace
+from threading import Thread
+from typing import Callable
+import pytest
+
+
+@pytest.fixture
+def store(product_versions: dict[Identifier, ProductVersion]) -> InMemoryOrderStore:
+    store = InMemoryOrderStore()
+    store.save_product_versions(product_versions.values())
+    return store
+
+
+def test_save_and_get(
+    store: InMemoryOrderStore, versioned_order: VersionedOrder
+) -> None:
+    persisted_order = store.save_order(versioned_order=versioned_order)
+
+    assert persisted_order.items == versioned_order.items
+    assert persisted_order.status == Status.PENDING
+    assert store.get_order_by_order_id(order_id=persisted_order.id) == persisted_order
+    assert store.get_orders_by_customer_id(
+        customer_id=versioned_order.customer_id
+    ) == [persisted_order]
+    assert store.get_orders_by_status(status=Status.PENDING) == [persisted_order]
+
+
+def test_save_orders_assigns_unique_ids(
+    store: InMemoryOrderStore, versioned_order: VersionedOrder
+) -> None:
+    persisted_orders = store.save_orders(versioned_orders=[versioned_order] * 3)
+
+    assert len({order.id for order in persisted_orders}) == 3
+    assert store.get_orders_by_order_ids(
+        order_ids=[order.id for order in persisted_orders]
+    ) == {order.id: order for order in persisted_orders}
+    assert store.get_orders_by_customer_id(
+        customer_id=versioned_order.customer_id
+    ) == persisted_orders
+
+
+def test_insert_existing_order_raises(
+    store: InMemoryOrderStore, persisted_order: PersistedOrder
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    with pytest.raises(SaveOrderError):
+        store.insert_orders(persisted_orders=[persisted_order])
+
+
+def test_bulk_writes_apply_all_orders_or_none(
+    store: InMemoryOrderStore,
+    persisted_order: PersistedOrder,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    # Setup:
+    store.insert_orders(persisted_orders=[persisted_order])
+    new_orders = [replace(persisted_order, id=id_generator()) for _ in range(0, 2)]
+
+    # Run:
+    with pytest.raises(SaveOrderError):
+        store.insert_orders(
+            persisted_orders=[new_orders[0], persisted_order, new_orders[1]]
+        )
+    with pytest.raises(SaveOrderError):
+        store.insert_orders(persisted_orders=[new_orders[0], new_orders[0]])
+    with pytest.raises(UpdateOrderError):
+        store.update_order_statuses(
+            new_statuses={persisted_order.id: Status.PAID, id_generator(): Status.PAID}
+        )
+
+    # Assert:
+    assert len(store) == 1
+    assert store.get_order_by_order_id(order_id=persisted_order.id) == persisted_order
+
+
+def test_update_order_status_moves_status_index(
+    store: InMemoryOrderStore, persisted_order: PersistedOrder
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    store.update_order_status(order_id=persisted_order.id, new_status=Status.PAID)
+
+    updated_order = persisted_order.update_status(new_status=Status.PAID)
+    assert store.get_order_by_order_id(order_id=persisted_order.id) == updated_order
+    assert store.get_orders_by_status(status=Status.PENDING) == []
+    assert store.get_orders_by_status(status=Status.PAID) == [updated_order]
+
+
+def test_update_unknown_order_raises(
+    store: InMemoryOrderStore, id_generator: Callable[[], Identifier]
+) -> None:
+    order_id = id_generator()
+
+    with pytest.raises(UpdateOrderError) as error_info:
+        store.update_order_statuses(new_statuses={order_id: Status.PAID})
+
+    assert error_info.value.order_id == order_id
+
+
+def test_update_order_status_if(
+    store: InMemoryOrderStore,
+    persisted_order: PersistedOrder,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.ACCEPTED_BY_INVENTORY,
+    )
+    assert not store.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.CANCELLED,
+    )
+    assert store.get_order_by_order_id(order_id=persisted_order.id).status == (
+        Status.ACCEPTED_BY_INVENTORY
+    )
+    with pytest.raises(UpdateOrderError):
+        store.update_order_status_if(
+            order_id=id_generator(),
+            expected_status=Status.PENDING,
+            new_status=Status.CANCELLED,
+        )
+
+
+def test_get_order_data(
+    store: InMemoryOrderStore, persisted_order: PersistedOrder, order_data: OrderData
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.get_order_data_by_order_id(order_id=persisted_order.id) == order_data
+    assert store.get_order_data_by_customer_id(
+        customer_id=persisted_order.customer_id
+    ) == [order_data]
+
+
+def test_get_product_versions_by_id(
+    store: InMemoryOrderStore,
+    product_versions: dict[Identifier, ProductVersion],
+    id_generator: Callable[[], Identifier],
+) -> None:
+    versions = {version.id: version for version in product_versions.values()}
+
+    result = store.get_product_versions_by_id(
+        product_version_ids=[*versions, id_generator()]
+    )
+
+    assert result == versions
+
+
+def test_get_order_data_pages(
+    store: InMemoryOrderStore,
+    persisted_order: PersistedOrder,
+    order_data: OrderData,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(0, 5)]
+    store.insert_orders(persisted_orders=orders)
+    # Orders of other customers are not part of the pages.
+    store.insert_orders(
+        persisted_orders=[
+            replace(persisted_order, id=id_generator(), customer_id=id_generator())
+        ]
+    )
+    customer_id = persisted_order.customer_id
+
+    first_page = store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3
+    )
+    second_page = store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3, after_order_id=first_page[-1].id
+    )
+
+    assert first_page + second_page == [
+        replace(order_data, id=order.id) for order in orders
+    ]
+    assert store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3, after_order_id=second_page[-1].id
+    ) == []
+
+
+def test_get_order_data_without_product_version_raises(
+    persisted_order: PersistedOrder,
+) -> None:
+    store = InMemoryOrderStore()
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    with pytest.raises(ReadFromPersistenceError):
+        store.get_order_data_by_order_id(order_id=persisted_order.id)
+
+
+def test_missing_orders_are_left_out(
+    store: InMemoryOrderStore, id_generator: Callable[[], Identifier]
+) -> None:
+    order_id = id_generator()
+
+    assert store.get_order_by_order_id(order_id=order_id) is None
+    assert store.get_order_data_by_order_id(order_id=order_id) is None
+    assert store.get_orders_by_order_ids(order_ids=[order_id]) == {}
+    assert store.get_orders_by_customer_id(customer_id=order_id) == []
+
+
+def test_spreads_sequential_order_ids_over_lock_stripes() -> None:
+    # Setup:
+    store = InMemoryOrderStore(lock_stripes=64)
+    # Ids of orders saved one per millisecond, whose sequence bits are zero.
+    order_ids = [SnowflakeId(value=timestamp << 22) for timestamp in range(0, 200)]
+
+    # Run:
+    stripes = {id(store._stripe(order_id)) for order_id in order_ids}
+
+    # Assert:
+    assert len(stripes) > 32
+
+
+def test_concurrent_writes_keep_indexes_consistent(
+    store: InMemoryOrderStore, versioned_order: VersionedOrder
+) -> None:
+    statuses = [Status.ACCEPTED_BY_INVENTORY, Status.PAID, Status.SHIPPED]
+
+    def place_and_update() -> None:
+        for _ in range(0, 200):
+            order = store.save_order(versioned_order=versioned_order)
+            for status in statuses:
+                store.update_order_status(order_id=order.id, new_status=status)
+
+    threads = [Thread(target=place_and_update) for _ in range(0, 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store) == 800
+    assert len(store.get_orders_by_status(status=Status.SHIPPED)) == 800
+    assert store.get_orders_by_status(status=Status.PENDING) == []
+
+
+def test_drives_update_order_status_service(
+    store: InMemoryOrderStore, versioned_order: VersionedOrder
+) -> None:
+    event_dispatcher_dummy = EventDispatcherDummy()
+    service = UpdateOrderStatusService(
+        update_order_spi=store,
+        get_order_by_order_id_spi=store,
+        status_update_event_dispatcher_spi=event_dispatcher_dummy,
+        update_orders_spi=store,
+        get_orders_by_order_ids_spi=store,
+    )
+    orders = store.save_orders(
+        versioned_orders=[versioned_order, replace(versioned_order)]
+    )
+
+    new_status = Status.ACCEPTED_BY_INVENTORY
+    setting = ExpectednessSetting.REQUIRE_NEXT_UP
+
+    results = service.update_order_statuses(
+        updates=[(order.id, new_status, setting) for order in orders]
+    )
+
+    assert results == store.get_orders_by_status(status=new_status)
+    assert len(event_dispatcher_dummy.read()) == 2
+
+
+def test_conditional_updates_stay_valid_under_contention(
+    store: InMemoryOrderStore, persisted_order: PersistedOrder
+) -> None:
+    # Setup:
+    store.insert_orders(persisted_orders=[persisted_order])
+    service = UpdateOrderStatusService(
+        update_order_spi=store,
+        get_order_by_order_id_spi=store,
+        status_update_event_dispatcher_spi=EventDispatcherDummy(),
+        conditional_update_order_spi=store,
+        max_conflict_retries=100,
+    )
+    results: list[PersistedOrder | DomainError] = []
+
+    def accept() -> None:
+        try:
+            results.append(
+                service.update_order_status(
+                    order_id=persisted_order.id,
+                    new_status=Status.ACCEPTED_BY_INVENTORY,
+                )
+            )
+        except DomainError as error:
+            results.append(error)
+
+    # Run:
+    threads = [Thread(target=accept) for _ in range(0, 8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert:
+    # Exactly one webhook accepts the order, the others see it accepted.
+    assert sum(isinstance(result, PersistedOrder) for result in results) == 1
+    assert sum(
+        isinstance(result, InsufficientExpectednessError) for result in results
+    ) == 7
@@ -0,0 +1,193 @@
+from adapters.persistence.in_memory_order_store import InMemoryOrderStore
+from adapters.persistence.order_data_projection import OrderDataProjection
+from domain.errors import ReadFromPersistenceError
+from domain.models.event import DispatchableEvent
+from domain.models.identifier import Identifier
+from domain.models.order import OrderData, PersistedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from domain.models.status_transition_validator import ExpectednessSetting
+from domain.services.update_order_status_service import UpdateOrderStatusService
+from test_domain.dummies import GetProductVersionsByIdDummy
+from dataclasses import replace
+from typing import Callable, Iterator
+import pytest
+
+T = DispatchableEvent.EventType
+
+
+@pytest.fixture
+def catalogue(
+    product_versions: dict[Identifier, ProductVersion]
+) -> GetProductVersionsByIdDummy:
+    return GetProductVersionsByIdDummy(
+        product_versions={
+            product_version.id: product_version
+            for product_version in product_versions.values()
+        }
+    )
+
+
+@pytest.fixture
+def projection(
+    catalogue: GetProductVersionsByIdDummy,
+) -> Iterator[OrderDataProjection]:
+    with OrderDataProjection(
+        get_product_versions_by_id_spi=catalogue, max_delay_seconds=0.001
+    ) as projection:
+        yield projection
+
+
+def test_apply_events(
+    id_generator: Callable[[], Identifier],
+    catalogue: GetProductVersionsByIdDummy,
+    projection: OrderDataProjection,
+    persisted_order: PersistedOrder,
+    order_data: OrderData,
+) -> None:
+    """
+    Assert that new orders are assembled with one catalogue call
+    and status updates replace the status of projected orders.
+    """
+
+    # Setup:
+    other_order = replace(persisted_order, id=id_generator())
+    paid_order = persisted_order.update_status(new_status=Status.PAID)
+
+    # Run:
+    projection.apply_events(
+        events=[
+            DispatchableEvent(order=persisted_order, event_type=T.TO_BE_PAID),
+            DispatchableEvent(order=other_order, event_type=T.TO_BE_PAID),
+            DispatchableEvent(order=paid_order, event_type=T.TO_BE_SHIPPED),
+        ]
+    )
+
+    # Assert:
+    assert projection.get_order_data_by_order_id(
+        order_id=persisted_order.id
+    ) == replace(order_data, status=Status.PAID)
+    assert [
+        order.id
+        for order in projection.get_order_data_by_customer_id(
+            customer_id=persisted_order.customer_id
+        )
+    ] == [persisted_order.id, other_order.id]
+    assert len(catalogue.requested_ids) == 1
+    assert projection.stats.events_applied == 3
+
+
+def test_dispatched_events_are_applied_in_background(
+    projection: OrderDataProjection,
+    persisted_order: PersistedOrder,
+    order_data: OrderData,
+) -> None:
+    # Setup:
+    event = DispatchableEvent(order=persisted_order, event_type=T.TO_BE_PAID)
+
+    # Run:
+    projection.dispatch_event(event=event)
+    projection.close()
+
+    # Assert:
+    assert projection.get_order_data_by_order_id(order_id=order_data.id) == order_data
+    stats = projection.stats
+    assert (stats.orders, stats.customers, stats.events_applied) == (1, 1, 1)
+    assert stats.lag_seconds == 0.0
+
+
+def test_projects_update_order_status_service(
+    product_versions: dict[Identifier, ProductVersion],
+    projection: OrderDataProjection,
+    persisted_order: PersistedOrder,
+) -> None:
+    """
+    Assert that the projection serves the statuses set through the service,
+    including statuses that need no further processing.
+    """
+
+    # Setup:
+    store = InMemoryOrderStore()
+    store.save_product_versions(product_versions=product_versions.values())
+    store.insert_orders(persisted_orders=[persisted_order])
+    projection.rebuild(orders=[persisted_order])
+    service = UpdateOrderStatusService(
+        update_order_spi=store,
+        get_order_by_order_id_spi=store,
+        status_update_event_dispatcher_spi=projection,
+    )
+
+    # Run:
+    service.update_order_status(
+        order_id=persisted_order.id,
+        new_status=Status.DELIVERED,
+        setting=ExpectednessSetting.ALLOW_ABNORMAL,
+    )
+    projection.close()
+
+    # Assert:
+    assert projection.get_order_data_by_order_id(
+        order_id=persisted_order.id
+    ) == store.get_order_data_by_order_id(order_id=persisted_order.id)
+    order_data = projection.get_order_data_by_order_id(order_id=persisted_order.id)
+    assert order_data is not None and order_data.status == Status.DELIVERED
+
+
+def test_failed_events_are_isolated_and_recovered_by_rebuild(
+    id_generator: Callable[[], Identifier],
+    catalogue: GetProductVersionsByIdDummy,
+    persisted_order: PersistedOrder,
+    order_data: OrderData,
+) -> None:
+    """
+    Assert that an event with an unknown product version fails on its own,
+    is counted and reported as failed, and is recovered by a rebuild.
+    """
+
+    # Setup:
+    unknown_item = replace(
+        persisted_order.items[0], product_version_id=id_generator()
+    )
+    broken_order = replace(
+        persisted_order, id=id_generator(), items=[unknown_item]
+    )
+    broken_event = DispatchableEvent(order=broken_order, event_type=T.TO_BE_PAID)
+    errors: list[tuple[list[DispatchableEvent], Exception]] = []
+
+    def on_error(events: list[DispatchableEvent], error: Exception) -> None:
+        errors.append((events, error))
+        raise ValueError
+
+    projection = OrderDataProjection(
+        get_product_versions_by_id_spi=catalogue,
+        max_delay_seconds=0.001,
+        on_error=on_error,
+    )
+
+    # Run:
+    projection.dispatch_events(
+        events=[
+            DispatchableEvent(order=persisted_order, event_type=T.TO_BE_PAID),
+            broken_event,
+        ]
+    )
+    projection.close()
+    failed_stats = projection.stats
+    with pytest.raises(ReadFromPersistenceError):
+        projection.apply_events(events=[broken_event])
+    with pytest.raises(ReadFromPersistenceError):
+        projection.rebuild(orders=[persisted_order, broken_order])
+    projection.rebuild(orders=[persisted_order])
+
+    # Assert:
+    assert (failed_stats.orders, failed_stats.events_failed) == (1, 1)
+    assert failed_stats.events_applied == 1
+    assert failed_stats.on_error_failures == 1
+    assert len(errors) == 1
+    assert errors[0][0] == [broken_event]
+    assert isinstance(errors[0][1], ReadFromPersistenceError)
+    assert projection.stats.events_failed == 2
+    assert projection.get_order_data_by_customer_id(
+        customer_id=persisted_order.customer_id
+    ) == [order_data]
+    assert projection.stats.rebuilds == 1
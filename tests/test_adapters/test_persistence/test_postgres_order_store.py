@@ -0,0 +1,201 @@
+from domain.errors import ReadFromPersistenceError, SaveOrderError, UpdateOrderError
+from domain.models.identifier import Identifier
+from domain.models.order import OrderData, PersistedOrder, VersionedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from dataclasses import replace
+from typing import Callable, Iterator
+import os
+import pytest
+
+pytest.importorskip("psycopg_pool")
+
+from adapters.persistence.postgres_order_store import (  # noqa: E402
+    PostgresOrderStore,
+)
+
+DSN = os.environ.get("ORDERS_TEST_POSTGRES_DSN")
+
+pytestmark = pytest.mark.skipif(
+    DSN is None, reason="ORDERS_TEST_POSTGRES_DSN is not set"
+)
+
+
+@pytest.fixture
+def empty_store() -> Iterator[PostgresOrderStore]:
+    assert DSN is not None
+    store = PostgresOrderStore(conninfo=DSN, min_size=1, max_size=4, copy_threshold=8)
+    store.create_schema()
+    with store._connection() as connection:
+        connection.execute("TRUNCATE orders, order_items, product_versions")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def store(
+    empty_store: PostgresOrderStore, product_versions: dict[Identifier, ProductVersion]
+) -> PostgresOrderStore:
+    empty_store.save_product_versions(product_versions.values())
+    return empty_store
+
+
+def test_save_and_get(
+    store: PostgresOrderStore, versioned_order: VersionedOrder
+) -> None:
+    persisted_order = store.save_order(versioned_order=versioned_order)
+
+    assert persisted_order.status == Status.PENDING
+    assert store.get_order_by_order_id(order_id=persisted_order.id) == persisted_order
+    assert store.get_orders_by_customer_id(
+        customer_id=versioned_order.customer_id
+    ) == [persisted_order]
+
+
+@pytest.mark.parametrize("count", [2, 100])
+def test_save_orders(
+    store: PostgresOrderStore, versioned_order: VersionedOrder, count: int
+) -> None:
+    # Batches of at least 8 orders are written with COPY.
+    orders = store.save_orders(
+        versioned_orders=[versioned_order, replace(versioned_order, items=[])]
+        * (count // 2)
+    )
+
+    assert store.get_orders_by_order_ids(order_ids=[order.id for order in orders]) == {
+        order.id: order for order in orders
+    }
+    assert store.get_orders_by_customer_id(
+        customer_id=versioned_order.customer_id
+    ) == orders
+
+
+@pytest.mark.parametrize("count", [1, 10])
+def test_insert_existing_order_raises(
+    store: PostgresOrderStore, persisted_order: PersistedOrder, count: int
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    with pytest.raises(SaveOrderError):
+        store.insert_orders(persisted_orders=[persisted_order] * count)
+
+    assert store.get_orders_by_customer_id(
+        customer_id=persisted_order.customer_id
+    ) == [persisted_order]
+
+
+def test_update_order_statuses(
+    store: PostgresOrderStore,
+    persisted_order: PersistedOrder,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    store.update_order_status(order_id=persisted_order.id, new_status=Status.PAID)
+
+    assert store.get_order_by_order_id(
+        order_id=persisted_order.id
+    ) == persisted_order.update_status(new_status=Status.PAID)
+
+    unknown_order_id = id_generator()
+    with pytest.raises(UpdateOrderError) as error_info:
+        store.update_order_statuses(
+            new_statuses={
+                persisted_order.id: Status.SHIPPED,
+                unknown_order_id: Status.SHIPPED,
+            }
+        )
+    assert error_info.value.order_id == unknown_order_id
+    # The whole bulk update is rolled back.
+    assert store.get_order_by_order_id(order_id=persisted_order.id).status == (
+        Status.PAID
+    )
+
+
+def test_update_order_status_if(
+    store: PostgresOrderStore,
+    persisted_order: PersistedOrder,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.ACCEPTED_BY_INVENTORY,
+    )
+    assert not store.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.CANCELLED,
+    )
+    assert store.get_order_by_order_id(order_id=persisted_order.id).status == (
+        Status.ACCEPTED_BY_INVENTORY
+    )
+    with pytest.raises(UpdateOrderError):
+        store.update_order_status_if(
+            order_id=id_generator(),
+            expected_status=Status.PENDING,
+            new_status=Status.CANCELLED,
+        )
+
+
+def test_get_order_data(
+    store: PostgresOrderStore, persisted_order: PersistedOrder, order_data: OrderData
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.get_order_data_by_order_id(order_id=persisted_order.id) == order_data
+    assert store.get_order_data_by_customer_id(
+        customer_id=persisted_order.customer_id
+    ) == [order_data]
+
+
+def test_get_order_data_pages(
+    store: PostgresOrderStore,
+    persisted_order: PersistedOrder,
+    order_data: OrderData,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(0, 5)]
+    store.insert_orders(persisted_orders=orders)
+    # Orders of other customers are not part of the pages.
+    store.insert_orders(
+        persisted_orders=[
+            replace(persisted_order, id=id_generator(), customer_id=id_generator())
+        ]
+    )
+    customer_id = persisted_order.customer_id
+
+    first_page = store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3
+    )
+    second_page = store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3, after_order_id=first_page[-1].id
+    )
+
+    assert first_page + second_page == [
+        replace(order_data, id=order.id) for order in orders
+    ]
+    assert store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3, after_order_id=second_page[-1].id
+    ) == []
+
+
+def test_get_order_data_without_product_version_raises(
+    empty_store: PostgresOrderStore, persisted_order: PersistedOrder
+) -> None:
+    empty_store.insert_orders(persisted_orders=[persisted_order])
+
+    with pytest.raises(ReadFromPersistenceError):
+        empty_store.get_order_data_by_order_id(order_id=persisted_order.id)
+
+
+def test_missing_orders(
+    store: PostgresOrderStore, id_generator: Callable[[], Identifier]
+) -> None:
+    order_id = id_generator()
+
+    assert store.get_order_by_order_id(order_id=order_id) is None
+    assert store.get_order_data_by_order_id(order_id=order_id) is None
+    assert store.get_orders_by_customer_id(customer_id=order_id) == []
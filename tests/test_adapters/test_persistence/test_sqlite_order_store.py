@@ -0,0 +1,204 @@
+from adapters.persistence.sqlite_order_store import SqliteOrderStore
+from domain.errors import ReadFromPersistenceError, SaveOrderError, UpdateOrderError
+from domain.models.identifier import Identifier
+from domain.models.order import OrderData, PersistedOrder, VersionedOrder
+from domain.models.order_status import Status
+from domain.models.product import ProductVersion
+from dataclasses import replace
+from pathlib import Path
+from threading import Thread
+from typing import Callable, Iterator
+import pytest
+
+
+@pytest.fixture
+def store(
+    tmp_path: Path, product_versions: dict[Identifier, ProductVersion]
+) -> Iterator[SqliteOrderStore]:
+    store = SqliteOrderStore(path=str(tmp_path / "orders.sqlite3"))
+    store.save_product_versions(product_versions.values())
+    yield store
+    store.close()
+
+
+def test_save_and_get(store: SqliteOrderStore, versioned_order: VersionedOrder) -> None:
+    persisted_order = store.save_order(versioned_order=versioned_order)
+
+    assert persisted_order.status == Status.PENDING
+    assert store.get_order_by_order_id(order_id=persisted_order.id) == persisted_order
+    assert store.get_orders_by_customer_id(
+        customer_id=versioned_order.customer_id
+    ) == [persisted_order]
+
+
+def test_save_orders(store: SqliteOrderStore, versioned_order: VersionedOrder) -> None:
+    orders = store.save_orders(
+        versioned_orders=[versioned_order, replace(versioned_order, items=[])]
+    )
+
+    assert store.get_orders_by_order_ids(order_ids=[order.id for order in orders]) == {
+        order.id: order for order in orders
+    }
+    assert store.get_orders_by_customer_id(
+        customer_id=versioned_order.customer_id
+    ) == orders
+
+
+def test_get_orders_by_many_order_ids(
+    store: SqliteOrderStore, versioned_order: VersionedOrder
+) -> None:
+    orders = store.save_orders(versioned_orders=[versioned_order] * 2_000)
+
+    result = store.get_orders_by_order_ids(order_ids=[order.id for order in orders])
+
+    assert result == {order.id: order for order in orders}
+
+
+def test_insert_existing_order_raises(
+    store: SqliteOrderStore, persisted_order: PersistedOrder
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    with pytest.raises(SaveOrderError):
+        store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.get_orders_by_customer_id(
+        customer_id=persisted_order.customer_id
+    ) == [persisted_order]
+
+
+def test_update_order_statuses(
+    store: SqliteOrderStore,
+    persisted_order: PersistedOrder,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    store.update_order_status(order_id=persisted_order.id, new_status=Status.PAID)
+
+    assert store.get_order_by_order_id(
+        order_id=persisted_order.id
+    ) == persisted_order.update_status(new_status=Status.PAID)
+
+    unknown_order_id = id_generator()
+    with pytest.raises(UpdateOrderError) as error_info:
+        store.update_order_statuses(
+            new_statuses={
+                persisted_order.id: Status.SHIPPED,
+                unknown_order_id: Status.SHIPPED,
+            }
+        )
+    assert error_info.value.order_id == unknown_order_id
+    # The whole bulk update is rolled back.
+    assert store.get_order_by_order_id(order_id=persisted_order.id).status == (
+        Status.PAID
+    )
+
+
+def test_update_order_status_if(
+    store: SqliteOrderStore,
+    persisted_order: PersistedOrder,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.ACCEPTED_BY_INVENTORY,
+    )
+    assert not store.update_order_status_if(
+        order_id=persisted_order.id,
+        expected_status=Status.PENDING,
+        new_status=Status.CANCELLED,
+    )
+    assert store.get_order_by_order_id(order_id=persisted_order.id).status == (
+        Status.ACCEPTED_BY_INVENTORY
+    )
+    with pytest.raises(UpdateOrderError):
+        store.update_order_status_if(
+            order_id=id_generator(),
+            expected_status=Status.PENDING,
+            new_status=Status.CANCELLED,
+        )
+
+
+def test_get_order_data(
+    store: SqliteOrderStore, persisted_order: PersistedOrder, order_data: OrderData
+) -> None:
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    assert store.get_order_data_by_order_id(order_id=persisted_order.id) == order_data
+    assert store.get_order_data_by_customer_id(
+        customer_id=persisted_order.customer_id
+    ) == [order_data]
+
+
+def test_get_order_data_pages(
+    store: SqliteOrderStore,
+    persisted_order: PersistedOrder,
+    order_data: OrderData,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(0, 5)]
+    store.insert_orders(persisted_orders=orders)
+    # Orders of other customers are not part of the pages.
+    store.insert_orders(
+        persisted_orders=[
+            replace(persisted_order, id=id_generator(), customer_id=id_generator())
+        ]
+    )
+    customer_id = persisted_order.customer_id
+
+    first_page = store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3
+    )
+    second_page = store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3, after_order_id=first_page[-1].id
+    )
+
+    assert first_page + second_page == [
+        replace(order_data, id=order.id) for order in orders
+    ]
+    assert store.get_order_data_page_by_customer_id(
+        customer_id=customer_id, limit=3, after_order_id=second_page[-1].id
+    ) == []
+
+
+def test_get_order_data_without_product_version_raises(
+    tmp_path: Path, persisted_order: PersistedOrder
+) -> None:
+    store = SqliteOrderStore(path=str(tmp_path / "orders.sqlite3"))
+    store.insert_orders(persisted_orders=[persisted_order])
+
+    with pytest.raises(ReadFromPersistenceError):
+        store.get_order_data_by_order_id(order_id=persisted_order.id)
+
+
+def test_missing_orders(
+    store: SqliteOrderStore, id_generator: Callable[[], Identifier]
+) -> None:
+    order_id = id_generator()
+
+    assert store.get_order_by_order_id(order_id=order_id) is None
+    assert store.get_order_data_by_order_id(order_id=order_id) is None
+    assert store.get_orders_by_customer_id(customer_id=order_id) == []
+
+
+def test_concurrent_writers(
+    store: SqliteOrderStore, versioned_order: VersionedOrder
+) -> None:
+    def save() -> None:
+        for _ in range(0, 50):
+            store.save_orders(versioned_orders=[versioned_order] * 2)
+
+    threads = [Thread(target=save) for _ in range(0, 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (
+        len(store.get_orders_by_customer_id(customer_id=versioned_order.customer_id))
+        == 400
+    )
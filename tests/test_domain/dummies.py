@@ -5,16 +5,23 @@ from domain.models.identifier import Identifier
 from domain.models.order_status import Status, StatusTransitionProtocol
 from domain.models.order import OrderData, PersistedOrder, VersionedOrder
 from domain.models.event import DispatchableEvent
+from domain.models.product import ProductVersion
 from dataclasses import dataclass, field
+from typing import Any
 
 
 @dataclass
 class UpdateOrderDummy:
     statuses: dict[Identifier, Status] = field(default_factory=dict)
+    bulk_writes: list[dict[Identifier, Status]] = field(default_factory=list)
 
     def update_order_status(self, order_id: Identifier, new_status: Status) -> None:
         self.statuses[order_id] = new_status
 
+    def update_order_statuses(self, new_statuses: dict[Identifier, Status]) -> None:
+        self.bulk_writes.append(new_statuses)
+        self.statuses.update(new_statuses)
+
     def read(self) -> dict[Identifier, Status]:
         return self.statuses
 
@@ -39,19 +46,59 @@ class SaveOrderDummy:
         return self.versioned_orders_saved == []
 
 
+@dataclass
+class SaveOrdersDummy:
+    persisted_orders_to_return: list[PersistedOrder] = field(default_factory=list)
+
+    batches_saved: list[list[VersionedOrder]] = field(default_factory=list)
+
+    def save_orders(
+        self, versioned_orders: list[VersionedOrder]
+    ) -> list[PersistedOrder]:
+        self.batches_saved.append(versioned_orders)
+        return self.persisted_orders_to_return[: len(versioned_orders)]
+
+    def read(self) -> list[list[VersionedOrder]]:
+        return self.batches_saved
+
+    def is_empty(self) -> bool:
+        return self.batches_saved == []
+
+
+@dataclass
+class InsertOrdersDummy:
+    batches_inserted: list[list[PersistedOrder]] = field(default_factory=list)
+
+    def insert_orders(self, persisted_orders: list[PersistedOrder]) -> None:
+        self.batches_inserted.append(persisted_orders)
+
+    def read(self) -> list[list[PersistedOrder]]:
+        return self.batches_inserted
+
+    def is_empty(self) -> bool:
+        return self.batches_inserted == []
+
+
 @dataclass
 class GetProductVersionIdsDummy:
     product_version_ids: dict[Identifier, Identifier] = field(default_factory=dict)
     invalid_ids: set[Identifier] = field(default_factory=set)
     ids_without_product_version_id: set[Identifier] = field(default_factory=set)
 
+    requested_product_ids: list[list[Identifier]] = field(default_factory=list)
+
     Result = GetProductVersionIdsSPI.Result
 
     def get_product_versions(
         self, product_ids: list[Identifier]
     ) -> GetProductVersionIdsSPI.Result:
+        self.requested_product_ids.append(product_ids)
         return GetProductVersionIdsSPI.Result(
-            product_version_ids=self.product_version_ids,
+            product_version_ids={
+                product_id: self.product_version_ids[product_id]
+                for product_id in product_ids
+                if product_id in self.product_version_ids
+            },
             invalid_ids=self.invalid_ids,
             ids_without_product_version_id=self.ids_without_product_version_id,
         )
@@ -60,10 +107,21 @@ class GetProductVersionIdsDummy:
 @dataclass
 class GetOrderByOrderIdDummy:
     orders: dict[Identifier, PersistedOrder] = field(default_factory=dict)
+    bulk_reads: list[list[Identifier]] = field(default_factory=list)
 
     def get_order_by_order_id(self, order_id: Identifier) -> PersistedOrder | None:
         return self.orders.get(order_id)
 
+    def get_orders_by_order_ids(
+        self, order_ids: list[Identifier]
+    ) -> dict[Identifier, PersistedOrder]:
+        self.bulk_reads.append(order_ids)
+        return {
+            order_id: self.orders[order_id]
+            for order_id in order_ids
+            if order_id in self.orders
+        }
+
     def reset(self) -> None:
         self.orders = {}
 
@@ -71,6 +129,51 @@ class GetOrderByOrderIdDummy:
         self.orders[order.id] = order
 
 
+@dataclass
+class ConditionalUpdateOrderDummy:
+    """
+    Compare-and-set over the orders of `get_order_dummy`.
+    Before each attempt, a concurrent writer sets the next status
+    of `concurrent_statuses`, if any are left.
+    """
+
+    get_order_dummy: GetOrderByOrderIdDummy
+    concurrent_statuses: list[Status] = field(default_factory=list)
+    attempts: int = 0
+
+    def update_order_status_if(
+        self, order_id: Identifier, expected_status: Status, new_status: Status
+    ) -> bool:
+        self.attempts += 1
+        order = self.get_order_dummy.orders[order_id]
+        if self.concurrent_statuses != []:
+            order = order.update_status(new_status=self.concurrent_statuses.pop(0))
+            self.get_order_dummy.add(order)
+        if order.status != expected_status:
+            return False
+        self.get_order_dummy.add(order.update_status(new_status=new_status))
+        return True
+
+
+@dataclass
+class PlaceOrderIdempotencyDummy:
+    placed_orders: dict[str, PersistedOrder] = field(default_factory=dict)
+    claimed_keys: list[str] = field(default_factory=list)
+    released_keys: list[str] = field(default_factory=list)
+
+    def claim(self, idempotency_key: str) -> PersistedOrder | None:
+        if idempotency_key in self.placed_orders:
+            return self.placed_orders[idempotency_key]
+        self.claimed_keys.append(idempotency_key)
+        return None
+
+    def complete(self, idempotency_key: str, persisted_order: PersistedOrder) -> None:
+        self.placed_orders[idempotency_key] = persisted_order
+
+    def release(self, idempotency_key: str) -> None:
+        self.released_keys.append(idempotency_key)
+
+
 @dataclass
 class EventDispatcherDummy:
     dispatched_events: list[DispatchableEvent] = field(default_factory=list)
@@ -85,6 +188,20 @@ class EventDispatcherDummy:
         return self.dispatched_events == []
 
 
+@dataclass
+class BatchEventDispatcherDummy:
+    dispatched_batches: list[list[DispatchableEvent]] = field(default_factory=list)
+
+    def dispatch_events(self, events: list[DispatchableEvent]) -> None:
+        self.dispatched_batches.append(events)
+
+    def read(self) -> list[list[DispatchableEvent]]:
+        return self.dispatched_batches
+
+    def is_empty(self) -> bool:
+        return self.dispatched_batches == []
+
+
 @dataclass
 class StatusToEventMapperDummy:
     event_type: DispatchableEvent.EventType | None = None
@@ -95,6 +212,32 @@ class StatusToEventMapperDummy:
         return self.event_type
 
 
+@dataclass
+class GetOrdersByCustomerIdDummy:
+    orders: list[PersistedOrder] = field(default_factory=list)
+
+    def get_orders_by_customer_id(
+        self, customer_id: Identifier
+    ) -> list[PersistedOrder]:
+        return [order for order in self.orders if order.customer_id == customer_id]
+
+
+@dataclass
+class GetProductVersionsByIdDummy:
+    product_versions: dict[Identifier, ProductVersion] = field(default_factory=dict)
+    requested_ids: list[list[Identifier]] = field(default_factory=list)
+
+    def get_product_versions_by_id(
+        self, product_version_ids: list[Identifier]
+    ) -> dict[Identifier, ProductVersion]:
+        self.requested_ids.append(product_version_ids)
+        return {
+            id: self.product_versions[id]
+            for id in product_version_ids
+            if id in self.product_versions
+        }
+
+
 @dataclass
 class OrderDataByOrderIdDummy:
     order_data: OrderData | None = None
@@ -111,6 +254,23 @@ class OrderDataByCustomerIdDummy:
         return self.order_data_list
 
 
+@dataclass
+class OrderDataPageByCustomerIdDummy:
+    order_data_list: list[OrderData] = field(default_factory=list)
+    requested_limits: list[int] = field(default_factory=list)
+
+    def get_order_data_page_by_customer_id(
+        self,
+        customer_id: Identifier,
+        limit: int,
+        after_order_id: Identifier | None = None,
+    ) -> list[OrderData]:
+        self.requested_limits.append(limit)
+        ids = [order_data.id for order_data in self.order_data_list]
+        start = 0 if after_order_id is None else ids.index(after_order_id) + 1
+        return self.order_data_list[start:start + limit]
+
+
 @dataclass
 class TransitionDummy:
     from_status: Status
@@ -161,3 +321,24 @@ class TransitionValidatorDummy:
     @classmethod
     def set_invalid(cls) -> None:
         cls.is_valid = False
+
+
+class AsyncDummy:
+    """
+    Exposes every method of a synchronous dummy as a coroutine function,
+    so the same dummy can stand in for an async port.
+    All other attributes are read from the wrapped dummy.
+    """
+
+    def __init__(self, dummy: Any) -> None:
+        self.dummy = dummy
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.dummy, name)
+        if not callable(attribute):
+            return attribute
+
+        async def coroutine_function(*args: Any, **kwargs: Any) -> Any:
+            return attribute(*args, **kwargs)
+
+        return coroutine_function
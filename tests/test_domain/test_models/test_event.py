@@ -1,5 +1,5 @@
 from domain.models.order_status import Status
-from domain.models.event import StatusToEventMapper
+from domain.models.event import DispatchableEvent, StatusToEventMapper
 
 
 def test_map_status_to_event() -> None:
@@ -16,3 +16,18 @@ def test_mapper_is_singleton() -> None:
     mapper2 = StatusToEventMapper()
     assert isinstance(mapper1, StatusToEventMapper)
     assert mapper1 is mapper2
+
+
+def test_every_status_has_its_event_type() -> None:
+    T = DispatchableEvent.EventType
+    assert {
+        status: StatusToEventMapper.map_status_to_event_type(status=status)
+        for status in Status
+    } == {
+        Status.PENDING: T.TO_BE_ACCEPTED_BY_INVENTORY,
+        Status.ACCEPTED_BY_INVENTORY: T.TO_BE_PAID,
+        Status.PAID: T.TO_BE_SHIPPED,
+        Status.SHIPPED: T.SHIPPED,
+        Status.CANCELLED: T.CANCELLED,
+        Status.DELIVERED: T.DELIVERED,
+    }
@@ -0,0 +1,71 @@
+from domain.models.identifier import SnowflakeId, SnowflakeIdGenerator
+from dataclasses import dataclass
+from threading import Thread
+import pytest
+
+
+@dataclass
+class ClockDummy:
+    now_ms: int = SnowflakeId.EPOCH_MS + 1_000
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+
+def test_snowflake_id_fields() -> None:
+    clock = ClockDummy()
+    generator = SnowflakeIdGenerator(worker_id=7, _clock_ms=clock)
+
+    first = generator.generate_order_id()
+    second = generator.generate_order_id()
+
+    assert first.timestamp_ms == clock.now_ms
+    assert first.worker_id == 7
+    assert (first.sequence, second.sequence) == (0, 1)
+    assert 0 < int(first) < 2**63
+
+
+def test_snowflake_id_is_hashable_value_object() -> None:
+    assert SnowflakeId(value=1) == SnowflakeId(value=1)
+    assert hash(SnowflakeId(value=1)) == hash(SnowflakeId(value=1))
+    assert len({SnowflakeId(value=1), SnowflakeId(value=1), SnowflakeId(value=2)}) == 2
+    assert SnowflakeId(value=1) < SnowflakeId(value=2)
+
+
+def test_ids_are_strictly_increasing() -> None:
+    clock = ClockDummy()
+    generator = SnowflakeIdGenerator(worker_id=1, _clock_ms=clock)
+
+    ids = generator.generate_order_ids(count=5_000)  # Overflows one millisecond.
+    clock.now_ms += 1
+    ids += generator.generate_order_ids(count=10)
+    clock.now_ms -= 100  # Clock moves backwards.
+    ids += generator.generate_order_ids(count=10)
+    clock.now_ms += 10_000
+    ids += generator.generate_order_ids(count=10)
+
+    assert all(a < b for a, b in zip(ids, ids[1:]))
+    assert ids[-1].timestamp_ms == clock.now_ms
+
+
+def test_ids_are_unique_across_threads_and_workers() -> None:
+    generators = [SnowflakeIdGenerator(worker_id=w) for w in (0, 1)]
+    ids: list[SnowflakeId] = []
+
+    def generate(generator: SnowflakeIdGenerator) -> None:
+        ids.extend(generator.generate_order_ids(count=2_000))
+
+    threads = [Thread(target=generate, args=(g,)) for g in generators * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(ids)) == 8_000
+
+
+def test_worker_id_bounds() -> None:
+    with pytest.raises(ValueError):
+        SnowflakeIdGenerator(worker_id=-1)
+    with pytest.raises(ValueError):
+        SnowflakeIdGenerator(worker_id=SnowflakeIdGenerator.MAX_WORKER_ID + 1)
@@ -3,6 +3,9 @@ from domain.models.order import (
     RequestedOrder,
     VersionedOrder,
     PersistedOrder,
+    OrderData,
+    CompactPersistedOrder,
+    CompactOrderData,
     Address,
     Item,
     VersionedItem,
@@ -94,3 +97,45 @@ def test_persisted_order(
         assert order.items == versioned_items
     assert persisted_order.status == Status.PENDING
     assert updated_persisted_order.status == custom_status
+
+
+def test_models_are_slotted(
+    persisted_order: PersistedOrder, order_data: OrderData
+) -> None:
+    for instance in [
+        persisted_order,
+        persisted_order.items[0],
+        order_data,
+        order_data.items[0],
+        order_data.items[0].product_version,
+    ]:
+        assert not hasattr(instance, "__dict__")
+
+
+def test_compact_persisted_order(persisted_order: PersistedOrder) -> None:
+    compact_order = CompactPersistedOrder.from_persisted_order(persisted_order)
+
+    custom_status = Status.ACCEPTED_BY_INVENTORY
+    updated_compact_order = compact_order.update_status(new_status=custom_status)
+
+    assert compact_order.to_persisted_order() == persisted_order
+    assert compact_order.items == tuple(persisted_order.items)
+    assert updated_compact_order.status == custom_status
+    assert updated_compact_order.items is compact_order.items
+    assert updated_compact_order != compact_order
+    assert compact_order == CompactPersistedOrder.from_persisted_order(
+        persisted_order
+    )
+    assert hash(compact_order) == hash(
+        CompactPersistedOrder.from_persisted_order(persisted_order)
+    )
+    assert {compact_order: True}[compact_order] is True
+
+
+def test_compact_order_data(order_data: OrderData) -> None:
+    compact_order_data = CompactOrderData.from_order_data(order_data)
+
+    assert compact_order_data.to_order_data() == order_data
+    assert hash(compact_order_data) == hash(
+        CompactOrderData.from_order_data(order_data)
+    )
@@ -0,0 +1,92 @@
+from domain.models.identifier import Identifier, SnowflakeIdGenerator
+from domain.models.order import Address, PersistedOrder, VersionedItem
+from domain.models.order_batch import OrderBatch
+from domain.models.order_status import Status
+from typing import Callable
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def snowflake_id_generator() -> Callable[[], Identifier]:
+    return SnowflakeIdGenerator(worker_id=0).generate_order_id
+
+
+@pytest.fixture
+def orders(
+    snowflake_id_generator: Callable[[], Identifier], address: Address
+) -> list[PersistedOrder]:
+    """
+    Returns orders of three customers, cycling through all statuses,
+    with 0 to 3 items each.
+    """
+    customer_ids = [snowflake_id_generator() for _ in range(0, 3)]
+    statuses = list(Status)
+    return [
+        PersistedOrder(
+            customer_id=customer_ids[index % 3],
+            shipping_address=address,
+            id=snowflake_id_generator(),
+            items=[
+                VersionedItem(
+                    product_id=snowflake_id_generator(),
+                    quantity=item_index + 1,
+                    product_version_id=snowflake_id_generator(),
+                )
+                for item_index in range(0, index % 4)
+            ],
+            status=statuses[index % len(statuses)],
+        )
+        for index in range(0, 24)
+    ]
+
+
+def test_round_trip(orders: list[PersistedOrder]) -> None:
+    batch = OrderBatch.from_orders(orders)
+
+    assert len(batch) == len(orders)
+    assert batch.item_counts.tolist() == [len(order.items) for order in orders]
+    assert batch.to_orders() == orders
+
+
+def test_empty_batch() -> None:
+    batch = OrderBatch.from_orders([])
+
+    assert len(batch) == 0
+    assert batch.to_orders() == []
+    assert len(batch.where(statuses=[Status.PAID])) == 0
+
+
+def test_where(orders: list[PersistedOrder]) -> None:
+    batch = OrderBatch.from_orders(orders)
+    customer_ids = [orders[0].customer_id, orders[1].customer_id]
+
+    result = batch.where(statuses=[Status.PAID], customer_ids=customer_ids)
+
+    assert result.to_orders() == [
+        order
+        for order in orders
+        if order.status is Status.PAID and order.customer_id in customer_ids
+    ]
+
+
+def test_take_reorders_items(orders: list[PersistedOrder]) -> None:
+    batch = OrderBatch.from_orders(orders)
+    indices = np.array([7, 3, 3, 0])
+
+    result = batch.take(indices=indices)
+
+    assert result.to_orders() == [orders[index] for index in indices]
+
+
+def test_order_mask(orders: list[PersistedOrder]) -> None:
+    batch = OrderBatch.from_orders(orders)
+
+    mask = batch.order_mask(order_ids=[orders[2].id, orders[5].id])
+
+    assert np.flatnonzero(mask).tolist() == [2, 5]
+
+
+def test_requires_snowflake_ids(persisted_order: PersistedOrder) -> None:
+    with pytest.raises(TypeError):
+        OrderBatch.from_orders([persisted_order])
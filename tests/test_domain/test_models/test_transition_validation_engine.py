@@ -0,0 +1,112 @@
+from domain.models.order_status import (
+    Status,
+    StatusTransition,
+    TransitionToExpectednessMapper,
+)
+from domain.models.status_transition_validator import (
+    ExpectednessSetting,
+    TransitionValidator,
+)
+from domain.models.transition_validation_engine import TransitionValidationEngine
+import numpy as np
+import pytest
+
+Engine = TransitionValidationEngine
+
+
+def all_transitions() -> tuple[list[Status], list[Status]]:
+    from_statuses = [from_status for from_status in Status for _ in Status]
+    to_statuses = [to_status for _ in Status for to_status in Status]
+    return from_statuses, to_statuses
+
+
+def test_validate_transitions_matches_validator() -> None:
+    from_statuses, to_statuses = all_transitions()
+    from_codes = Engine.encode_statuses(from_statuses)
+    to_codes = Engine.encode_statuses(to_statuses)
+
+    for setting in ExpectednessSetting:
+        mask = Engine.validate_transitions(
+            from_codes=from_codes, to_codes=to_codes, setting=setting
+        )
+        expected_mask = [
+            TransitionValidator.validate_transition(
+                transition=StatusTransition(from_status=f, to_status=t),
+                setting=setting,
+            )
+            for f, t in zip(from_statuses, to_statuses)
+        ]
+        assert mask.dtype == np.bool_
+        assert mask.tolist() == expected_mask
+
+
+def test_validate_transitions_with_setting_codes() -> None:
+    rng = np.random.default_rng(seed=0)
+    size = 1000
+    from_codes = rng.integers(0, len(Status), size=size, dtype=np.int8)
+    to_codes = rng.integers(0, len(Status), size=size, dtype=np.int8)
+    settings = [
+        list(ExpectednessSetting)[code]
+        for code in rng.integers(0, len(ExpectednessSetting), size=size)
+    ]
+
+    mask = Engine.validate_transitions(
+        from_codes=from_codes,
+        to_codes=to_codes,
+        setting=Engine.encode_settings(settings),
+    )
+
+    for f, t, setting, is_valid in zip(
+        Engine.decode_statuses(from_codes),
+        Engine.decode_statuses(to_codes),
+        settings,
+        mask,
+    ):
+        assert is_valid == TransitionValidator.validate_transition(
+            transition=StatusTransition(from_status=f, to_status=t),
+            setting=setting,
+        )
+
+
+def test_get_expectedness_codes() -> None:
+    from_statuses, to_statuses = all_transitions()
+
+    codes = Engine.get_expectedness_codes(
+        from_codes=Engine.encode_statuses(from_statuses),
+        to_codes=Engine.encode_statuses(to_statuses),
+    )
+
+    assert Engine.decode_expectedness(codes) == [
+        TransitionToExpectednessMapper.get_expectedness(from_status=f, to_status=t)
+        for f, t in zip(from_statuses, to_statuses)
+    ]
+
+
+def test_rejects_out_of_range_codes() -> None:
+    valid_codes = Engine.encode_statuses([Status.PENDING, Status.PAID])
+
+    with pytest.raises(ValueError, match=r"from_codes .*\[1\]=-1"):
+        Engine.validate_transitions(
+            from_codes=np.array([0, -1], dtype=np.int8),
+            to_codes=valid_codes,
+            setting=ExpectednessSetting.ALLOW_ABNORMAL,
+        )
+    with pytest.raises(ValueError, match=rf"to_codes .*\[0\]={len(Status)}"):
+        Engine.get_expectedness_codes(
+            from_codes=valid_codes, to_codes=[len(Status), 0]
+        )
+    with pytest.raises(ValueError, match="setting"):
+        Engine.validate_transitions(
+            from_codes=valid_codes,
+            to_codes=valid_codes,
+            setting=np.array([0, len(ExpectednessSetting)], dtype=np.int8),
+        )
+    assert Engine.validate_transitions(
+        from_codes=[], to_codes=[], setting=ExpectednessSetting.ALLOW_ABNORMAL
+    ).tolist() == []
+
+
+def test_engine_is_singleton() -> None:
+    engine1 = TransitionValidationEngine()
+    engine2 = TransitionValidationEngine()
+    assert engine1 is engine2
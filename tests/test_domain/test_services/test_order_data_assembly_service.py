@@ -0,0 +1,149 @@
+from domain.services.order_data_assembly_service import (
+    OrderDataAssemblyService,
+    AsyncOrderDataAssemblyService,
+)
+from domain.services.order_data_service import OrderDataByCustomerIdService
+from domain.models.identifier import Identifier
+from domain.models.order import OrderData, PersistedOrder
+from domain.models.product import ProductVersion
+from domain.errors import ReadFromPersistenceError
+from test_domain.dummies import (
+    GetOrderByOrderIdDummy,
+    GetOrdersByCustomerIdDummy,
+    GetProductVersionsByIdDummy,
+    AsyncDummy,
+)
+from dataclasses import replace
+from typing import Callable
+import asyncio
+import pytest
+
+
+def create_service(
+    orders: list[PersistedOrder], product_versions: dict[Identifier, ProductVersion]
+) -> tuple[OrderDataAssemblyService, GetProductVersionsByIdDummy]:
+    product_versions_dummy = GetProductVersionsByIdDummy(
+        product_versions={version.id: version for version in product_versions.values()}
+    )
+    service = OrderDataAssemblyService(
+        get_order_by_order_id_spi=GetOrderByOrderIdDummy(
+            orders={order.id: order for order in orders}
+        ),
+        get_orders_by_customer_id_spi=GetOrdersByCustomerIdDummy(orders=orders),
+        get_product_versions_by_id_spi=product_versions_dummy,
+    )
+    return service, product_versions_dummy
+
+
+def test_get_order_data_by_order_id(
+    persisted_order: PersistedOrder,
+    product_versions: dict[Identifier, ProductVersion],
+    order_data: OrderData,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    service, _ = create_service(
+        orders=[persisted_order], product_versions=product_versions
+    )
+
+    assert service.get_order_data_by_order_id(order_id=persisted_order.id) == (
+        order_data
+    )
+    assert service.get_order_data_by_order_id(order_id=id_generator()) is None
+
+
+def test_resolves_distinct_product_versions_once(
+    persisted_order: PersistedOrder,
+    product_versions: dict[Identifier, ProductVersion],
+    order_data: OrderData,
+    id_generator: Callable[[], Identifier],
+) -> None:
+    # Setup:
+    orders = [replace(persisted_order, id=id_generator()) for _ in range(0, 50)]
+    service, product_versions_dummy = create_service(
+        orders=orders, product_versions=product_versions
+    )
+    order_data_service = OrderDataByCustomerIdService(order_data_spi=service)
+
+    # Run:
+    result = order_data_service.get_order_by_customer_id(
+        customer_id=persisted_order.customer_id
+    )
+
+    # Assert:
+    assert result == [replace(order_data, id=order.id) for order in orders]
+    assert len(product_versions_dummy.requested_ids) == 1
+    assert sorted(product_versions_dummy.requested_ids[0], key=str) == sorted(
+        (item.product_version_id for item in persisted_order.items), key=str
+    )
+    # Equal items and product versions share one instance across orders.
+    assert all(
+        item is first_item
+        for order in result
+        for item, first_item in zip(order.items, result[0].items)
+    )
+
+
+def test_shares_product_versions_between_different_items(
+    persisted_order: PersistedOrder,
+    product_versions: dict[Identifier, ProductVersion],
+) -> None:
+    service, _ = create_service(orders=[], product_versions=product_versions)
+    larger_items = [
+        replace(item, quantity=item.quantity + 1) for item in persisted_order.items
+    ]
+    orders = [persisted_order, replace(persisted_order, items=larger_items)]
+
+    result = service.assemble_order_data(orders=orders)
+
+    assert result[0].items[0] is not result[1].items[0]
+    assert result[0].items[0].product_version is result[1].items[0].product_version
+
+
+def test_orders_without_items_skip_the_catalogue(
+    persisted_order: PersistedOrder,
+) -> None:
+    service, product_versions_dummy = create_service(orders=[], product_versions={})
+
+    result = service.assemble_order_data(orders=[replace(persisted_order, items=[])])
+
+    assert result[0].items == []
+    assert product_versions_dummy.requested_ids == []
+
+
+def test_unresolved_product_version_raises(
+    persisted_order: PersistedOrder,
+) -> None:
+    service, _ = create_service(orders=[persisted_order], product_versions={})
+
+    with pytest.raises(ReadFromPersistenceError):
+        service.get_order_data_by_customer_id(customer_id=persisted_order.customer_id)
+
+
+def test_async_service(
+    persisted_order: PersistedOrder,
+    product_versions: dict[Identifier, ProductVersion],
+    order_data: OrderData,
+) -> None:
+    service = AsyncOrderDataAssemblyService(
+        get_order_by_order_id_spi=AsyncDummy(
+            GetOrderByOrderIdDummy(orders={persisted_order.id: persisted_order})
+        ),
+        get_orders_by_customer_id_spi=AsyncDummy(
+            GetOrdersByCustomerIdDummy(orders=[persisted_order])
+        ),
+        get_product_versions_by_id_spi=AsyncDummy(
+            GetProductVersionsByIdDummy(
+                product_versions={
+                    version.id: version for version in product_versions.values()
+                }
+            )
+        ),
+    )
+
+    assert (
+        asyncio.run(service.get_order_data_by_order_id(order_id=persisted_order.id))
+        == order_data
+    )
+    assert asyncio.run(
+        service.get_order_data_by_customer_id(customer_id=persisted_order.customer_id)
+    ) == [order_data]
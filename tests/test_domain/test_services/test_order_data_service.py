@@ -1,12 +1,35 @@
 from domain.services.order_data_service import (
     OrderDataByOrderIdService,
     OrderDataByCustomerIdService,
+    OrderDataPageByCustomerIdService,
+    AsyncOrderDataByOrderIdService,
+    AsyncOrderDataByCustomerIdService,
+    AsyncOrderDataPageByCustomerIdService,
 )
+from domain.models.identifier import Identifier
 from domain.models.order import OrderData
-from domain.errors import InvalidOrderIdError
-from test_domain.dummies import OrderDataByOrderIdDummy, OrderDataByCustomerIdDummy
+from domain.models.page import PageCursor
+from domain.errors import InvalidOrderIdError, InvalidPageCursorError
+from test_domain.dummies import (
+    OrderDataByOrderIdDummy,
+    OrderDataByCustomerIdDummy,
+    OrderDataPageByCustomerIdDummy,
+    AsyncDummy,
+)
+from dataclasses import replace
+from typing import AsyncIterator, Callable, TypeVar
+import asyncio
 import pytest
 
+T = TypeVar("T")
+
+
+@pytest.fixture
+def order_history(
+    order_data: OrderData, id_generator: Callable[[], Identifier]
+) -> list[OrderData]:
+    return [replace(order_data, id=id_generator()) for _ in range(0, 7)]
+
 
 def test_by_order_id_service_invalid_order_id(order_data: OrderData) -> None:
     order_data_by_order_id_dummy = OrderDataByOrderIdDummy()
@@ -50,3 +73,150 @@ def test_by_customer_id_service_success(order_data: OrderData) -> None:
     result = service.get_order_by_customer_id(customer_id=order_data.customer_id)
 
     assert result == expected_result
+
+
+def test_async_by_order_id_service(order_data: OrderData) -> None:
+    order_data_by_order_id_dummy = OrderDataByOrderIdDummy()
+    service = AsyncOrderDataByOrderIdService(
+        order_data_spi=AsyncDummy(order_data_by_order_id_dummy)
+    )
+
+    with pytest.raises(InvalidOrderIdError):
+        asyncio.run(service.get_order_by_order_id(order_id=order_data.id))
+
+    order_data_by_order_id_dummy.order_data = order_data
+    result = asyncio.run(service.get_order_by_order_id(order_id=order_data.id))
+    assert result == order_data
+
+
+def test_async_by_customer_id_service(order_data: OrderData) -> None:
+    expected_result = [order_data] * 5
+    service = AsyncOrderDataByCustomerIdService(
+        order_data_spi=AsyncDummy(
+            OrderDataByCustomerIdDummy(order_data_list=expected_result)
+        )
+    )
+
+    result = asyncio.run(
+        service.get_order_by_customer_id(customer_id=order_data.customer_id)
+    )
+
+    assert result == expected_result
+
+
+def test_page_service_walks_all_pages(order_history: list[OrderData]) -> None:
+    # Setup:
+    page_dummy = OrderDataPageByCustomerIdDummy(order_data_list=order_history)
+    service = OrderDataPageByCustomerIdService(order_data_page_spi=page_dummy)
+    customer_id = order_history[0].customer_id
+
+    # Run:
+    pages = [service.get_order_page_by_customer_id(customer_id, page_size=3)]
+    while pages[-1].next_cursor is not None:
+        pages.append(
+            service.get_order_page_by_customer_id(
+                customer_id, page_size=3, cursor=pages[-1].next_cursor
+            )
+        )
+
+    # Assert:
+    assert [page.items for page in pages] == [
+        order_history[0:3],
+        order_history[3:6],
+        order_history[6:],
+    ]
+    assert page_dummy.requested_limits == [4, 4, 4]
+
+
+def test_page_service_last_full_page_has_no_cursor(
+    order_history: list[OrderData],
+) -> None:
+    service = OrderDataPageByCustomerIdService(
+        order_data_page_spi=OrderDataPageByCustomerIdDummy(
+            order_data_list=order_history
+        )
+    )
+
+    page = service.get_order_page_by_customer_id(
+        order_history[0].customer_id, page_size=len(order_history)
+    )
+
+    assert page.items == order_history
+    assert page.next_cursor is None
+
+
+def test_page_service_rejects_foreign_cursor(
+    order_history: list[OrderData], id_generator: Callable[[], Identifier]
+) -> None:
+    service = OrderDataPageByCustomerIdService(
+        order_data_page_spi=OrderDataPageByCustomerIdDummy(
+            order_data_list=order_history
+        )
+    )
+    cursor = PageCursor(customer_id=id_generator(), last_order_id=order_history[0].id)
+
+    with pytest.raises(InvalidPageCursorError):
+        service.get_order_page_by_customer_id(
+            order_history[0].customer_id, page_size=3, cursor=cursor
+        )
+
+
+@pytest.mark.parametrize("page_size", [0, 11])
+def test_page_service_rejects_page_size(
+    order_history: list[OrderData], page_size: int
+) -> None:
+    service = OrderDataPageByCustomerIdService(
+        order_data_page_spi=OrderDataPageByCustomerIdDummy(), max_page_size=10
+    )
+
+    with pytest.raises(ValueError):
+        service.get_order_page_by_customer_id(
+            order_history[0].customer_id, page_size=page_size
+        )
+
+
+@pytest.mark.parametrize("chunk_size, expected_reads", [(3, 3), (7, 2), (10, 1)])
+def test_iter_order_data_streams_chunks(
+    order_history: list[OrderData], chunk_size: int, expected_reads: int
+) -> None:
+    page_dummy = OrderDataPageByCustomerIdDummy(order_data_list=order_history)
+    service = OrderDataPageByCustomerIdService(order_data_page_spi=page_dummy)
+
+    chunks = list(
+        service.iter_order_data_by_customer_id(
+            order_history[0].customer_id, chunk_size=chunk_size
+        )
+    )
+
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert [order for chunk in chunks for order in chunk] == order_history
+    assert len(page_dummy.requested_limits) == expected_reads
+
+
+async def collect(iterator: AsyncIterator[T]) -> list[T]:
+    return [item async for item in iterator]
+
+
+def test_async_page_service(order_history: list[OrderData]) -> None:
+    service = AsyncOrderDataPageByCustomerIdService(
+        order_data_page_spi=AsyncDummy(
+            OrderDataPageByCustomerIdDummy(order_data_list=order_history)
+        )
+    )
+    customer_id = order_history[0].customer_id
+
+    first_page = asyncio.run(
+        service.get_order_page_by_customer_id(customer_id, page_size=5)
+    )
+    second_page = asyncio.run(
+        service.get_order_page_by_customer_id(
+            customer_id, page_size=5, cursor=first_page.next_cursor
+        )
+    )
+    chunks = asyncio.run(
+        collect(service.iter_order_data_by_customer_id(customer_id, chunk_size=3))
+    )
+
+    assert first_page.items + second_page.items == order_history
+    assert second_page.next_cursor is None
+    assert [order for chunk in chunks for order in chunk] == order_history
@@ -1,20 +1,36 @@
-from domain.services.place_order_service import PlaceOrderService
+from domain.services.place_order_service import (
+    PlaceOrderService,
+    AsyncPlaceOrderService,
+)
 from domain.models.identifier import Identifier
 from domain.models.order import (
     RequestedOrder,
     VersionedOrder,
     PersistedOrder,
+    Item,
 )
 from domain.models.event import DispatchableEvent
-from domain.errors import InvalidProductIdError, NoCurrentProductVersionError
+from domain.models.identifier import SnowflakeIdGenerator
+from domain.models.order_status import Status
+from domain.errors import (
+    IdempotencyKeyReusedError,
+    InvalidProductIdError,
+    NoCurrentProductVersionError,
+)
 from test_domain.dummies import (
     SaveOrderDummy,
+    SaveOrdersDummy,
+    InsertOrdersDummy,
     GetProductVersionIdsDummy,
     EventDispatcherDummy,
+    BatchEventDispatcherDummy,
     StatusToEventMapperDummy,
+    PlaceOrderIdempotencyDummy,
+    AsyncDummy,
 )
 from typing import Callable
 from dataclasses import dataclass
+import asyncio
 import pytest
 
 
@@ -25,6 +41,8 @@ class Dummies:
     save_order_dummy: SaveOrderDummy
     event_dispatcher_dummy: EventDispatcherDummy
     status_to_event_mapper_dummy: StatusToEventMapperDummy
+    save_orders_dummy: SaveOrdersDummy
+    batch_event_dispatcher_dummy: BatchEventDispatcherDummy
 
 
 @pytest.fixture
@@ -38,6 +56,8 @@ def dummies(
         save_order_dummy=SaveOrderDummy(persisted_order_to_return=persisted_order),
         event_dispatcher_dummy=EventDispatcherDummy(),
         status_to_event_mapper_dummy=StatusToEventMapperDummy(),
+        save_orders_dummy=SaveOrdersDummy(),
+        batch_event_dispatcher_dummy=BatchEventDispatcherDummy(),
     )
     return dummies
 
@@ -49,6 +69,28 @@ def service(dummies: Dummies) -> PlaceOrderService:
         save_order_spi=dummies.save_order_dummy,
         event_dispatcher=dummies.event_dispatcher_dummy,
         _event_mapper=dummies.status_to_event_mapper_dummy,
+        save_orders_spi=dummies.save_orders_dummy,
+        batch_event_dispatcher=dummies.batch_event_dispatcher_dummy,
+    )
+
+
+@pytest.fixture
+def other_requested_order(
+    id_generator: Callable[[], Identifier],
+    requested_order: RequestedOrder,
+    product_version_ids: dict[Identifier, Identifier],
+) -> RequestedOrder:
+    """
+    Returns a second `RequestedOrder` with its own product ids,
+    which are also added to `product_version_ids`.
+    """
+    items = [Item(product_id=id_generator(), quantity=1) for _ in range(0, 3)]
+    for item in items:
+        product_version_ids[item.product_id] = id_generator()
+    return RequestedOrder(
+        customer_id=id_generator(),
+        shipping_address=requested_order.shipping_address,
+        items=items,
     )
 
 
@@ -133,3 +175,410 @@ class TestPlaceOrderService:
         assert persisted_order_result == persisted_order
         assert dummies.save_order_dummy.read() == [versioned_order]
         assert dummies.event_dispatcher_dummy.read() == [expected_event]
+
+
+class TestPlaceOrdersService:
+    @staticmethod
+    def test_place_orders_success(
+        product_version_ids: dict[Identifier, Identifier],
+        requested_order: RequestedOrder,
+        other_requested_order: RequestedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+        service: PlaceOrderService,
+    ) -> None:
+        """
+        Assert that all product ids are looked up in a single call,
+        that all orders are saved in a single bulk write
+        and that all events are dispatched as a single batch.
+        """
+        # Setup:
+        event_type = DispatchableEvent.EventType.CANCELLED
+        dummies.status_to_event_mapper_dummy.event_type = event_type
+        other_persisted_order = persisted_order.update_status(
+            new_status=persisted_order.status
+        )
+        dummies.save_orders_dummy.persisted_orders_to_return = [
+            persisted_order,
+            other_persisted_order,
+        ]
+        requested_orders = [requested_order, other_requested_order]
+
+        # Run:
+        results = service.place_orders(requested_orders=requested_orders)
+
+        # Assert:
+        assert results == [persisted_order, other_persisted_order]
+        assert dummies.get_product_version_ids_dummy.requested_product_ids == [
+            requested_order.get_product_ids() + other_requested_order.get_product_ids()
+        ]
+        assert dummies.save_orders_dummy.read() == [
+            [
+                order.to_versioned_order(product_versions=product_version_ids)
+                for order in requested_orders
+            ]
+        ]
+        assert dummies.batch_event_dispatcher_dummy.read() == [
+            [
+                DispatchableEvent(order=persisted_order, event_type=event_type),
+                DispatchableEvent(order=other_persisted_order, event_type=event_type),
+            ]
+        ]
+        assert dummies.save_order_dummy.is_empty()
+        assert dummies.event_dispatcher_dummy.is_empty()
+
+    @staticmethod
+    def test_place_orders_reports_errors_per_order(
+        id_generator: Callable[[], Identifier],
+        product_version_ids: dict[Identifier, Identifier],
+        requested_order: RequestedOrder,
+        other_requested_order: RequestedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+        service: PlaceOrderService,
+    ) -> None:
+        """
+        Assert that an invalid product id or a missing product version
+        only fails the order it belongs to.
+        """
+        # Setup:
+        invalid_product_id = requested_order.get_product_ids()[0]
+        product_id_without_version = id_generator()
+        order_without_version = RequestedOrder(
+            customer_id=id_generator(),
+            shipping_address=requested_order.shipping_address,
+            items=[Item(product_id=product_id_without_version, quantity=1)],
+        )
+        dummies.get_product_version_ids_dummy.invalid_ids = {invalid_product_id}
+        dummies.get_product_version_ids_dummy.ids_without_product_version_id = {
+            product_id_without_version
+        }
+        dummies.save_orders_dummy.persisted_orders_to_return = [persisted_order]
+
+        # Run:
+        results = service.place_orders(
+            requested_orders=[
+                requested_order,
+                other_requested_order,
+                order_without_version,
+            ]
+        )
+
+        # Assert:
+        assert isinstance(results[0], InvalidProductIdError)
+        assert results[0].product_id == invalid_product_id
+        assert results[1] == persisted_order
+        assert isinstance(results[2], NoCurrentProductVersionError)
+        assert results[2].product_id == product_id_without_version
+        assert dummies.save_orders_dummy.read() == [
+            [
+                other_requested_order.to_versioned_order(
+                    product_versions=product_version_ids
+                )
+            ]
+        ]
+
+    @staticmethod
+    def test_place_orders_without_bulk_dependencies(
+        product_version_ids: dict[Identifier, Identifier],
+        requested_order: RequestedOrder,
+        versioned_order: VersionedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+    ) -> None:
+        """
+        Assert that the single order dependencies are used
+        when no bulk dependencies are provided.
+        """
+        # Setup:
+        service = PlaceOrderService(
+            get_product_version_ids_spi=dummies.get_product_version_ids_dummy,
+            save_order_spi=dummies.save_order_dummy,
+            event_dispatcher=dummies.event_dispatcher_dummy,
+            _event_mapper=dummies.status_to_event_mapper_dummy,
+        )
+        event_type = DispatchableEvent.EventType.CANCELLED
+        dummies.status_to_event_mapper_dummy.event_type = event_type
+
+        # Run:
+        results = service.place_orders(requested_orders=[requested_order])
+
+        # Assert:
+        assert results == [persisted_order]
+        assert dummies.save_order_dummy.read() == [versioned_order]
+        assert dummies.event_dispatcher_dummy.read() == [
+            DispatchableEvent(order=persisted_order, event_type=event_type)
+        ]
+
+    @staticmethod
+    def test_place_no_orders(service: PlaceOrderService, dummies: Dummies) -> None:
+        """
+        Assert that an empty request calls no dependency.
+        """
+        # Run:
+        results = service.place_orders(requested_orders=[])
+
+        # Assert:
+        assert results == []
+        assert dummies.get_product_version_ids_dummy.requested_product_ids == []
+        assert dummies.save_orders_dummy.is_empty()
+        assert dummies.batch_event_dispatcher_dummy.is_empty()
+
+
+class TestPlaceOrderServiceWithClientSideIds:
+    @staticmethod
+    def test_place_order_assigns_id_before_insert(
+        requested_order: RequestedOrder,
+        versioned_order: VersionedOrder,
+        dummies: Dummies,
+    ) -> None:
+        """
+        Assert that the id is generated by the service
+        and that the order is inserted without calling `save_order`.
+        """
+        # Setup:
+        insert_orders_dummy = InsertOrdersDummy()
+        service = PlaceOrderService(
+            get_product_version_ids_spi=dummies.get_product_version_ids_dummy,
+            save_order_spi=dummies.save_order_dummy,
+            event_dispatcher=dummies.event_dispatcher_dummy,
+            order_id_generator=SnowflakeIdGenerator(worker_id=0),
+            insert_orders_spi=insert_orders_dummy,
+        )
+
+        # Run:
+        result = service.place_order(requested_order=requested_order)
+
+        # Assert:
+        assert result.items == versioned_order.items
+        assert result.status == Status.PENDING
+        assert insert_orders_dummy.read() == [[result]]
+        assert dummies.save_order_dummy.is_empty()
+        assert dummies.event_dispatcher_dummy.read() == [
+            DispatchableEvent(
+                order=result,
+                event_type=DispatchableEvent.EventType.TO_BE_ACCEPTED_BY_INVENTORY,
+            )
+        ]
+
+    @staticmethod
+    def test_place_orders_inserts_batch_with_ordered_ids(
+        requested_order: RequestedOrder,
+        other_requested_order: RequestedOrder,
+        dummies: Dummies,
+    ) -> None:
+        # Setup:
+        insert_orders_dummy = InsertOrdersDummy()
+        service = PlaceOrderService(
+            get_product_version_ids_spi=dummies.get_product_version_ids_dummy,
+            save_order_spi=dummies.save_order_dummy,
+            event_dispatcher=dummies.event_dispatcher_dummy,
+            save_orders_spi=dummies.save_orders_dummy,
+            order_id_generator=SnowflakeIdGenerator(worker_id=0),
+            insert_orders_spi=insert_orders_dummy,
+        )
+
+        # Run:
+        results = service.place_orders(
+            requested_orders=[requested_order, other_requested_order]
+        )
+
+        # Assert:
+        assert insert_orders_dummy.read() == [results]
+        assert results[0].id < results[1].id
+        assert dummies.save_orders_dummy.is_empty()
+
+    @staticmethod
+    def test_requires_generator_and_insert_spi_together(dummies: Dummies) -> None:
+        with pytest.raises(ValueError):
+            PlaceOrderService(
+                get_product_version_ids_spi=dummies.get_product_version_ids_dummy,
+                save_order_spi=dummies.save_order_dummy,
+                event_dispatcher=dummies.event_dispatcher_dummy,
+                order_id_generator=SnowflakeIdGenerator(worker_id=0),
+            )
+
+
+@pytest.fixture
+def async_service(dummies: Dummies) -> AsyncPlaceOrderService:
+    return AsyncPlaceOrderService(
+        get_product_version_ids_spi=AsyncDummy(dummies.get_product_version_ids_dummy),
+        save_order_spi=AsyncDummy(dummies.save_order_dummy),
+        event_dispatcher=AsyncDummy(dummies.event_dispatcher_dummy),
+        _event_mapper=dummies.status_to_event_mapper_dummy,
+    )
+
+
+class TestAsyncPlaceOrderService:
+    @staticmethod
+    def test_raise_on_invalid_product_id(
+        id_generator: Callable[[], Identifier],
+        requested_order: RequestedOrder,
+        dummies: Dummies,
+        async_service: AsyncPlaceOrderService,
+    ) -> None:
+        # Setup:
+        invalid_product_id = id_generator()
+        dummies.get_product_version_ids_dummy.invalid_ids = {invalid_product_id}
+
+        # Run:
+        with pytest.raises(InvalidProductIdError) as error_info:
+            asyncio.run(async_service.place_order(requested_order=requested_order))
+
+        # Assert:
+        assert error_info.value.product_id == invalid_product_id
+        assert dummies.save_order_dummy.is_empty()
+        assert dummies.event_dispatcher_dummy.is_empty()
+
+    @staticmethod
+    def test_place_order_success(
+        requested_order: RequestedOrder,
+        versioned_order: VersionedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+        async_service: AsyncPlaceOrderService,
+    ) -> None:
+        # Setup:
+        event_type = DispatchableEvent.EventType.CANCELLED
+        expected_event = DispatchableEvent(order=persisted_order, event_type=event_type)
+        dummies.status_to_event_mapper_dummy.event_type = event_type
+
+        # Run:
+        result = asyncio.run(
+            async_service.place_order(requested_order=requested_order)
+        )
+
+        # Assert:
+        assert result == persisted_order
+        assert dummies.save_order_dummy.read() == [versioned_order]
+        assert dummies.event_dispatcher_dummy.read() == [expected_event]
+
+    @staticmethod
+    def test_place_orders_reports_errors_per_order(
+        requested_order: RequestedOrder,
+        other_requested_order: RequestedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+        async_service: AsyncPlaceOrderService,
+    ) -> None:
+        # Setup:
+        invalid_product_id = other_requested_order.get_product_ids()[0]
+        dummies.get_product_version_ids_dummy.invalid_ids = {invalid_product_id}
+
+        # Run:
+        results = asyncio.run(
+            async_service.place_orders(
+                requested_orders=[requested_order, other_requested_order]
+            )
+        )
+
+        # Assert:
+        assert results[0] == persisted_order
+        assert isinstance(results[1], InvalidProductIdError)
+        assert results[1].product_id == invalid_product_id
+        assert len(dummies.get_product_version_ids_dummy.requested_product_ids) == 1
+        assert len(dummies.save_order_dummy.read()) == 1
+
+
+class TestPlaceOrderServiceWithIdempotencyKey:
+    @staticmethod
+    @pytest.fixture
+    def idempotency_dummy() -> PlaceOrderIdempotencyDummy:
+        return PlaceOrderIdempotencyDummy()
+
+    @staticmethod
+    def test_repeated_key_returns_placed_order(
+        requested_order: RequestedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+        service: PlaceOrderService,
+        idempotency_dummy: PlaceOrderIdempotencyDummy,
+    ) -> None:
+        """
+        Assert that a retry with the same key returns the placed order
+        without looking up products, saving or dispatching again.
+        """
+        # Setup:
+        service.idempotency_spi = idempotency_dummy
+        dummies.status_to_event_mapper_dummy.event_type = (
+            DispatchableEvent.EventType.CANCELLED
+        )
+
+        # Run:
+        results = [
+            service.place_order(requested_order=requested_order, idempotency_key="a")
+            for _ in range(0, 3)
+        ]
+
+        # Assert:
+        assert results == [persisted_order] * 3
+        assert len(dummies.get_product_version_ids_dummy.requested_product_ids) == 1
+        assert len(dummies.save_order_dummy.read()) == 1
+        assert len(dummies.event_dispatcher_dummy.read()) == 1
+        assert idempotency_dummy.placed_orders == {"a": persisted_order}
+
+    @staticmethod
+    def test_reused_key_raises(
+        requested_order: RequestedOrder,
+        other_requested_order: RequestedOrder,
+        service: PlaceOrderService,
+        idempotency_dummy: PlaceOrderIdempotencyDummy,
+    ) -> None:
+        # Setup:
+        service.idempotency_spi = idempotency_dummy
+        service.place_order(requested_order=requested_order, idempotency_key="a")
+
+        # Run:
+        with pytest.raises(IdempotencyKeyReusedError) as error_info:
+            service.place_order(
+                requested_order=other_requested_order, idempotency_key="a"
+            )
+
+        # Assert:
+        assert error_info.value.idempotency_key == "a"
+
+    @staticmethod
+    def test_failure_releases_key(
+        id_generator: Callable[[], Identifier],
+        requested_order: RequestedOrder,
+        dummies: Dummies,
+        service: PlaceOrderService,
+        idempotency_dummy: PlaceOrderIdempotencyDummy,
+    ) -> None:
+        # Setup:
+        service.idempotency_spi = idempotency_dummy
+        dummies.get_product_version_ids_dummy.invalid_ids = {id_generator()}
+
+        # Run:
+        with pytest.raises(InvalidProductIdError):
+            service.place_order(requested_order=requested_order, idempotency_key="a")
+
+        # Assert:
+        assert idempotency_dummy.released_keys == ["a"]
+        assert idempotency_dummy.placed_orders == {}
+
+    @staticmethod
+    def test_async_repeated_key_returns_placed_order(
+        requested_order: RequestedOrder,
+        persisted_order: PersistedOrder,
+        dummies: Dummies,
+        async_service: AsyncPlaceOrderService,
+        idempotency_dummy: PlaceOrderIdempotencyDummy,
+    ) -> None:
+        # Setup:
+        async_service.idempotency_spi = AsyncDummy(idempotency_dummy)
+
+        async def place_twice() -> list[PersistedOrder]:
+            return [
+                await async_service.place_order(
+                    requested_order=requested_order, idempotency_key="a"
+                )
+                for _ in range(0, 2)
+            ]
+
+        # Run:
+        results = asyncio.run(place_twice())
+
+        # Assert:
+        assert results == [persisted_order] * 2
+        assert len(dummies.save_order_dummy.read()) == 1
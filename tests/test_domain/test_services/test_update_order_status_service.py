@@ -2,19 +2,29 @@ from domain.models.identifier import Identifier
 from domain.models.order import PersistedOrder
 from domain.models.order_status import Status
 from domain.models.event import DispatchableEvent
+from domain.models.status_transition_validator import ExpectednessSetting
 from domain.services.update_order_status_service import (
     UpdateOrderStatusService,
+    AsyncUpdateOrderStatusService,
+)
+from domain.errors import (
+    InvalidOrderIdError,
+    InsufficientExpectednessError,
+    UpdateConflictError,
 )
-from domain.errors import InvalidOrderIdError, InsufficientExpectednessError
 from test_domain.dummies import (
     UpdateOrderDummy,
     GetOrderByOrderIdDummy,
+    ConditionalUpdateOrderDummy,
     EventDispatcherDummy,
+    BatchEventDispatcherDummy,
     StatusToEventMapperDummy,
     TransitionValidatorDummy,
+    AsyncDummy,
 )
 from typing import Callable
 from dataclasses import dataclass
+import asyncio
 import pytest
 
 
@@ -126,3 +136,352 @@ def test_update_order_status_success(
     assert result == expected_result
     assert dummies.update_order_dummy.read() == {persisted_order.id: new_status}
     assert dummies.event_dispatcher_dummy.read() == [expected_event]
+
+
+def test_update_order_status_to_delivered_dispatches_event(
+    persisted_order: PersistedOrder, dummies: Dummies
+) -> None:
+    # Setup:
+    shipped_order = persisted_order.update_status(new_status=Status.SHIPPED)
+    dummies.get_order_by_id_dummy.add(shipped_order)
+    service = UpdateOrderStatusService(
+        update_order_spi=dummies.update_order_dummy,
+        get_order_by_order_id_spi=dummies.get_order_by_id_dummy,
+        status_update_event_dispatcher_spi=dummies.event_dispatcher_dummy,
+    )
+
+    # Run:
+    result = service.update_order_status(
+        order_id=persisted_order.id, new_status=Status.DELIVERED
+    )
+
+    # Assert:
+    assert dummies.event_dispatcher_dummy.read() == [
+        DispatchableEvent(
+            order=result, event_type=DispatchableEvent.EventType.DELIVERED
+        )
+    ]
+
+
+def test_update_order_statuses_bulk(
+    id_generator: Callable[[], Identifier],
+    persisted_order: PersistedOrder,
+    dummies: Dummies,
+) -> None:
+    """
+    Assert that orders are read with a single multi-get,
+    that valid transitions are written with a single bulk update
+    and that every update gets its own result.
+    """
+
+    # Setup:
+    batch_event_dispatcher_dummy = BatchEventDispatcherDummy()
+    service = UpdateOrderStatusService(
+        update_order_spi=dummies.update_order_dummy,
+        get_order_by_order_id_spi=dummies.get_order_by_id_dummy,
+        status_update_event_dispatcher_spi=dummies.event_dispatcher_dummy,
+        update_orders_spi=dummies.update_order_dummy,
+        get_orders_by_order_ids_spi=dummies.get_order_by_id_dummy,
+        status_update_event_batch_dispatcher_spi=batch_event_dispatcher_dummy,
+    )
+    dummies.get_order_by_id_dummy.add(persisted_order)
+    invalid_order_id = id_generator()
+    E = ExpectednessSetting
+    accepted_order = persisted_order.update_status(Status.ACCEPTED_BY_INVENTORY)
+    paid_order = persisted_order.update_status(Status.PAID)
+    T = DispatchableEvent.EventType
+
+    # Run:
+    results = service.update_order_statuses(
+        updates=[
+            (persisted_order.id, Status.ACCEPTED_BY_INVENTORY, E.REQUIRE_NEXT_UP),
+            (invalid_order_id, Status.PAID, E.ALLOW_ABNORMAL),
+            (persisted_order.id, Status.PAID, E.REQUIRE_NEXT_UP),
+            (persisted_order.id, Status.PENDING, E.REQUIRE_FORSEEN),
+        ]
+    )
+
+    # Assert:
+    assert results[0] == accepted_order
+    assert isinstance(results[1], InvalidOrderIdError)
+    assert results[1].order_id == invalid_order_id
+    assert results[2] == paid_order
+    assert isinstance(results[3], InsufficientExpectednessError)
+    assert dummies.get_order_by_id_dummy.bulk_reads == [
+        [persisted_order.id, invalid_order_id]
+    ]
+    assert dummies.update_order_dummy.bulk_writes == [{persisted_order.id: Status.PAID}]
+    assert batch_event_dispatcher_dummy.read() == [
+        [
+            DispatchableEvent(order=accepted_order, event_type=T.TO_BE_PAID),
+            DispatchableEvent(order=paid_order, event_type=T.TO_BE_SHIPPED),
+        ]
+    ]
+    assert dummies.event_dispatcher_dummy.is_empty()
+
+
+def test_update_order_statuses_without_bulk_dependencies(
+    persisted_order: PersistedOrder,
+    dummies: Dummies,
+    service: UpdateOrderStatusService,
+) -> None:
+    """
+    Assert that the single order dependencies are used
+    when no bulk dependencies are provided.
+    """
+
+    # Setup:
+    dummies.get_order_by_id_dummy.add(persisted_order)
+    dummies.transition_validator_dummy.set_valid()
+    new_status = Status.ACCEPTED_BY_INVENTORY
+    expected_result = persisted_order.update_status(new_status=new_status)
+    event_type = DispatchableEvent.EventType.CANCELLED
+    dummies.status_to_event_mapper_dummy.event_type = event_type
+
+    # Run:
+    results = service.update_order_statuses(
+        updates=[
+            (persisted_order.id, new_status, ExpectednessSetting.REQUIRE_NEXT_UP)
+        ]
+    )
+
+    # Assert:
+    assert results == [expected_result]
+    assert dummies.update_order_dummy.read() == {persisted_order.id: new_status}
+    assert dummies.update_order_dummy.bulk_writes == []
+    assert dummies.event_dispatcher_dummy.read() == [
+        DispatchableEvent(order=expected_result, event_type=event_type)
+    ]
+
+
+@pytest.fixture
+def async_service(dummies: Dummies) -> AsyncUpdateOrderStatusService:
+    return AsyncUpdateOrderStatusService(
+        update_order_spi=AsyncDummy(dummies.update_order_dummy),
+        get_order_by_order_id_spi=AsyncDummy(dummies.get_order_by_id_dummy),
+        status_update_event_dispatcher_spi=AsyncDummy(dummies.event_dispatcher_dummy),
+        _transition_validator=dummies.transition_validator_dummy,
+        _status_to_event_mapper=dummies.status_to_event_mapper_dummy,
+    )
+
+
+def test_async_update_order_status_invalid_order_id(
+    id_generator: Callable[[], Identifier],
+    dummies: Dummies,
+    async_service: AsyncUpdateOrderStatusService,
+) -> None:
+    order_id = id_generator()
+
+    with pytest.raises(InvalidOrderIdError) as error_info:
+        asyncio.run(
+            async_service.update_order_status(
+                order_id=order_id, new_status=Status.PENDING
+            )
+        )
+
+    assert error_info.value.order_id == order_id
+    assert dummies.update_order_dummy.is_empty()
+    assert dummies.event_dispatcher_dummy.is_empty()
+
+
+def test_async_update_order_status_invalid_transition(
+    persisted_order: PersistedOrder,
+    dummies: Dummies,
+    async_service: AsyncUpdateOrderStatusService,
+) -> None:
+    dummies.get_order_by_id_dummy.add(persisted_order)
+    dummies.transition_validator_dummy.set_invalid()
+
+    with pytest.raises(InsufficientExpectednessError):
+        asyncio.run(
+            async_service.update_order_status(
+                order_id=persisted_order.id, new_status=Status.PENDING
+            )
+        )
+
+    assert dummies.update_order_dummy.is_empty()
+    assert dummies.event_dispatcher_dummy.is_empty()
+
+
+def test_async_update_order_status_success(
+    persisted_order: PersistedOrder,
+    dummies: Dummies,
+    async_service: AsyncUpdateOrderStatusService,
+) -> None:
+    dummies.get_order_by_id_dummy.add(persisted_order)
+    dummies.transition_validator_dummy.set_valid()
+    new_status = Status.ACCEPTED_BY_INVENTORY
+    expected_result = persisted_order.update_status(new_status=new_status)
+    event_type = DispatchableEvent.EventType.CANCELLED
+    dummies.status_to_event_mapper_dummy.event_type = event_type
+
+    result = asyncio.run(
+        async_service.update_order_status(
+            order_id=persisted_order.id, new_status=new_status
+        )
+    )
+
+    assert result == expected_result
+    assert dummies.update_order_dummy.read() == {persisted_order.id: new_status}
+    assert dummies.event_dispatcher_dummy.read() == [
+        DispatchableEvent(order=expected_result, event_type=event_type)
+    ]
+
+
+def test_async_update_order_statuses_without_bulk_dependencies(
+    id_generator: Callable[[], Identifier],
+    persisted_order: PersistedOrder,
+    dummies: Dummies,
+    async_service: AsyncUpdateOrderStatusService,
+) -> None:
+    dummies.get_order_by_id_dummy.add(persisted_order)
+    dummies.transition_validator_dummy.set_valid()
+    invalid_order_id = id_generator()
+    new_status = Status.ACCEPTED_BY_INVENTORY
+    E = ExpectednessSetting
+
+    results = asyncio.run(
+        async_service.update_order_statuses(
+            updates=[
+                (persisted_order.id, new_status, E.REQUIRE_NEXT_UP),
+                (invalid_order_id, new_status, E.REQUIRE_NEXT_UP),
+            ]
+        )
+    )
+
+    assert results[0] == persisted_order.update_status(new_status=new_status)
+    assert isinstance(results[1], InvalidOrderIdError)
+    assert dummies.update_order_dummy.read() == {persisted_order.id: new_status}
+
+
+def create_conditional_service(
+    persisted_order: PersistedOrder, concurrent_statuses: list[Status]
+) -> tuple[UpdateOrderStatusService, ConditionalUpdateOrderDummy, UpdateOrderDummy]:
+    get_order_dummy = GetOrderByOrderIdDummy()
+    get_order_dummy.add(persisted_order)
+    conditional_update_dummy = ConditionalUpdateOrderDummy(
+        get_order_dummy=get_order_dummy, concurrent_statuses=concurrent_statuses
+    )
+    update_order_dummy = UpdateOrderDummy()
+    service = UpdateOrderStatusService(
+        update_order_spi=update_order_dummy,
+        get_order_by_order_id_spi=get_order_dummy,
+        status_update_event_dispatcher_spi=EventDispatcherDummy(),
+        conditional_update_order_spi=conditional_update_dummy,
+        max_conflict_retries=2,
+        get_orders_by_order_ids_spi=get_order_dummy,
+    )
+    return service, conditional_update_dummy, update_order_dummy
+
+
+def test_conditional_update_retries_after_conflict(
+    persisted_order: PersistedOrder,
+) -> None:
+    # Setup:
+    # A concurrent update accepts the order between the read and the write.
+    service, conditional_update_dummy, update_order_dummy = (
+        create_conditional_service(
+            persisted_order=persisted_order,
+            concurrent_statuses=[Status.ACCEPTED_BY_INVENTORY],
+        )
+    )
+
+    # Run:
+    result = service.update_order_status(
+        order_id=persisted_order.id,
+        new_status=Status.PAID,
+        setting=ExpectednessSetting.REQUIRE_FORSEEN,
+    )
+
+    # Assert:
+    assert result == persisted_order.update_status(new_status=Status.PAID)
+    assert conditional_update_dummy.attempts == 2
+    assert update_order_dummy.is_empty()
+
+
+def test_conditional_update_revalidates_after_conflict(
+    persisted_order: PersistedOrder,
+) -> None:
+    # A concurrent update accepts the order between the read and the write.
+    service, conditional_update_dummy, _ = create_conditional_service(
+        persisted_order=persisted_order,
+        concurrent_statuses=[Status.ACCEPTED_BY_INVENTORY],
+    )
+
+    # Accepting it again is no longer a valid transition.
+    with pytest.raises(InsufficientExpectednessError):
+        service.update_order_status(
+            order_id=persisted_order.id, new_status=Status.ACCEPTED_BY_INVENTORY
+        )
+
+    assert conditional_update_dummy.attempts == 1
+
+
+def test_conditional_update_gives_up_after_retries(
+    persisted_order: PersistedOrder,
+) -> None:
+    # Every attempt is overtaken by a concurrent update.
+    service, conditional_update_dummy, _ = create_conditional_service(
+        persisted_order=persisted_order,
+        concurrent_statuses=[Status.ACCEPTED_BY_INVENTORY, Status.PENDING] * 5,
+    )
+
+    with pytest.raises(UpdateConflictError) as error_info:
+        service.update_order_status(
+            order_id=persisted_order.id,
+            new_status=Status.PAID,
+            setting=ExpectednessSetting.REQUIRE_FORSEEN,
+        )
+
+    assert error_info.value.order_id == persisted_order.id
+    assert conditional_update_dummy.attempts == 3
+
+
+def test_conditional_update_statuses(persisted_order: PersistedOrder) -> None:
+    service, conditional_update_dummy, _ = create_conditional_service(
+        persisted_order=persisted_order, concurrent_statuses=[]
+    )
+    setting = ExpectednessSetting.REQUIRE_NEXT_UP
+
+    results = service.update_order_statuses(
+        updates=[
+            (persisted_order.id, Status.ACCEPTED_BY_INVENTORY, setting),
+            (persisted_order.id, Status.ACCEPTED_BY_INVENTORY, setting),
+            (persisted_order.id, Status.PAID, setting),
+        ]
+    )
+
+    assert [type(result) for result in results] == [
+        PersistedOrder,
+        InsufficientExpectednessError,
+        PersistedOrder,
+    ]
+    assert conditional_update_dummy.attempts == 2
+    # The orders are read in bulk before the conditional writes.
+    assert conditional_update_dummy.get_order_dummy.bulk_reads == [
+        [persisted_order.id]
+    ]
+
+
+def test_async_conditional_update(persisted_order: PersistedOrder) -> None:
+    get_order_dummy = GetOrderByOrderIdDummy()
+    get_order_dummy.add(persisted_order)
+    conditional_update_dummy = ConditionalUpdateOrderDummy(
+        get_order_dummy=get_order_dummy,
+        concurrent_statuses=[Status.ACCEPTED_BY_INVENTORY],
+    )
+    service = AsyncUpdateOrderStatusService(
+        update_order_spi=AsyncDummy(UpdateOrderDummy()),
+        get_order_by_order_id_spi=AsyncDummy(get_order_dummy),
+        status_update_event_dispatcher_spi=AsyncDummy(EventDispatcherDummy()),
+        conditional_update_order_spi=AsyncDummy(conditional_update_dummy),
+    )
+
+    # The retry finds the order accepted concurrently.
+    with pytest.raises(InsufficientExpectednessError):
+        asyncio.run(
+            service.update_order_status(
+                order_id=persisted_order.id, new_status=Status.ACCEPTED_BY_INVENTORY
+            )
+        )
+    assert conditional_update_dummy.attempts == 1